@@ -0,0 +1,61 @@
+# benchmarks/bench_async_endpoints.py
+#
+# async 엔드포인트가 DynamoDB 를 기다리는 동안 이벤트 루프가 막히지 않는지 확인
+#   python benchmarks/bench_async_endpoints.py
+#
+# 느린 스캔(SCAN_LATENCY 초)을 흉내 낸 로더로 스냅샷을 비운 뒤
+# /api/resumes 를 동시에 여러 개 보내고, 그 사이 /api/health 응답 시간을 잰다.
+# 루프가 막히지 않으면 health 는 스캔 시간과 상관없이 바로 응답해야 한다.
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx   # noqa: E402
+
+import main    # noqa: E402
+
+SCAN_LATENCY = 0.5
+CONCURRENCY = 20
+
+
+def slow_loader():
+    time.sleep(SCAN_LATENCY)
+    return [{"id": i, "major": "any", "grade": "3학년", "title": f"공지 {i}"} for i in range(1, 1001)]
+
+
+async def timed(client, method, url, **kwargs):
+    started = time.perf_counter()
+    res = await client.request(method, url, **kwargs)
+    res.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run():
+    main.snapshot._loader = slow_loader
+    main.snapshot.invalidate()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = {"major": "컴퓨터공학과", "grade": "3학년", "certificates": []}
+
+        started = time.perf_counter()
+        resumes = [
+            asyncio.create_task(timed(client, "POST", "/api/resumes", json=body))
+            for _ in range(CONCURRENCY)
+        ]
+        await asyncio.sleep(0.05)
+        health = await timed(client, "GET", "/api/health")
+        latencies = await asyncio.gather(*resumes)
+        wall = time.perf_counter() - started
+
+    print(f"scan latency        : {SCAN_LATENCY * 1000:.0f} ms")
+    print(f"/api/resumes x{CONCURRENCY:<4}  : wall {wall * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    print(f"serialized would be : {SCAN_LATENCY * CONCURRENCY * 1000:.0f} ms")
+    print(f"/api/health meanwhile: {health * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,144 @@
+# benchmarks/bench_html_parse.py
+#
+# 크롤러 HTML 파싱: 백엔드(html.parser / lxml) × 부분 파싱(strain) 별 속도와 메모리
+#   python benchmarks/bench_html_parse.py              # 합성 픽스처 (게시판별 상세 / 목록 페이지)
+#   python benchmarks/bench_html_parse.py tests/fixtures/html/  # 저장해 둔 페이지: wwwk_*.html / tourism_*.html / list_*.html
+#
+# - pages/s : 초당 파싱한 페이지 수
+# - peak KB : 페이지 하나 파싱할 때 파이썬 객체 최대 메모리 (tracemalloc, lxml 내부 C 메모리는 제외)
+# - same    : 기존 방식(html.parser 전체 파싱)과 결과가 같은지 — 다르면 회귀
+import glob
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_parse                                                    # noqa: E402
+from crawler_logic import parse_detail_html, parse_tourism_detail_html   # noqa: E402
+
+LINK_SELECTOR = "a[href*='selectBbsNttView']"
+ROUNDS = 5
+N_PAGES = 10
+
+# 실제 학교 페이지처럼 본문보다 머리말 / 메뉴 / 꼬리말이 훨씬 큼
+CHROME = (
+    "<head><title>강원대학교</title>" + "<link rel='stylesheet' href='/css/{0}.css'>" * 20
+    + "<script>var menu = {{}};</script>" * 10 + "</head>"
+).format("common")
+NAV = "<nav id='gnb'><ul>" + "".join(
+    f"<li class='depth1'><a href='/www/contents.do?key={i}'>메뉴 {i}</a><ul>"
+    + "".join(f"<li><a href='/www/contents.do?key={i}{j}'>하위 메뉴 {i}-{j}</a></li>" for j in range(12))
+    + "</ul></li>"
+    for i in range(15)
+) + "</ul></nav>"
+FOOTER = "<footer><div class='addr'>" + "강원특별자치도 춘천시 강원대학길 1 " * 20 + "</div></footer>"
+
+
+def _body(rnd):
+    return "".join(
+        f"<p>장학금 신청 안내 {i}: 신청 기간 내에 서류를 제출하시기 바랍니다. <b>문의</b> 033-250-{rnd.randint(1000, 9999)}<br>"
+        f"<span style='color:red'>자격: {rnd.choice(['재학생', '휴학생', '신입생'])}</span></p>"
+        for i in range(rnd.randint(5, 30))
+    )
+
+
+def wwwk_page(rnd, n):
+    return (
+        f"<html>{CHROME}<body>{NAV}"
+        f"<div class='sub_title'><h2>학생공지</h2><div class='location'>홈 &gt; 공지</div></div>"
+        f"<table class='bbs_view'><tr class='subject'><td>2025학년도 장학생 선발 공고 {n}</td></tr>"
+        f"<tr><td><span class='write'>작성일 <strong>2025년11월{rnd.randint(10, 28)}일 10시00분00초</strong></span>"
+        f"<span class='hit'>조회 {rnd.randint(1, 999)}</span></td></tr></table>"
+        f"<div id='bbs_ntt_cn_con'>{_body(rnd)}</div>{FOOTER}</body></html>"
+    )
+
+
+def tourism_page(rnd, n):
+    return (
+        f"<html>{CHROME}<body>{NAV}"
+        f"<div class='b-title-box'><span class='b-cate'>장학</span>관광학과 장학 안내 {n}</div>"
+        f"<div class='b-date-box'><span>작성일</span><span>2025.11.{rnd.randint(10, 28)}</span></div>"
+        f"<div class='b-content-box'>{_body(rnd)}</div>{FOOTER}</body></html>"
+    )
+
+
+def list_page(rnd, n):
+    rows = "".join(
+        f"<tr><td>{i}</td><td class='subject'><a href=\"javascript:fn_view('{n}{i:03d}')\" "
+        f"onclick=\"location.href='selectBbsNttView.do?nttNo={n}{i:03d}'\">공지 {i}</a></td><td>2025-11-20</td></tr>"
+        for i in range(10)
+    )
+    return f"<html>{CHROME}<body>{NAV}<table class='bbs_list'>{rows}</table>{FOOTER}</body></html>"
+
+
+def parse_links(text, parser=None, strain=None):
+    soup = html_parse.parse(text, html_parse.subtrees(LINK_SELECTOR), parser, strain)
+    return [a.get("href") for a in soup.select(LINK_SELECTOR)]
+
+
+KINDS = {
+    "wwwk": (wwwk_page, parse_detail_html),
+    "tourism": (tourism_page, parse_tourism_detail_html),
+    "list": (list_page, parse_links),
+}
+
+
+def load_fixtures(directory):
+    fixtures = {}
+    for kind in KINDS:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, f"{kind}_*.html"))):
+            with open(path, encoding="utf-8") as f:
+                pages.append(f.read())
+        if pages:
+            fixtures[kind] = pages
+    return fixtures
+
+
+def synthetic_fixtures():
+    rnd = random.Random(7)
+    return {kind: [make(rnd, n) for n in range(N_PAGES)] for kind, (make, _) in KINDS.items()}
+
+
+def measure(parse, pages, parser, strain):
+    out = [parse(p, parser, strain) for p in pages]     # 예열 + 결과
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for p in pages:
+            parse(p, parser, strain)
+    pages_per_sec = ROUNDS * len(pages) / (time.perf_counter() - started)
+
+    peak = 0
+    for p in pages[:5]:
+        tracemalloc.start()
+        parse(p, parser, strain)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return out, pages_per_sec, peak / 1024
+
+
+def main():
+    fixtures = load_fixtures(sys.argv[1]) if len(sys.argv) > 1 else synthetic_fixtures()
+    backends = [b for b in html_parse.BACKENDS if b != "lxml" or html_parse.lxml is not None]
+    if "lxml" not in backends:
+        print("(lxml 미설치 → html.parser 만 측정)")
+
+    print(f"{'page':8s} {'backend':12s} {'strain':>6s} {'KB/page':>8s} {'pages/s':>9s} {'speedup':>8s} {'peak KB':>8s} {'same':>5s}")
+    for kind, pages in fixtures.items():
+        parse = KINDS[kind][1]
+        size_kb = sum(len(p.encode("utf-8")) for p in pages) / len(pages) / 1024
+        baseline, base_rate, _ = measure(parse, pages, "html.parser", False)
+
+        for backend in backends:
+            for strain in (False, True):
+                out, rate, peak = measure(parse, pages, backend, strain)
+                print(f"{kind:8s} {backend:12s} {str(strain):>6s} {size_kb:8.1f} {rate:9.0f} "
+                      f"{rate / base_rate:7.1f}x {peak:8.0f} {str(out == baseline):>5s}")
+
+
+if __name__ == "__main__":
+    main()
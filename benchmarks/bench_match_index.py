@@ -0,0 +1,87 @@
+# benchmarks/bench_match_index.py
+#
+# 이력서 매칭: 전체 순회(요청마다 item 전공/자격증 표준화) vs MatchIndex(저장된 표준 키)
+#   python benchmarks/bench_match_index.py
+#
+# 인덱스 비용은 테이블 크기가 아니라 결과 개수에 비례해야 함
+# (us/match 가 테이블 크기와 상관없이 일정하면 정상)
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import canonical                      # noqa: E402
+from match_index import MatchIndex    # noqa: E402
+
+
+MAJORS = [f"{name}학과" for name in (
+    "컴퓨터공학", "전자공학", "기계공학", "관광", "경영", "경제", "국어국문",
+    "영어영문", "화학", "물리", "생명과학", "간호", "건축", "토목", "디자인",
+)]
+GRADES = ["1학년", "2학년", "3학년", "4학년"]
+CERTS = ["정보처리기사", "SQLD", "토익", "컴퓨터활용능력", "전기기사", "ADsP"]
+
+
+def make_items(n):
+    rnd = random.Random(n)
+    items = []
+    for i in range(1, n + 1):
+        item = {
+            "id": i,
+            "major": "any" if rnd.random() < 0.01 else rnd.choice(MAJORS),
+            "grade": rnd.choice(GRADES) if rnd.random() < 0.02 else 0,
+            "certificates": [rnd.choice(CERTS)] if rnd.random() < 0.01 else [],
+        }
+        item.update(canonical.canonical_fields(item))   # 저장할 때처럼 표준 키 포함
+        items.append(item)
+    return items
+
+
+def linear_match(items, major, grade, certificates):
+    # filter_scholarships 규칙을 item 마다 표준화하면서 전체 순회
+    req_majors = set(canonical.major_keys(major))
+    req_certs = set(canonical.certificate_keys(certificates))
+    out = []
+    for item in items:
+        item_majors = set(canonical.major_keys(item.get("major")))
+        match = (
+            canonical.ANY in req_majors or canonical.ANY in item_majors
+            or bool(req_majors & item_majors)
+            or (grade and item.get("grade") == grade)
+            or bool(req_certs & set(canonical.certificate_keys(item.get("certificates"))))
+        )
+        if match:
+            out.append(item)
+    return out
+
+
+def bench(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+if __name__ == "__main__":
+    query = ("컴퓨터 공학 전공", "3학년", ["SQL 개발자"])
+    keys = (canonical.major_keys(query[0]), query[1], canonical.certificate_keys(query[2]))
+
+    print(f"{'items':>8} {'build ms':>10} {'index ms/req':>13} {'linear ms/req':>14} {'matched':>8} {'us/match':>9}")
+    for n in (1_000, 10_000, 100_000):
+        items = make_items(n)
+
+        index = MatchIndex()
+        started = time.perf_counter()
+        index.rebuild(items)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        # 인덱스 결과와 기존 방식 결과가 같아야 함
+        assert index.match(*keys) == linear_match(items, *query)
+
+        index_ms = bench(lambda: index.match(*keys), 200)
+        linear_ms = bench(lambda: linear_match(items, *query), 3)
+
+        matched = len(index.match(*keys))
+        print(f"{n:>8} {build_ms:>10.1f} {index_ms:>13.3f} {linear_ms:>14.2f} {matched:>8} {index_ms * 1000 / matched:>9.2f}")
@@ -0,0 +1,142 @@
+# benchmarks/bench_resume_rules.py
+#
+# 규칙 기반 추출기(resume_rules)가 LLM 호출을 얼마나 건너뛰는지, 얼마나 정확한지
+#   python benchmarks/bench_resume_rules.py                 # 합성 이력서 픽스처
+#   python benchmarks/bench_resume_rules.py resumes.jsonl   # {"text": ..., "llm": {...}} 한 줄씩 (실제 LLM 응답 기록)
+#
+# - skip rate   : LLM 을 전혀 부르지 않은 이력서 비율
+# - agreement   : 규칙이 채운 필드가 기준값과 같은 비율 (필드별)
+#                 합성 픽스처 → 생성기가 만든 정답 (LLM 과의 일치율 아님)
+#                 jsonl       → 기록해 둔 LLM 결과
+# - prompt size : LLM 을 불러야 하는 이력서에서 전체 프롬프트 대비 부분 프롬프트 글자 수
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_rules   # noqa: E402
+from pdfcrawl import build_resume_prompt, resume_prompt   # noqa: E402
+
+N_RESUMES = 500
+
+NAMES = ["김민준", "이서연", "박지훈", "최수아", "정도윤", "강하은", "윤지호", "임서준"]
+MAJORS = ["컴퓨터공학과", "전자공학과", "경영학과", "간호학과", "기계공학과", "통계학과", "사회복지학과"]
+CERTS = ["정보처리기사", "SQLD", "ADsP", "TOEIC", "컴퓨터활용능력 1급", "리눅스마스터 2급", "전기기사"]
+RARE_CERTS = ["게임프로그래밍전문가", "3D프린터개발산업기사", "드론조종자격"]
+STACKS = {
+    "백엔드 개발": "Spring Boot, MySQL, Django REST 서버 개발",
+    "프론트엔드": "React, TypeScript 로 관리자 페이지 개발",
+    "데이터 분석": "pandas, Tableau 로 매출 데이터 분석",
+    "AI/컴퓨터 비전": "PyTorch, OpenCV 로 YOLO 객체 탐지 모델 학습",
+}
+FILLER = "성실하고 책임감 있는 자세로 팀 프로젝트에 참여했습니다. " * 6
+
+
+def synthetic_resume(rng: random.Random):
+    name = rng.choice(NAMES)
+    major = rng.choice(MAJORS)
+    field = rng.choice(list(STACKS))
+    grade = rng.randint(1, 4)
+    certs = rng.sample(CERTS, rng.randint(0, 3))
+    style = rng.random()
+
+    lines = ["이력서", f"성명: {name}", "학력"]
+    if rng.random() < 0.3:
+        # "2024학년도" 의 4 를 학년으로 읽으면 안 됨
+        lines.append(f"{rng.randint(2021, 2024)}학년도 {rng.randint(1, 2)}학기 성적우수 장학생")
+    if style < 0.5:
+        lines.append(f"강릉원주대학교 {major} {grade}학년 재학")
+    elif style < 0.75:
+        lines.append(f"전공: {major}")
+        lines.append(f"{2025 + (4 - grade)}년 2월 졸업예정")
+    elif style < 0.9:
+        # 전공이 문장 속에만 있음 → 규칙으로는 못 찾음
+        lines.append(f"대학에서 {major[:-2]} 분야를 공부하고 있으며 현재 {grade}학년입니다")
+    else:
+        lines.append(f"강릉원주대학교 {major}")
+
+    rare = rng.random() < 0.15
+    if certs or rare:
+        lines.append("자격증")
+        lines.extend(certs)
+        if rare:
+            certs = certs + [rng.choice(RARE_CERTS)]
+            lines.append(certs[-1])
+
+    lines += ["프로젝트 경험", STACKS[field], FILLER, "자기소개", FILLER]
+
+    expected = {
+        "name": name,
+        "major": major,
+        "grade": f"{grade}학년" if style < 0.5 or 0.75 <= style < 0.9 else "",
+        "graduation_year": str(2025 + (4 - grade)) if 0.5 <= style < 0.75 else "",
+        "certificates": ", ".join(certs),
+        "field": field,
+    }
+    return "\n".join(lines), expected
+
+
+def load_fixtures(path):
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["text"], row["llm"]) for row in rows]
+
+
+def same(field, rule_value, llm_value):
+    if field == "certificates":
+        split = lambda v: {c.strip().lower() for c in v.split(",") if c.strip()}   # noqa: E731
+        return split(rule_value) == split(llm_value)
+    return rule_value.replace(" ", "") == llm_value.replace(" ", "")
+
+
+def main():
+    if len(sys.argv) > 1:
+        fixtures = load_fixtures(sys.argv[1])
+        reference = "recorded LLM output"
+    else:
+        rng = random.Random(42)
+        fixtures = [synthetic_resume(rng) for _ in range(N_RESUMES)]
+        reference = "synthetic generator labels, not an LLM"
+
+    skipped = 0
+    correct = {f: 0 for f in resume_rules.FIELDS}
+    filled = {f: 0 for f in resume_rules.FIELDS}
+    full_chars = partial_chars = 0
+
+    started = time.perf_counter()
+    for text, expected in fixtures:
+        result, missing = resume_rules.extract(text)
+        if not missing:
+            skipped += 1
+        else:
+            full_chars += len(build_resume_prompt(text))
+            partial_chars += len(resume_prompt(text, missing))
+
+        for f in resume_rules.FIELDS:
+            if f in missing or not result[f]:
+                continue
+            filled[f] += 1
+            correct[f] += same(f, result[f], expected.get(f, ""))
+    elapsed = time.perf_counter() - started
+
+    n = len(fixtures)
+    called = n - skipped
+    print(f"resumes        : {n}")
+    print(f"rules time     : {elapsed / n * 1e6:8.1f} µs/resume")
+    print(f"LLM skip rate  : {skipped / n:8.1%}  ({skipped} skipped, {called} need LLM)")
+    if called:
+        print(f"prompt chars   : full {full_chars / called:8.0f}  →  partial {partial_chars / called:8.0f}"
+              f"  ({1 - partial_chars / full_chars:.0%} smaller)")
+    print(f"field agreement (rule-filled vs {reference}):")
+    for f in resume_rules.FIELDS:
+        if filled[f]:
+            print(f"  {f:16s} {correct[f] / filled[f]:7.1%}  ({filled[f]} filled by rules)")
+        else:
+            print(f"  {f:16s}     -    (0 filled by rules)")
+
+
+if __name__ == "__main__":
+    main()
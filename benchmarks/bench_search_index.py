@@ -0,0 +1,86 @@
+# benchmarks/bench_search_index.py
+#
+# /api/scholarships 검색: 제목 부분문자열 전체 순회(기존 방식) vs SearchIndex
+#   python benchmarks/bench_search_index.py [건수 ...]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex   # noqa: E402
+
+
+# 자주 나오는 공지 단어 + 드물게 나오는 임의 음절 단어 (Zipf 비슷한 분포)
+COMMON = (
+    "안내 신청 공고 모집 학기 학년도 지원 프로그램 교육 결과 발표 일정 변경 "
+    "장학금 등록금 수강신청 취업 채용 설명회 특강 공모전 관광학과 컴퓨터공학과"
+).split()
+RARE = ["국가장학", "전과", "계절수업", "인턴십", "글로컬투어랩", "학자금대출", "캡스톤디자인"]
+TYPES = ["장학금", "학사", "취업", "공모전", "일반공지"]
+QUERIES = ["국가장학", "전과 모집", "계절수업", "인턴십", "컴퓨터공학과 특강"]
+
+
+def make_vocab(rnd, size=20_000):
+    syllables = [chr(0xAC00 + rnd.randrange(11172)) for _ in range(600)]
+    return ["".join(rnd.choices(syllables, k=rnd.randint(2, 4))) for _ in range(size)]
+
+
+def make_items(n):
+    rnd = random.Random(n)
+    vocab = make_vocab(rnd)
+    weights = [1 / (r + 1) for r in range(len(vocab))]
+
+    def words(k):
+        out = rnd.choices(vocab, weights=weights, k=k)
+        for i in range(len(out)):
+            r = rnd.random()
+            if r < 0.15:
+                out[i] = rnd.choice(COMMON)
+            elif r < 0.152:
+                out[i] = rnd.choice(RARE)
+        return " ".join(out)
+
+    items = []
+    for i in range(1, n + 1):
+        year = rnd.choice(("2024", "2025", "2026"))
+        title = f"{year}학년도 " + words(5)
+        content = words(rnd.randint(20, 120))
+        items.append({"id": i, "title": title, "content": content, "type": rnd.choice(TYPES)})
+    return items
+
+
+def linear_search(items, query, category=None):
+    q = query.lower()
+    out = [i for i in items if q in (i.get("title") or "").lower()]
+    if category:
+        out = [i for i in out if i.get("type") == category]
+    return out
+
+
+def bench(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+
+    print(f"{'items':>8} {'build s':>8} {'query':<18} {'index ms':>9} {'+type ms':>9} {'linear(title) ms':>17} {'hits':>6}")
+    for n in sizes:
+        items = make_items(n)
+
+        index = SearchIndex()
+        started = time.perf_counter()
+        index.rebuild(items)
+        build_s = time.perf_counter() - started
+
+        for q in QUERIES:
+            index_ms = bench(lambda: index.search(q), 20)
+            typed_ms = bench(lambda: index.search(q, category="장학금"), 20)
+            linear_ms = bench(lambda: linear_search(items, q), 3)
+            hits = len(index.search(q))
+            print(f"{n:>8} {build_s:>8.1f} {q:<18} {index_ms:>9.2f} {typed_ms:>9.2f} {linear_ms:>17.2f} {hits:>6}")
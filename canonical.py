@@ -0,0 +1,294 @@
+# canonical.py
+import re
+import unicodedata
+from collections import deque
+
+
+# ---------------------------------------------------------
+# 🔥 전공 / 자격증 표준화 (별칭 사전)
+#  - 모듈 로드 때 한 번만 컴파일: 별칭 → 표준 키 해시 + Aho-Corasick 오토마톤
+#  - 정확히 같은 별칭이면 해시 한 번, 긴 문장 속에 들어 있으면 오토마톤 한 번 훑기
+#  - 저장할 때 item 에 major_keys / certificate_keys 를 같이 넣고,
+#    조회할 때 ResumeRequest 도 같은 키로 바꿔서 → 매칭은 키 비교만
+# ---------------------------------------------------------
+ANY = "any"
+MIN_PATTERN_CHARS = 2
+
+MAJOR_ALIASES = {
+    "컴퓨터공학": ["컴퓨터공학과", "컴퓨터공학부", "컴퓨터과학", "컴퓨터과학과", "컴퓨터",
+                "소프트웨어공학", "소프트웨어학", "소프트웨어", "컴공", "computer science",
+                "computer engineering", "cs"],
+    "정보기술": ["정보기술학", "정보통신기술", "정보통신공학", "정보통신", "IT", "ICT"],
+    "전자공학": ["전자공학과", "전자전기공학", "전자", "electronic engineering"],
+    "전기공학": ["전기공학과", "전기", "electrical engineering"],
+    "기계공학": ["기계공학과", "기계", "mechanical engineering"],
+    "산업공학": ["산업공학과", "산업경영공학", "산업시스템공학"],
+    "화학공학": ["화학공학과", "화공", "chemical engineering"],
+    "신소재공학": ["신소재공학과", "재료공학", "신소재"],
+    "토목공학": ["토목공학과", "토목", "건설환경공학"],
+    "건축학": ["건축학과", "건축공학", "건축"],
+    "환경공학": ["환경공학과", "환경"],
+    "데이터사이언스": ["데이터과학", "데이터사이언스학", "빅데이터", "data science"],
+    "인공지능": ["인공지능학", "AI", "artificial intelligence"],
+    "경영학": ["경영학과", "경영", "business administration"],
+    "경제학": ["경제학과", "경제", "economics"],
+    "회계학": ["회계학과", "세무회계", "회계"],
+    "국어국문학": ["국어국문학과", "국문학", "국문"],
+    "영어영문학": ["영어영문학과", "영문학", "영문", "영어"],
+    "행정학": ["행정학과", "행정"],
+    "법학": ["법학과", "법"],
+    "심리학": ["심리학과", "심리"],
+    "사회복지학": ["사회복지학과", "사회복지"],
+    "간호학": ["간호학과", "간호"],
+    "치위생학": ["치위생학과", "치위생"],
+    "식품영양학": ["식품영양학과", "식품영양"],
+    "수학": ["수학과", "응용수학"],
+    "통계학": ["통계학과", "정보통계학", "통계"],
+    "물리학": ["물리학과", "물리"],
+    "화학": ["화학과"],
+    "생물학": ["생물학과", "생명과학", "생물"],
+    "유아교육": ["유아교육과", "유아교육학"],
+    "관광경영": ["관광경영학과", "관광학", "관광"],
+    "호텔경영": ["호텔경영학과", "호텔외식경영", "호텔"],
+    "미술": ["미술학과", "미술학", "디자인"],
+    "음악": ["음악학과", "음악학"],
+    "체육": ["체육학과", "체육학", "스포츠과학"],
+}
+
+CERTIFICATE_ALIASES = {
+    "정보처리기사": ["정처기", "정보처리 기사"],
+    "정보처리산업기사": ["정처산기"],
+    "정보처리기능사": ["정처기능사"],
+    "정보보안기사": ["정보보안 기사"],
+    "정보보안산업기사": [],
+    "정보통신기사": [],
+    "전자계산기기사": [],
+    "리눅스마스터 1급": ["리마 1급"],
+    "리눅스마스터 2급": ["리마 2급"],
+    "리눅스마스터": [],
+    "네트워크관리사": ["네관사"],
+    "SQLD": ["SQL 개발자", "SQL developer"],
+    "SQLP": ["SQL 전문가"],
+    "ADsP": ["데이터분석 준전문가"],
+    "ADP": ["데이터분석 전문가"],
+    "빅데이터분석기사": ["빅분기"],
+    "컴퓨터활용능력 1급": ["컴활 1급"],
+    "컴퓨터활용능력 2급": ["컴활 2급"],
+    "컴퓨터활용능력": ["컴활"],
+    "워드프로세서": ["워드"],
+    "전기기사": [],
+    "전기산업기사": [],
+    "전기기능사": [],
+    "산업안전기사": [],
+    "위험물산업기사": [],
+    "기계설계기사": [],
+    "일반기계기사": [],
+    "건축기사": [],
+    "토목기사": [],
+    "사회복지사": [],
+    "간호사": [],
+    "보육교사": [],
+    "전산회계": [],
+    "전산세무": [],
+    "한국사능력검정시험": ["한국사능력검정", "한국사 검정", "한능검"],
+    "TOEIC Speaking": ["토익스피킹", "토스"],
+    "TOEIC": ["토익"],
+    "TOEFL": ["토플"],
+    "OPIc": ["오픽"],
+    "JLPT": [],
+    "HSK": [],
+    "AWS": ["AWS Certified", "AWS 자격증"],
+    "CCNA": [],
+    "운전면허": ["운전면허증"],
+}
+
+_SEPARATOR = re.compile(r"[\s\W_]+")
+
+
+def _compact(text: str) -> str:
+    """
+    NFKC + 소문자 + 공백/구두점 제거
+    """
+    return _SEPARATOR.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def major_key(text: str) -> str:
+    """
+    정확 비교용 전공 키 ('컴퓨터 공학과' / '컴퓨터공학전공' → '컴퓨터공학')
+    """
+    key = _compact(text)
+    if key.endswith("전공") and len(key) > 2:
+        key = key[:-2]
+    if key.endswith(("학과", "학부")):
+        key = key[:-1]
+    elif key.endswith(("과", "부")) and len(key) > 2:
+        key = key[:-1]
+    return key
+
+
+# -----------------------------
+# Aho-Corasick 오토마톤
+# -----------------------------
+class _Automaton:
+    def __init__(self, patterns: dict):
+        """
+        patterns: 패턴(_compact 된 문자열) → 표준 이름
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]        # 상태 → [(패턴 길이, 표준 이름, ascii 여부)]
+
+        for pattern, canonical in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), canonical, pattern.isascii()))
+
+        # BFS 로 실패 링크
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str, boundaries: set) -> list:
+        """
+        겹치지 않게 왼쪽부터 가장 긴 것 우선으로 표준 이름 목록
+        (영문 패턴은 단어 경계에서만 — 'security' 안의 'it' 같은 오탐 방지)
+        """
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, canonical, ascii_only in self._out[state]:
+                start = i + 1 - length
+                if ascii_only and not (start in boundaries and i + 1 in boundaries):
+                    continue
+                hits.append((start, -length, canonical))
+
+        found = []
+        end = 0
+        for start, neg_length, canonical in sorted(hits):
+            if start >= end:
+                found.append(canonical)
+                end = start - neg_length
+        return found
+
+
+def _compact_with_boundaries(text: str):
+    """
+    _compact 결과 + 원문에서 단어 경계였던 위치들
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    chars = []
+    boundaries = {0}
+    for part in _SEPARATOR.split(text):
+        if not part:
+            continue
+        boundaries.add(len(chars))
+        for ch in part:
+            # 한글 ↔ 영문/숫자 가 바뀌는 곳도 경계 ('AI전공', 'IT학과')
+            if chars and chars[-1].isascii() != ch.isascii():
+                boundaries.add(len(chars))
+            chars.append(ch)
+    compact = "".join(chars)
+    boundaries.add(len(compact))
+    return compact, boundaries
+
+
+class _Dictionary:
+    def __init__(self, aliases: dict, key):
+        self._key = key
+        self.names = {}             # 별칭 키 → 표준 이름
+        patterns = {}
+
+        for canonical, variants in aliases.items():
+            for alias in [canonical, *variants]:
+                self.names.setdefault(key(alias), canonical)
+                patterns.setdefault(_compact(alias), canonical)
+                patterns.setdefault(key(alias), canonical)
+
+        # 한 글자 패턴은 문장 속에서 오탐이 많아 정확 일치로만
+        self._automaton = _Automaton({p: c for p, c in patterns.items() if len(p) >= MIN_PATTERN_CHARS})
+
+    def lookup(self, text: str) -> list:
+        """
+        문자열 하나 → 표준 이름들 (정확 일치 → 포함된 별칭 → 정규화한 원문)
+        """
+        key = self._key(text)
+        if not key:
+            return []
+
+        hit = self.names.get(key)
+        if hit is not None:
+            return [hit]
+
+        found = self._automaton.find(*_compact_with_boundaries(text))
+        if found:
+            return list(dict.fromkeys(found))
+        return [key]
+
+
+_majors = _Dictionary(MAJOR_ALIASES, major_key)
+_certificates = _Dictionary(CERTIFICATE_ALIASES, _compact)
+
+
+# -----------------------------
+# 공개 함수
+# -----------------------------
+def major_keys(major) -> list:
+    """
+    전공 문자열 → 표준 전공 키 목록
+    - 'any' → ['any'], 비어 있으면 [''] (빈 전공끼리는 일치)
+    """
+    if not isinstance(major, str) or not major.strip():
+        return [""]
+    if major.strip().lower() == ANY:
+        return [ANY]
+    return _majors.lookup(major) or [""]
+
+
+def canonical_major(major) -> str:
+    """
+    대표 전공 키 하나 (표시/호환용)
+    """
+    return major_keys(major)[0]
+
+
+def certificate_keys(certificates) -> list:
+    """
+    자격증 목록(또는 쉼표로 구분된 문자열) → 표준 자격증 키 목록
+    """
+    if isinstance(certificates, str):
+        certificates = certificates.split(",")
+
+    keys = []
+    for cert in certificates or []:
+        if isinstance(cert, str):
+            keys.extend(_certificates.lookup(cert))
+    return list(dict.fromkeys(keys))
+
+
+def canonical_fields(item: dict) -> dict:
+    """
+    저장할 item 에 붙일 표준 키 필드
+    """
+    return {
+        "major_keys": major_keys(item.get("major")),
+        "certificate_keys": certificate_keys(item.get("certificates")),
+    }
+
@@ -0,0 +1,116 @@
+# crawl_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# ---------------------------------------------------------
+# 🔥 크롤러 응답 캐시 (디스크, 조건부 요청용)
+#  - URL 별로 본문 + ETag / Last-Modified + 본문 해시를 저장
+#  - 다음 크롤링 때 If-None-Match / If-Modified-Since 로 요청 → 304 면 저장된 본문 사용
+#  - 검증 헤더를 주지 않는 서버도 있음 → max_age 안이면 요청 없이 저장본 사용
+#    (올라온 뒤 거의 안 바뀌는 상세 페이지용)
+#  - 전체 크기 한도를 넘으면 오래 안 쓴 것부터 삭제
+# ---------------------------------------------------------
+CRAWL_CACHE_PATH = os.getenv("CRAWL_CACHE_PATH", ".cache/crawl_cache.sqlite3")
+CRAWL_CACHE_DISK_BYTES = int(os.getenv("CRAWL_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+# 304 응답을 만들 때 되살릴 헤더 (인코딩 판단에 필요한 것만)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class CachedPage:
+    def __init__(self, url, body, headers, encoding, digest, fetched_at):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.encoding = encoding
+        self.hash = digest
+        self.fetched_at = fetched_at
+
+    def validators(self) -> dict:
+        """
+        조건부 요청 헤더
+        """
+        out = {}
+        if self.headers.get("ETag"):
+            out["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            out["If-Modified-Since"] = self.headers["Last-Modified"]
+        return out
+
+
+class PageCache:
+    def __init__(self, path: str = CRAWL_CACHE_PATH, disk_bytes: int = CRAWL_CACHE_DISK_BYTES):
+        self.path = path
+        self.disk_bytes = disk_bytes
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        # self._lock 안에서만 호출
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY, body BLOB NOT NULL, headers TEXT NOT NULL, encoding TEXT,"
+                " hash TEXT NOT NULL, size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def get(self, url: str):
+        with self._lock:
+            db = self._conn()
+            row = db.execute(
+                "SELECT body, headers, encoding, hash, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+        body, headers, encoding, digest, fetched_at = row
+        return CachedPage(url, bytes(body), json.loads(headers), encoding, digest, fetched_at)
+
+    def put(self, url: str, body: bytes, headers: dict, encoding: str, digest: str = None):
+        now = time.time()
+        headers = {k: headers[k] for k in KEPT_HEADERS if headers.get(k)}
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, json.dumps(headers), encoding, digest or body_hash(body), len(body), now, now),
+            )
+            self._evict(db)
+            db.commit()
+
+    def touch(self, url: str):
+        """
+        304 / 내용 같음 → 다시 확인한 시각만 갱신 (max_age 기준)
+        """
+        with self._lock:
+            db = self._conn()
+            now = time.time()
+            db.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            db.commit()
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+
+        rows = db.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.disk_bytes:
+                break
+            db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
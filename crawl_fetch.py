@@ -0,0 +1,218 @@
+# crawl_fetch.py
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import metrics
+from crawl_cache import PageCache, body_hash
+
+
+# ---------------------------------------------------------
+# 🔥 크롤러 동시 요청 엔진
+#  - 상세 페이지 / 다음 목록 페이지를 스레드 풀에서 미리 받아 둠
+#  - 호스트별 동시 요청 수 제한 (CRAWL_HOST_CONCURRENCY)
+#  - 호스트별 요청 간격 (CRAWL_HOST_DELAY 초) → 학교 서버에 몰아서 보내지 않음
+#  - 결과는 제출한 순서대로 꺼내 씀 → 출력 순서는 순차 크롤링과 같음
+#  - 세션 하나를 같이 씀 (keep-alive 연결 재사용, 요청마다 TLS 연결 X)
+#  - 이전 응답은 crawl_cache 에 저장 → 조건부 요청, 304 면 저장본 사용
+#  - 요청마다 소스 / 호스트별 지연 시간, 바이트, 응답 코드를 metrics 에 기록 (/metrics)
+# ---------------------------------------------------------
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "16"))
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "6"))
+CRAWL_HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", "0.05"))
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "15"))
+CRAWL_CACHE = os.getenv("CRAWL_CACHE", "1") == "1"
+CRAWL_DETAIL_MAX_AGE = float(os.getenv("CRAWL_DETAIL_MAX_AGE", str(12 * 3600)))
+
+# 지금 크롤링 중인 소스 이름 (지표 라벨) — crawler_logic.iter_source 가 설정, submit() 이 풀로 넘김
+current_source = contextvars.ContextVar("crawl_source", default="-")
+
+REQUEST_SECONDS = metrics.histogram(
+    "crawl_request_seconds", "Crawler HTTP request latency (after the host slot is acquired)", ("source", "host"),
+)
+HOST_WAIT_SECONDS = metrics.histogram(
+    "crawl_host_wait_seconds", "Time spent waiting for a host slot and the politeness delay", ("host",),
+)
+RESPONSES = metrics.counter(
+    "crawl_responses_total", "Crawler responses by status (cache = served from the page cache)",
+    ("source", "host", "status"),
+)
+BYTES = metrics.counter(
+    "crawl_bytes_total", "Crawler bytes downloaded / saved by the page cache", ("source", "host", "kind"),
+)
+FAILURES = metrics.counter("crawl_failures_total", "Crawler failures by stage", ("source", "stage"))
+
+
+class FetchStats:
+    """
+    누적 카운터 — 크롤링 한 번의 사용량은 snapshot() 후 since() 로
+    """
+    KEYS = ("requests", "fresh_hits", "not_modified", "unchanged", "bytes_downloaded", "bytes_saved")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.KEYS, 0)
+
+    def bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._counts[key] += n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def since(self, before: dict) -> dict:
+        now = self.snapshot()
+        used = {k: now[k] - before.get(k, 0) for k in self.KEYS}
+        hits = used["fresh_hits"] + used["not_modified"]
+        lookups = used["fresh_hits"] + used["requests"]
+        used["cache_hit_ratio"] = round(hits / lookups, 4) if lookups else None
+        return used
+
+
+class _Host:
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+        self.next_at = 0.0          # 다음 요청을 보내도 되는 시각
+
+
+class HostLimiter:
+    def __init__(self, concurrency: int = CRAWL_HOST_CONCURRENCY, delay: float = CRAWL_HOST_DELAY):
+        self._concurrency = max(1, concurrency)
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, url: str) -> _Host:
+        name = urlsplit(url).netloc
+        with self._lock:
+            host = self._hosts.get(name)
+            if host is None:
+                host = self._hosts[name] = _Host(name, self._concurrency)
+            return host
+
+    def get(self, url: str, session=requests, **kwargs) -> requests.Response:
+        """
+        호스트 슬롯을 잡고, 직전 요청과 delay 만큼 띄운 뒤 GET
+        """
+        host = self._host(url)
+        started = time.perf_counter()
+        with host.slots:
+            with host.lock:
+                now = time.monotonic()
+                wait = host.next_at - now
+                host.next_at = max(now, host.next_at) + self._delay
+            if wait > 0:
+                time.sleep(wait)
+            HOST_WAIT_SECONDS.observe(time.perf_counter() - started, host=host.name)
+
+            kwargs.setdefault("timeout", CRAWL_TIMEOUT)
+            with REQUEST_SECONDS.time(source=current_source.get(), host=host.name):
+                return session.get(url, **kwargs)
+
+
+def _session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(CRAWL_HOST_CONCURRENCY, CRAWL_WORKERS))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _from_cache(page) -> requests.Response:
+    # 저장본으로 200 응답을 다시 만듦 (.text / .json() 결과가 처음 받았을 때와 같게)
+    res = requests.Response()
+    res.status_code = 200
+    res.url = page.url
+    res._content = page.body
+    res.headers = CaseInsensitiveDict(page.headers)
+    res.encoding = page.encoding
+    return res
+
+
+limiter = HostLimiter()
+session = _session()
+page_cache = PageCache()
+stats = FetchStats()
+
+# 요청만 이 풀에서 실행 (소스 단위 작업은 crawl_pipeline 의 소스별 스레드)
+#  → 풀 안에서 같은 풀의 결과를 기다리는 교착이 생기지 않음
+_pool = ThreadPoolExecutor(max_workers=CRAWL_WORKERS, thread_name_prefix="crawl-fetch")
+
+
+def get(url: str, max_age: float = None, **kwargs) -> requests.Response:
+    """
+    공용 세션 + 호스트 제한 + 응답 캐시
+    max_age: 저장한 지 이 초 안이면 요청 없이 저장본 (None → 항상 조건부 요청)
+    """
+    source, host = current_source.get(), urlsplit(url).netloc
+    cached = page_cache.get(url) if CRAWL_CACHE else None
+
+    if cached is not None and max_age and time.time() - cached.fetched_at <= max_age:
+        stats.bump("fresh_hits")
+        stats.bump("bytes_saved", len(cached.body))
+        RESPONSES.inc(source=source, host=host, status="cache")
+        BYTES.inc(len(cached.body), source=source, host=host, kind="saved")
+        return _from_cache(cached)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached is not None:
+        headers.update(cached.validators())
+
+    try:
+        res = limiter.get(url, session=session, headers=headers, **kwargs)
+    except requests.RequestException:
+        RESPONSES.inc(source=source, host=host, status="error")
+        FAILURES.inc(source=source, stage="fetch")
+        raise
+    stats.bump("requests")
+    RESPONSES.inc(source=source, host=host, status=str(res.status_code))
+
+    if res.status_code == 304 and cached is not None:
+        stats.bump("not_modified")
+        stats.bump("bytes_saved", len(cached.body))
+        BYTES.inc(len(cached.body), source=source, host=host, kind="saved")
+        page_cache.touch(url)
+        return _from_cache(cached)
+
+    body = res.content
+    stats.bump("bytes_downloaded", len(body))
+    BYTES.inc(len(body), source=source, host=host, kind="downloaded")
+
+    if CRAWL_CACHE and res.status_code == 200:
+        digest = body_hash(body)
+        if cached is not None and cached.hash == digest:
+            stats.bump("unchanged")     # 검증 헤더가 없는 서버 → 받긴 했지만 내용은 같음
+        page_cache.put(url, body, res.headers, res.encoding, digest)
+    return res
+
+
+def submit(fn, *args):
+    """
+    fn(*args) 를 요청 풀에서 실행 → Future
+    지금 컨텍스트(current_source)를 같이 넘김 → 풀 스레드의 지표도 같은 소스로 기록
+    """
+    return _pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def prefetch(urls, ahead: int = 1):
+    """
+    목록 페이지를 순서대로 돌려주되, 다음 ahead 페이지는 미리 요청해 둠
+    (지금 페이지의 상세를 처리하는 동안 다음 목록이 받아지고 있음)
+    → (url, Response) 를 순서대로 yield
+    """
+    urls = list(urls)
+    pending = [submit(get, url) for url in urls[:ahead + 1]]
+    for i, url in enumerate(urls):
+        if i + ahead + 1 < len(urls):
+            pending.append(submit(get, urls[i + ahead + 1]))
+        yield url, pending[i].result()
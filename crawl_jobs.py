@@ -0,0 +1,119 @@
+# crawl_jobs.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import logs
+
+
+# ---------------------------------------------------------
+# 🔥 백그라운드 크롤링 작업
+#  - /crawl 요청은 작업만 등록하고 job_id 를 바로 반환
+#  - 크롤링은 한 번에 하나만 실행, 실행 중에 또 요청하면 같은 작업을 돌려줌
+#  - 진행 상황(페이지/파싱/저장/에러 수)은 /crawl/{job_id} 로 조회
+# ---------------------------------------------------------
+MAX_JOBS_KEPT = 20
+
+log = logs.get_logger("crawler.jobs", os.getenv("CRAWL_LOG_LEVEL"))
+
+
+class CrawlJob:
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = "queued"          # queued → running → done / failed
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.coalesced = 0              # 실행 중에 합쳐진 중복 요청 수
+        self.result = None
+        self.error = None
+        self.errors = []                # 소스별 에러 메시지 (최근 것만)
+
+        self._lock = threading.Lock()
+        self.progress = {
+            "pages_fetched": 0,
+            "items_parsed": 0,
+            "items_written": 0,
+            "errors": 0,
+        }
+
+    def bump(self, key: str, n: int = 1):
+        """
+        크롤러가 호출하는 진행 상황 콜백
+        """
+        with self._lock:
+            self.progress[key] = self.progress.get(key, 0) + n
+
+    def fail(self, message: str):
+        with self._lock:
+            self.progress["errors"] += 1
+            self.errors = (self.errors + [message])[-10:]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            progress = dict(self.progress)
+            errors = list(self.errors)
+
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "coalesced": self.coalesced,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created_at)),
+            "elapsed_s": round(end - self.started_at, 1) if self.started_at else None,
+            "progress": progress,
+            "errors": errors,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class CrawlJobManager:
+    def __init__(self, run):
+        """
+        run: run(job) → 결과 dict. job.bump()/job.fail() 로 진행 상황 보고
+        """
+        self._run = run
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._current = None
+
+    def submit(self):
+        """
+        새 작업을 시작하거나, 이미 실행 중이면 그 작업을 반환
+        → (job, 새로 시작했는지)
+        """
+        with self._lock:
+            if self._current is not None:
+                self._current.coalesced += 1
+                return self._current, False
+
+            job = CrawlJob()
+            self._current = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_JOBS_KEPT:
+                self._jobs.popitem(last=False)
+
+        threading.Thread(target=self._execute, args=(job,), daemon=True, name=f"crawl-{job.id}").start()
+        return job, True
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _execute(self, job: CrawlJob):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = self._run(job)
+            job.status = "done"
+        except Exception as e:
+            log.exception("크롤링 작업 실패", job=job.id)
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._current = None
@@ -0,0 +1,174 @@
+# crawl_pipeline.py
+import os
+import queue
+import threading
+import time
+
+import crawl_fetch
+import logs
+import metrics
+
+
+# ---------------------------------------------------------
+# 🔥 크롤링 → 저장 스트리밍 파이프라인
+#  - 수집(소스별 스레드: 요청 + 파싱) → 정규화 → 배치 저장, 단계 사이는 크기 제한 큐
+#    → 저장이 밀리면 큐가 차고, 소스 generator 가 멈춰서 더 요청하지 않음 (메모리 일정)
+#  - 배치는 BATCH 개가 모이거나 FLUSH 초가 지나면 바로 저장 → 파싱 후 몇 초 안에 반영
+#  - 소스 하나가 실패해도 다른 소스 / 이미 저장한 item 은 그대로
+#  - 저장이 끝난 item 만 crawl_state 에 표시 → 실패한 배치 / 조건부 쓰기가 거절된 row 는
+#    다음 크롤링에서 다시 받음
+#  - 배치 저장 시간 / 소스별 저장 개수 / 실패는 metrics 에 기록
+# ---------------------------------------------------------
+PIPELINE_QUEUE = int(os.getenv("CRAWL_PIPELINE_QUEUE", "100"))
+PIPELINE_BATCH = int(os.getenv("CRAWL_PIPELINE_BATCH", "25"))
+PIPELINE_FLUSH = float(os.getenv("CRAWL_PIPELINE_FLUSH", "2"))
+
+_DONE = object()
+
+log = logs.get_logger("crawler.pipeline", os.getenv("CRAWL_LOG_LEVEL"))
+
+WRITE_SECONDS = metrics.histogram("crawl_batch_write_seconds", "Time to write one pipeline batch", ())
+WRITE_SIZE = metrics.histogram(
+    "crawl_batch_size", "Rows per pipeline batch", (), buckets=(1, 5, 10, 25, 50, 100),
+)
+WRITTEN = metrics.counter("crawl_items_written_total", "Rows in successfully written pipeline batches", ())
+
+
+def _no_progress(key, n=1):
+    pass
+
+
+def _report_error(source, exc):
+    log.warning("실패", source=source, error=f"{type(exc).__name__}: {exc}")
+
+
+class CrawlPipeline:
+    def __init__(
+        self,
+        normalize,
+        write,
+        state=None,
+        progress=_no_progress,
+        on_error=None,
+        batch_size: int = PIPELINE_BATCH,
+        flush_seconds: float = PIPELINE_FLUSH,
+        queue_size: int = PIPELINE_QUEUE,
+    ):
+        """
+        normalize(board, item) → 저장할 row (None 이면 버림)
+        write(rows) → (쓴 개수, 저장하지 못한 row 들) (예외를 내면 그 배치는 실패 처리)
+        state: crawl_state.CrawlState (None 이면 표시 안 함)
+        """
+        self._normalize = normalize
+        self._write = write
+        self._state = state
+        self._progress = progress
+        self._on_error = on_error or _report_error
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._queue_size = queue_size
+
+    def run(self, sources) -> dict:
+        """
+        sources: [(소스 이름, generator 를 만드는 함수)] — crawler_logic.crawl_sources()
+        generator 는 (게시판, item, 공지 id) 를 냄
+        → 소스별 / 전체 통계
+        """
+        parsed = queue.Queue(self._queue_size)
+        rows = queue.Queue(self._queue_size)
+        stats = {
+            "sources": {name: {"items": 0, "error": None} for name, _ in sources},
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+        }
+        lock = threading.Lock()
+
+        def collect(name, make_rows):
+            try:
+                for board, item, item_id in make_rows():
+                    parsed.put((name, board, item, item_id))      # 가득 차면 여기서 대기
+                    with lock:
+                        stats["sources"][name]["items"] += 1
+            except Exception as e:
+                with lock:
+                    stats["sources"][name]["error"] = f"{type(e).__name__}: {e}"
+                self._on_error(name, e)
+
+        def normalize():
+            while True:
+                entry = parsed.get()
+                if entry is _DONE:
+                    rows.put(_DONE)
+                    return
+                name, board, item, item_id = entry
+                try:
+                    row = self._normalize(board, item)
+                except Exception as e:
+                    crawl_fetch.FAILURES.inc(source="-", stage="normalize")
+                    self._on_error(name, e)
+                    continue
+                if row is not None:
+                    rows.put((name, item_id, row))
+
+        def write():
+            batch = []
+            deadline = None
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    entry = rows.get(timeout=timeout)
+                except queue.Empty:
+                    entry = None
+
+                if entry is not None and entry is not _DONE:
+                    batch.append(entry)
+                    if deadline is None:
+                        deadline = time.monotonic() + self._flush_seconds
+
+                full = len(batch) >= self._batch_size
+                expired = deadline is not None and time.monotonic() >= deadline
+                if batch and (full or expired or entry is _DONE):
+                    self._flush(batch, stats)
+                    batch, deadline = [], None
+
+                if entry is _DONE:
+                    return
+
+        collectors = [
+            threading.Thread(target=collect, args=(name, make_rows), daemon=True, name=f"crawl-src-{i}")
+            for i, (name, make_rows) in enumerate(sources)
+        ]
+        stages = [
+            threading.Thread(target=normalize, daemon=True, name="crawl-normalize"),
+            threading.Thread(target=write, daemon=True, name="crawl-write"),
+        ]
+        for t in collectors + stages:
+            t.start()
+        for t in collectors:
+            t.join()
+        parsed.put(_DONE)
+        for t in stages:
+            t.join()
+        return stats
+
+    def _flush(self, batch, stats):
+        started = time.perf_counter()
+        try:
+            written, rejected = self._write([row for _, _, row in batch])
+        except Exception as e:
+            stats["failed_batches"] += 1
+            crawl_fetch.FAILURES.inc(source="-", stage="write")      # 배치는 여러 소스가 섞임
+            self._on_error("write", e)
+            return
+        finally:
+            WRITE_SECONDS.observe(time.perf_counter() - started)
+        WRITE_SIZE.observe(len(batch))
+        WRITTEN.inc(len(batch))
+
+        stats["batches"] += 1
+        stats["written"] += written or 0
+        self._progress("items_written", written or 0)
+        if self._state is not None:
+            rejected = {id(row) for row in rejected}
+            self._state.add((name, item_id) for name, item_id, row in batch if id(row) not in rejected)
@@ -0,0 +1,134 @@
+# crawl_registry.py
+import json
+import os
+import threading
+
+
+# ---------------------------------------------------------
+# 🔥 크롤링 소스 등록부 (crawl_sources.json)
+#  - 게시판 하나 = 설정 한 줄: 목록 URL, 페이지 방식, 링크 / 상세 선택자, 주기
+#  - 새 학과 게시판은 "parser": "selectors" 로 선택자만 적으면 됨 (코드 수정 X)
+#  - 기존 wwwk / 관광학과 파서는 이름("wwwk" / "tourism")으로 그대로 사용
+#  - 소스마다 실행 중 표시(lock) → 스케줄러 / /crawl 이 같은 소스를 동시에 돌리지 않음
+# ---------------------------------------------------------
+CRAWL_SOURCES_PATH = os.getenv(
+    "CRAWL_SOURCES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_sources.json"),
+)
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "3"))
+DEFAULT_INTERVAL = 3600
+
+KINDS = ("board", "job_api")
+PARSERS = ("wwwk", "tourism", "selectors")
+SELECTOR_FIELDS = ("board", "title", "date", "content")
+
+
+class CrawlSource:
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.name = spec["name"]
+        self.kind = spec.get("kind", "board")
+        self.enabled = spec.get("enabled", True)
+        self.interval = float(spec.get("interval", DEFAULT_INTERVAL))
+        self.max_pages = int(spec.get("max_pages", CRAWL_MAX_PAGES))
+
+        # board
+        self.list_url = spec.get("list_url")
+        self.page_url = spec.get("page_url", "{list_url}&pageIndex={page}")
+        self.per_page = int(spec.get("per_page", 10))
+        self.link_selector = spec.get("link_selector")
+        self.detail_url = spec.get("detail_url")          # javascript 링크일 때 상세 URL 틀 ({id})
+        self.parser = spec.get("parser", "selectors")
+        self.selectors = spec.get("selectors", {})
+        self.label = spec.get("label", "")
+
+        # job_api
+        self.category_big = spec.get("category_big", "00")
+        self.category_mid = spec.get("category_mid", "00")
+
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        """
+        crawl_state 의 소스 키 (이미 본 공지 id 가 이 키로 저장됨)
+        """
+        if self.kind == "job_api":
+            return f"job:{self.category_big}/{self.category_mid}"
+        return self.list_url
+
+    def pages(self, max_pages: int = None) -> list:
+        n = max_pages or self.max_pages
+        return [
+            self.page_url.format(list_url=self.list_url, page=p, offset=(p - 1) * self.per_page, per_page=self.per_page)
+            for p in range(1, n + 1)
+        ]
+
+    def try_acquire(self) -> bool:
+        return self._lock.acquire(blocking=False)
+
+    def release(self):
+        self._lock.release()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+
+def _validate(spec: dict, seen: set):
+    name = spec.get("name")
+    if not name:
+        raise ValueError(f"crawl source without name: {spec}")
+    if name in seen:
+        raise ValueError(f"duplicate crawl source: {name}")
+
+    kind = spec.get("kind", "board")
+    if kind not in KINDS:
+        raise ValueError(f"{name}: unknown kind {kind!r} (expected one of {KINDS})")
+    if kind != "board":
+        return
+
+    for field in ("list_url", "link_selector"):
+        if not spec.get(field):
+            raise ValueError(f"{name}: {field} is required")
+    parser = spec.get("parser", "selectors")
+    if parser not in PARSERS:
+        raise ValueError(f"{name}: unknown parser {parser!r} (expected one of {PARSERS})")
+    if parser == "selectors":
+        selectors = spec.get("selectors") or {}
+        unknown = set(selectors) - set(SELECTOR_FIELDS) - {"board_name", "date_format"}
+        if unknown:
+            raise ValueError(f"{name}: unknown selectors {sorted(unknown)}")
+        if not selectors.get("title"):
+            raise ValueError(f"{name}: selectors.title is required")
+
+
+def load_sources(path: str = CRAWL_SOURCES_PATH) -> list:
+    """
+    설정 파일 → [CrawlSource] (설정 순서 = 결과를 합치는 순서)
+    """
+    with open(path, encoding="utf-8") as f:
+        specs = json.load(f)
+
+    sources = []
+    seen = set()
+    for spec in specs:
+        _validate(spec, seen)
+        seen.add(spec["name"])
+        sources.append(CrawlSource(spec))
+    return sources
+
+
+_sources = None
+_sources_lock = threading.Lock()
+
+
+def sources() -> list:
+    """
+    활성화된 소스 목록 (처음 부를 때 한 번 읽음 — lock 을 공유해야 하므로 객체는 계속 같은 것)
+    """
+    global _sources
+    with _sources_lock:
+        if _sources is None:
+            _sources = load_sources()
+        return [s for s in _sources if s.enabled]
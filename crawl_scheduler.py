@@ -0,0 +1,127 @@
+# crawl_scheduler.py
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import logs
+
+
+# ---------------------------------------------------------
+# 🔥 소스별 주기 크롤링 (프로세스 안 스케줄러)
+#  - 소스마다 crawl_sources.json 의 interval 주기로 실행, 소스끼리는 병렬
+#  - 매번 ±CRAWL_JITTER 비율만큼 흔들어서 여러 소스가 한꺼번에 몰리지 않게
+#  - 이전 실행이 안 끝났으면(또는 /crawl 이 같은 소스를 돌리는 중이면) 이번 차례는 건너뜀
+#  - 워커가 여러 개면 워커마다 돌기 때문에 CRAWL_SCHEDULER=1 인 프로세스에서만 켬
+# ---------------------------------------------------------
+CRAWL_SCHEDULER = os.getenv("CRAWL_SCHEDULER", "0") == "1"
+CRAWL_JITTER = float(os.getenv("CRAWL_JITTER", "0.1"))
+CRAWL_SCHEDULER_WORKERS = int(os.getenv("CRAWL_SCHEDULER_WORKERS", "4"))
+
+log = logs.get_logger("crawler.scheduler", os.getenv("CRAWL_LOG_LEVEL"))
+
+
+class _Entry:
+    def __init__(self, source, next_at: float):
+        self.source = source
+        self.next_at = next_at
+        self.runs = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_result = None
+        self.last_error = None
+        self.future = None
+
+
+class CrawlScheduler:
+    def __init__(self, run_source, sources, jitter: float = CRAWL_JITTER, workers: int = CRAWL_SCHEDULER_WORKERS):
+        """
+        run_source(source) → 결과 dict (소스 하나 크롤링 + 저장)
+        sources: crawl_registry 소스 목록
+        """
+        self._run_source = run_source
+        self._jitter = jitter
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = None
+
+        # 시작하자마자 전부 몰리지 않게 첫 실행도 주기 안에서 흩어 놓음
+        now = time.time()
+        self._entries = [_Entry(s, now + random.uniform(0, s.interval * jitter)) for s in sources]
+
+    def _delay(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="crawl-schedule")
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="crawl-scheduler")
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            pool, self._pool = self._pool, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                for entry in self._entries:
+                    if entry.next_at > now:
+                        continue
+                    entry.next_at = now + self._delay(entry.source.interval)
+                    if (entry.future is not None and not entry.future.done()) or entry.source.running:
+                        entry.skipped += 1      # 지난 실행이 아직 안 끝남 → 겹치지 않게 건너뜀
+                        continue
+                    entry.future = self._pool.submit(self._execute, entry)
+                wake = min((e.next_at for e in self._entries), default=now + 60)
+            self._stop.wait(max(0.5, wake - time.time()))
+
+    def _execute(self, entry: _Entry):
+        entry.last_started = time.time()
+        try:
+            entry.last_result = self._run_source(entry.source)
+            entry.last_error = None
+        except Exception as e:
+            log.exception("주기 크롤링 실패", source=entry.source.name)
+            entry.last_error = f"{type(e).__name__}: {e}"
+        finally:
+            entry.runs += 1
+            entry.last_finished = time.time()
+
+    def status(self) -> dict:
+        def fmt(t):
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t)) if t else None
+
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "sources": [
+                    {
+                        "name": e.source.name,
+                        "interval": e.source.interval,
+                        "active": e.source.running,
+                        "next_at": fmt(e.next_at),
+                        "runs": e.runs,
+                        "skipped": e.skipped,
+                        "last_started": fmt(e.last_started),
+                        "last_finished": fmt(e.last_finished),
+                        "last_result": e.last_result,
+                        "last_error": e.last_error,
+                    }
+                    for e in self._entries
+                ],
+            }
@@ -0,0 +1,98 @@
+# crawl_state.py
+import os
+import sqlite3
+import threading
+import time
+
+
+# ---------------------------------------------------------
+# 🔥 증분 크롤링 상태 (소스별로 이미 본 공지 id)
+#  - id 는 ingest.source_key (nttNo / articleNo / job 제목+등록일) → DB 의 source_key 와 같음
+#  - 크롤러는 아는 공지의 상세 페이지를 다시 받지 않고,
+#    목록 한 페이지가 전부 아는 공지면 그 뒤 페이지는 넘기지 않음
+#  - 저장까지 끝난 id 만 기록: crawl_pipeline 이 배치를 쓸 때마다 그 배치의 id 를 add()
+#    (저장이 실패한 공지는 기록되지 않음 → 다음 크롤링에서 다시 받음)
+#  - 저장할 테이블마다 따로 (for_table) — crawler.py(Notices)가 본 공지를
+#    /crawl(장학금 테이블)이 건너뛰지 않게
+# ---------------------------------------------------------
+CRAWL_STATE_DIR = os.getenv("CRAWL_STATE_DIR", ".cache/crawl_state")
+CRAWL_INCREMENTAL = os.getenv("CRAWL_INCREMENTAL", "1") == "1"
+
+
+class CrawlState:
+    def __init__(self, path: str, enabled: bool = CRAWL_INCREMENTAL):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._db = None
+        self._known = {}            # source → set(id) (처음 조회할 때 디스크에서 읽음)
+
+    def _conn(self):
+        # self._lock 안에서만 호출
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                " source TEXT NOT NULL, item_id TEXT NOT NULL, first_seen REAL NOT NULL,"
+                " PRIMARY KEY (source, item_id))"
+            )
+        return self._db
+
+    def _source(self, source: str) -> set:
+        # self._lock 안에서만 호출
+        known = self._known.get(source)
+        if known is None:
+            rows = self._conn().execute("SELECT item_id FROM seen WHERE source = ?", (source,))
+            known = self._known[source] = {r[0] for r in rows}
+        return known
+
+    def known(self, source: str, item_id) -> bool:
+        """
+        이미 저장까지 끝난 공지인지 (비활성화면 항상 False → 전체 크롤링)
+        """
+        if not self.enabled or item_id is None:
+            return False
+        with self._lock:
+            return item_id in self._source(source)
+
+    def add(self, pairs) -> int:
+        """
+        [(소스, id)] 를 바로 기록 (crawl_pipeline 이 배치 저장이 끝날 때마다)
+        """
+        rows = [(s, i, time.time()) for s, i in pairs if i is not None]
+        if not rows:
+            return 0
+        with self._lock:
+            db = self._conn()
+            db.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", rows)
+            db.commit()
+            for source, item_id, _ in rows:
+                self._source(source).add(item_id)
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn().execute("SELECT source, COUNT(*) FROM seen GROUP BY source").fetchall()
+            return {
+                "enabled": self.enabled,
+                "sources": dict(rows),
+            }
+
+
+_by_table = {}
+_by_table_lock = threading.Lock()
+
+
+def for_table(table_name: str) -> CrawlState:
+    """
+    table_name 에 저장하는 크롤러의 상태 (테이블마다 파일 하나, 프로세스 안에서는 같은 객체)
+    """
+    with _by_table_lock:
+        state = _by_table.get(table_name)
+        if state is None:
+            path = os.path.join(CRAWL_STATE_DIR, f"{table_name}.sqlite3")
+            state = _by_table[table_name] = CrawlState(path)
+        return state
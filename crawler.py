@@ -1,36 +1,127 @@
 # crawler.py
 
-import boto3
+import os
 from datetime import datetime
-from crawler_logic import run_all_crawlers
-
-dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-2")
-table = dynamodb.Table("Notices")
-
-def save_to_dynamodb(data):
-    for _, items in data.items():
-        for item in items:
-
-            # 너가 원하는 필드 스키마로 변환
-            table.put_item(
-                Item={
-                    "url": item.get("url"),     # PK
-                    "title": item.get("title"),
-                    "type": item.get("type"),
-                    "major": item.get("major"),
-                    "grade": item.get("grade"),
-                    "price": item.get("price"),
-                    "start_at": item.get("start_at"),
-                    "end_at": item.get("end_at"),
-                    "content": item.get("content"),
-                    "etc": item.get("etc"),
-                    "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-            )
-
-    print("✅ DynamoDB 저장 완료!")
+from crawler_logic import crawl_sources, fetch_report
+import crawl_fetch
+import crawl_state
+from crawl_pipeline import CrawlPipeline
+from botocore.exceptions import ClientError
+from dynamo import get_table, put_item, scan_all
+from ingest import batch_write, content_hash
+import logs
+
+log = logs.get_logger("crawler", os.getenv("CRAWL_LOG_LEVEL"))
+
+table = get_table("Notices", region="ap-northeast-2")
+
+def notice_row(item):
+    # 너가 원하는 필드 스키마로 변환
+    return {
+        "url": item.get("url"),     # PK
+        "title": item.get("title"),
+        "type": item.get("type"),
+        "major": item.get("major"),
+        "grade": item.get("grade"),
+        "price": item.get("price"),
+        "start_at": item.get("start_at"),
+        "end_at": item.get("end_at"),
+        "content": item.get("content"),
+        "etc": item.get("etc"),
+        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def load_existing():
+    # 저장돼 있는 url → 내용 해시
+    return {
+        i["url"]: i.get("content_hash")
+        for i in scan_all(
+            table,
+            ProjectionExpression="#u, content_hash",
+            ExpressionAttributeNames={"#u": "url"},
+        )
+    }
+
+
+def save_rows(rows, existing, counts):
+    """
+    rows: notice_row() 결과들 — 새 공지는 배치 저장, 바뀐 공지만 조건부 덮어쓰기
+    existing 은 저장한 만큼 갱신 (다음 배치에서 같은 url 이 새 공지로 잡히지 않게)
+    → (쓴 개수, 조건부 쓰기가 거절된 row 들)
+    """
+    # url(PK) 기준으로 모음 — 같은 배치에 중복 키가 있으면 batch_write 가 거절함
+    by_url = {row.get("url"): row for row in rows}
+
+    new_rows = []
+    rejected = set()
+    written = 0
+
+    for url, row in by_url.items():
+        digest = content_hash(row)   # updated_at 은 해시에서 제외됨
+        row["content_hash"] = digest
+
+        if url not in existing:
+            new_rows.append(row)
+            continue
+
+        old = existing[url]
+        if old == digest:
+            counts["unchanged"] += 1
+            continue
+
+        # 바뀐 공지만 조건부로 덮어쓰기 (그 사이 다른 쪽이 바꿨으면 건너뜀)
+        condition = {"ConditionExpression": "attribute_not_exists(content_hash)"}
+        if old:
+            condition = {
+                "ConditionExpression": "content_hash = :old",
+                "ExpressionAttributeValues": {":old": old},
+            }
+
+        try:
+            put_item(table, row, **condition)
+            counts["updated"] += 1
+            existing[url] = digest
+            written += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            counts["conflicts"] += 1
+            rejected.add(url)
+
+    batch_write(table, new_rows)
+    counts["inserted"] += len(new_rows)
+    for row in new_rows:
+        existing[row["url"]] = row["content_hash"]
+    return written + len(new_rows), [row for row in rows if row.get("url") in rejected]
+
+
+def _new_counts():
+    return {"inserted": 0, "updated": 0, "unchanged": 0, "conflicts": 0}
+
+
+def crawl_to_dynamodb():
+    """
+    크롤링하면서 바로 저장 (crawl_pipeline) — 파싱된 공지는 몇 초 안에 테이블에 들어감
+    """
+    existing = load_existing()
+    counts = _new_counts()
+    state = crawl_state.for_table(table.name)     # Notices 테이블 기준으로 본 공지
+
+    pipeline = CrawlPipeline(
+        normalize=lambda board, item: notice_row(item),
+        write=lambda rows: save_rows(rows, existing, counts),
+        state=state,
+    )
+    before = crawl_fetch.stats.snapshot()
+    stats = pipeline.run(crawl_sources(state=state))
+    fetch_report(before)
+
+    log.info("DynamoDB 저장 완료", **counts, written=stats["written"], batches=stats["batches"],
+             failed_batches=stats["failed_batches"])
+    return counts
+
 
 if __name__ == "__main__":
-    print("🔍 크롤링 시작…")
-    data = run_all_crawlers()
-    save_to_dynamodb(data)
\ No newline at end of file
+    log.info("크롤링 시작")
+    crawl_to_dynamodb()
@@ -1,9 +1,65 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime
+import os
 import time
 
+import crawl_fetch
+import html_parse
+import crawl_registry
+import logs
+import metrics
+from ingest import source_key
+
+# -------------------------------------------------------
+# 공통 - 로그 / 지표
+#   CRAWL_LOG_LEVEL: 크롤러 로그 레벨 (없으면 LOG_LEVEL, 상세 요청은 DEBUG, 운영은 WARNING / OFF)
+#   지표는 소스별로 기록 → /metrics
+# -------------------------------------------------------
+
+log = logs.get_logger("crawler", os.getenv("CRAWL_LOG_LEVEL"))
+
+PARSE_SECONDS = metrics.histogram("crawl_parse_seconds", "HTML / JSON parse time per page", ("source", "page"))
+PAGES = metrics.counter("crawl_pages_total", "Pages fetched and parsed", ("source",))
+ITEMS = metrics.counter("crawl_items_total", "Notices found (new = parsed, known = skipped by the seen-set)", ("source", "outcome"))
+RETRIES = metrics.counter("crawl_retries_total", "Crawler request retries", ("source",))
+SOURCE_SECONDS = metrics.histogram(
+    "crawl_source_seconds", "Wall time of one crawl of a source", ("source",),
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+SOURCE_RUNS = metrics.counter("crawl_source_runs_total", "Crawl runs per source by result", ("source", "result"))
+
+# progress 키 → 지표
+_PROGRESS_METRICS = {
+    "pages_fetched": (PAGES, {}),
+    "items_parsed": (ITEMS, {"outcome": "new"}),
+    "items_skipped": (ITEMS, {"outcome": "known"}),
+}
+
+
+def _measured(progress, source):
+    # progress 콜백을 감싸서 같은 카운트를 소스별 지표에도 기록
+    def bump(key, n=1):
+        counted = _PROGRESS_METRICS.get(key)
+        if counted is not None:
+            metric, labels = counted
+            metric.inc(n, source=source, **labels)
+        progress(key, n)
+    return bump
+
+
+def _parse_timer(page):
+    return PARSE_SECONDS.time(source=crawl_fetch.current_source.get(), page=page)
+
+# -------------------------------------------------------
+# 공통 - 진행 상황 콜백
+#   progress(key, n) : pages_fetched / items_parsed 등 카운트
+#   on_error(source, exc) : 소스 하나가 실패했을 때
+# -------------------------------------------------------
+
+def _no_progress(key, n=1):
+    pass
+
+
 # -------------------------------------------------------
 # 공통 - 날짜 파싱
 # -------------------------------------------------------
@@ -17,14 +73,41 @@ def parse_korean_datetime(text):
     return datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
 
 
+def _drain(details, date_format, progress):
+    """
+    details: [(url, 공지 id, Future)] — 제출한 순서대로 결과를 꺼내
+    (게시판, item, 공지 id) 를 yield
+    """
+    for full, item_id, future in details:
+        board, title, date, content = future.result()
+        progress("pages_fetched")
+        progress("items_parsed")
+
+        yield board, {
+            "url": full,
+            "title": title,
+            "date": date.strftime(date_format) if date else None,
+            "content": content
+        }, item_id
+
+
+
 # -------------------------------------------------------
 # ① wwwk.kangwon 공지 크롤러
 # -------------------------------------------------------
 
+WWWK_DETAIL = html_parse.subtrees(".sub_title h2", "tr.subject td", "span.write strong", "#bbs_ntt_cn_con")
+
+
 def parse_detail(url):
-    print(f"   🔎 상세 요청: {url}")   # 디버깅용 로그 추가
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text, "html.parser")
+    log.debug("상세 요청", url=url)
+    res = crawl_fetch.get(url, max_age=crawl_fetch.CRAWL_DETAIL_MAX_AGE)
+    with _parse_timer("detail"):
+        return parse_detail_html(res.text)
+
+
+def parse_detail_html(text, parser=None, strain=None):
+    soup = html_parse.parse(text, WWWK_DETAIL, parser, strain)
 
     board_tag = soup.select_one(".sub_title h2")
     board = board_tag.get_text(strip=True) if board_tag else "unknown"
@@ -42,53 +125,22 @@ def parse_detail(url):
     return board, title, date, content
 
 
-def crawl_list(list_url, max_pages=1):
-    grouped = {}
-
-    for p in range(1, max_pages + 1):
-        url = f"{list_url}&pageIndex={p}"
-        print(f"➡️ 목록 요청: {url}")   # 디버깅용 로그 추가
-
-        res = requests.get(url)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        links = soup.select("a[href*='selectBbsNttView']")
-        print(f"   ➕ 발견된 상세링크 수: {len(links)}")  # 몇 개 크롤했는지 로그
-
-        for a in links:
-            href = a.get("href")
-
-            if "javascript" in href:
-                parts = href.split("'")
-                ntt_no = parts[1]
-                base = list_url.split("selectBbsNttList")[0]
-                full = f"{base}selectBbsNttView.do?nttNo={ntt_no}"
-            else:
-                full = urljoin(list_url, href)
-
-            board, title, date, content = parse_detail(full)
-
-            if board not in grouped:
-                grouped[board] = []
-
-            grouped[board].append({
-                "url": full,
-                "title": title,
-                "date": date.strftime("%Y-%m-%d %H:%M:%S") if date else None,
-                "content": content
-            })
-
-    return grouped
-
-
 # -------------------------------------------------------
 # ② 관광학과
 # -------------------------------------------------------
 
+TOURISM_DETAIL = html_parse.subtrees(".b-title-box", ".b-date-box span:nth-child(2)", ".b-content-box")
+
+
 def parse_tourism_detail(url):
-    print(f"   🔎 관광 상세: {url}")
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text, "html.parser")
+    log.debug("관광 상세 요청", url=url)
+    res = crawl_fetch.get(url, max_age=crawl_fetch.CRAWL_DETAIL_MAX_AGE)
+    with _parse_timer("detail"):
+        return parse_tourism_detail_html(res.text)
+
+
+def parse_tourism_detail_html(text, parser=None, strain=None):
+    soup = html_parse.parse(text, TOURISM_DETAIL, parser, strain)
 
     board = "관광학과 공지"
 
@@ -117,38 +169,6 @@ def parse_tourism_detail(url):
     return board, title, date, content
 
 
-def crawl_tourism_list(list_url, max_pages=1):
-    grouped = {}
-
-    for p in range(1, max_pages + 1):
-        url = f"{list_url}?article.offset={(p-1)*10}&articleLimit=10"
-        print(f"➡️ 관광 목록 요청: {url}")
-
-        res = requests.get(url)
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        links = soup.select("a[href*='articleNo']")
-        print(f"   ➕ 관광 상세링크 수: {len(links)}")
-
-        for a in links:
-            href = a.get("href")
-            full = urljoin(list_url, href)
-
-            board, title, date, content = parse_tourism_detail(full)
-
-            if board not in grouped:
-                grouped[board] = []
-
-            grouped[board].append({
-                "url": full,
-                "title": title,
-                "date": date.strftime("%Y-%m-%d") if date else None,
-                "content": content
-            })
-
-    return grouped
-
-
 # -------------------------------------------------------
 # ③ 대학일자리플러스 Job 크롤러
 # -------------------------------------------------------
@@ -162,13 +182,19 @@ job_headers = {
 }
 
 def fetch_json(url):
-    print(f"   🔎 job API 요청: {url}")
-    for _ in range(3):
-        res = requests.get(url, headers=job_headers)
+    log.debug("job API 요청", url=url)
+    source = crawl_fetch.current_source.get()
+    for attempt in range(3):
+        if attempt:
+            RETRIES.inc(source=source)
+        res = crawl_fetch.get(url, headers=job_headers)
         try:
-            return res.json()
+            with _parse_timer("json"):
+                return res.json()
         except:
             time.sleep(0.3)
+    crawl_fetch.FAILURES.inc(source=source, stage="parse")
+    log.warning("job API 응답을 JSON 으로 읽지 못함", url=url, status=res.status_code)
     return None
 
 
@@ -196,52 +222,207 @@ def get_job_list(category_big, category_mid, page, per_page=9):
     return notice_list, total_page
 
 
-def crawl_job_all(category_big="00", category_mid="00", max_pages=3):
-    print("➡️ job 전체 크롤링 시작")
-    all_items = []
+JOB_BOARD = "대학일자리플러스"
 
-    first_list, total_pages = get_job_list(category_big, category_mid, 1)
-    all_items.extend(first_list)
 
-    total_pages = min(total_pages, max_pages)
+def job_source(category_big="00", category_mid="00") -> str:
+    return f"job:{category_big}/{category_mid}"
 
-    for p in range(2, total_pages + 1):
-        time.sleep(0.3)
-        lst, _ = get_job_list(category_big, category_mid, p)
-        all_items.extend(lst)
 
-    return [convert_job_item(i) for i in all_items]
+def iter_job_all(category_big="00", category_mid="00", max_pages=3, progress=_no_progress, state=None):
+    """
+    job 공지 → (JOB_BOARD, item, 공지 id) 를 yield
+    """
+    log.info("job 전체 크롤링 시작", category=f"{category_big}/{category_mid}")
+    source = job_source(category_big, category_mid)
+
+    total_pages = 1
+    p = 1
+    while p <= total_pages:
+        if p > 1:
+            time.sleep(0.3)
+        lst, pages = get_job_list(category_big, category_mid, p)
+        progress("pages_fetched")
+        if p == 1:
+            total_pages = min(pages, max_pages)
+
+        fresh = 0
+        for raw in lst:
+            item = convert_job_item(raw)
+            item_id = source_key(item)
+            if state is not None and state.known(source, item_id):
+                progress("items_skipped")
+                continue
+            progress("items_parsed")
+            fresh += 1
+            yield JOB_BOARD, item, item_id
+
+        if lst and not fresh:
+            log.info("새 공지 없음 → 다음 페이지 생략", source=source, page=p)
+            break
+        p += 1
 
 
 # -------------------------------------------------------
-# ④ 전체 통합 크롤링 함수
+# ④ 설정 기반 게시판 크롤러 (crawl_registry 의 소스 하나)
 # -------------------------------------------------------
 
-def run_all_crawlers():
-    print("🟦 [CRAWL] run_all_crawlers() 시작")
+def parse_by_selectors(url, selectors):
+    """
+    "parser": "selectors" 게시판 상세 → (게시판, 제목, 날짜, 본문)
+    selectors: board / title / date / content (CSS 선택자), board_name (고정 게시판 이름),
+               date_format (strptime 형식, "korean" 이면 'YYYY년MM월DD일 HH시MM분SS초')
+    """
+    log.debug("상세 요청", url=url)
+    res = crawl_fetch.get(url, max_age=crawl_fetch.CRAWL_DETAIL_MAX_AGE)
+    only = html_parse.subtrees(*(selectors.get(f) for f in ("board", "title", "date", "content")))
+    with _parse_timer("detail"):
+        soup = html_parse.parse(res.text, only)
+
+    def text(field, separator=""):
+        tag = soup.select_one(selectors[field]) if selectors.get(field) else None
+        return tag.get_text(separator, strip=True) if tag else None
+
+    board = selectors.get("board_name") or text("board") or "unknown"
+    title = text("title")
+    content = text("content", "\n")
+
+    raw_date = text("date")
+    date = None
+    if raw_date:
+        try:
+            if selectors.get("date_format", "korean") == "korean":
+                date = parse_korean_datetime(raw_date)
+            else:
+                date = datetime.strptime(raw_date, selectors["date_format"])
+        except ValueError:
+            pass
 
-    result = {}
+    return board, title, date, content
 
-    # ---- www.kangwon ----
-    url_list = [
-        "https://wwwk.kangwon.ac.kr/www/selectBbsNttList.do?bbsNo=37&key=1176",
-        "https://wwwk.kangwon.ac.kr/www/selectBbsNttList.do?bbsNo=81&key=277",
-        "https://wwwk.kangwon.ac.kr/www/selectBbsNttList.do?bbsNo=34&key=232",
-        "https://wwwk.kangwon.ac.kr/www/selectBbsNttList.do?bbsNo=117&key=768"
-    ]
 
-    for url in url_list:
-        for board, items in crawl_list(url, max_pages=3).items():
-            result.setdefault(board, []).extend(items)
+# parser 이름 → (상세 파서, item 날짜 형식)
+DETAIL_PARSERS = {
+    "wwwk": (parse_detail, "%Y-%m-%d %H:%M:%S"),
+    "tourism": (parse_tourism_detail, "%Y-%m-%d"),
+}
+
+
+def _detail_parser(source):
+    if source.parser == "selectors":
+        return (lambda url: parse_by_selectors(url, source.selectors)), "%Y-%m-%d %H:%M:%S"
+    return DETAIL_PARSERS[source.parser]
+
+
+def _detail_url(source, href):
+    # javascript:fn('12345') 형태 링크 → detail_url 틀에 id 를 넣음
+    if "javascript" in href and source.detail_url:
+        return urljoin(source.list_url, source.detail_url.format(id=href.split("'")[1]))
+    return urljoin(source.list_url, href)
+
 
-    # ---- 관광학과 ----
-    tourism_url = "https://tourism.kangwon.ac.kr/tourism/community/notice.do"
-    for board, items in crawl_tourism_list(tourism_url, max_pages=3).items():
-        result.setdefault(board, []).extend(items)
+def iter_board(source, max_pages=None, progress=_no_progress, state=None):
+    """
+    게시판 소스 → (게시판, item, 공지 id) 를 목록 순서대로 yield
+    목록은 한 페이지 앞서 받아 두고, 상세는 발견하는 대로 풀에 제출
+    → 지금 페이지의 상세를 제출한 뒤에 앞 페이지 결과를 내보냄
+    """
+    parse, date_format = _detail_parser(source)
+    label = source.label
+    details = []
+
+    for url, res in crawl_fetch.prefetch(source.pages(max_pages)):
+        previous, details = details, []
+        progress("pages_fetched")
+        with _parse_timer("list"):
+            soup = html_parse.parse(res.text, html_parse.subtrees(source.link_selector))
+            links = soup.select(source.link_selector)
+
+        fresh = 0
+        for a in links:
+            full = _detail_url(source, a.get("href"))
+            item_id = source_key({"url": full})
+            if state is not None and state.known(source.key, item_id):
+                progress("items_skipped")
+                continue
+            details.append((full, item_id, crawl_fetch.submit(parse, full)))
+            fresh += 1
+        log.info(f"{label}목록", source=source.name, url=url, links=len(links), new=fresh)
+
+        yield from _drain(previous, date_format, progress)
+
+        # 이 페이지가 전부 아는 공지 → 뒤 페이지는 더 오래된 것
+        if links and not fresh:
+            log.info("새 공지 없음 → 다음 페이지 생략", source=source.name)
+            break
+
+    yield from _drain(details, date_format, progress)
+
+
+def iter_source(source, max_pages=None, progress=_no_progress, state=None):
+    """
+    소스 종류에 맞는 generator — 이미 실행 중인 소스면 아무것도 내지 않음 (겹쳐 돌지 않게)
+    """
+    if not source.try_acquire():
+        SOURCE_RUNS.inc(source=source.name, result="skipped")
+        log.info("실행 중 → 건너뜀", source=source.name)
+        return
+
+    # 이 소스의 요청 / 파싱 지표는 source.name 라벨로 (풀에 넘긴 상세 요청 포함)
+    previous = crawl_fetch.current_source.get()
+    crawl_fetch.current_source.set(source.name)
+    progress = _measured(progress, source.name)
+    started = time.perf_counter()
+    result = "aborted"      # 끝까지 안 받고 닫힘
+    try:
+        if source.kind == "job_api":
+            yield from iter_job_all(
+                source.category_big, source.category_mid,
+                max_pages=max_pages or source.max_pages, progress=progress, state=state,
+            )
+        else:
+            yield from iter_board(source, max_pages, progress, state)
+        result = "ok"
+    except Exception:
+        result = "error"
+        crawl_fetch.FAILURES.inc(source=source.name, stage="source")
+        raise
+    finally:
+        SOURCE_SECONDS.observe(time.perf_counter() - started, source=source.name)
+        SOURCE_RUNS.inc(source=source.name, result=result)
+        crawl_fetch.current_source.set(previous)
+        source.release()
+
+
+# -------------------------------------------------------
+# ⑤ 전체 통합 크롤링 함수
+# -------------------------------------------------------
+
+def crawl_sources(max_pages=None, progress=_no_progress, state=None, sources=None):
+    """
+    → [(소스 키, 인자 없이 부르면 (게시판, item, 공지 id) 를 내는 generator 를 만드는 함수)]
+    소스 키는 state 의 키와 같음 (crawl_pipeline 이 저장 후 id 를 표시할 때 사용)
+    state: 저장할 테이블의 crawl_state.for_table(...) — None 이면 이미 본 공지도 다시 받음
+    sources: crawl_registry 소스 목록 (None 이면 설정 파일의 활성 소스 전부)
+    """
+    if sources is None:
+        sources = crawl_registry.sources()
+    return [
+        (source.key, lambda source=source: iter_source(source, max_pages, progress, state))
+        for source in sources
+    ]
 
-    # ---- Job ----
-    job_items = crawl_job_all(max_pages=3)
-    result["대학일자리플러스"] = job_items
 
-    print("🟩 [CRAWL] 완료")
-    return result
+def fetch_report(before: dict, progress=_no_progress) -> dict:
+    """
+    이번 크롤링에서 받은 바이트 / 캐시로 아낀 양을 보고
+    """
+    used = crawl_fetch.stats.since(before)
+    progress("bytes_downloaded", used["bytes_downloaded"])
+    progress("cache_hits", used["fresh_hits"] + used["not_modified"])
+    log.info(
+        "크롤링 완료",
+        requests=used["requests"], bytes_downloaded=used["bytes_downloaded"],
+        fresh_hits=used["fresh_hits"], not_modified=used["not_modified"], bytes_saved=used["bytes_saved"],
+    )
+    return used
@@ -0,0 +1,207 @@
+# dynamo.py
+import asyncio
+import base64
+import contextvars
+import functools
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import boto3
+from botocore.config import Config
+
+import metrics
+from request_trace import span
+
+
+# ---------------------------------------------------------
+# 🔥 DynamoDB 접근 계층
+#  - main.py 의 모든 DynamoDB 호출은 여기를 거침
+#  - boto3 는 동기 라이브러리 → async 엔드포인트에서는
+#    전용 스레드풀(run_blocking)에서 실행해 이벤트 루프를 막지 않음
+#  - 커넥션 풀 크기는 동시에 DynamoDB 를 부를 수 있는 스레드 수에 맞춤
+#  - 쓰기 지연 시간은 테이블 / 연산별로 metrics 에 기록 (WRITE_SECONDS)
+#  - API 요청 안에서 부르면 걸린 시간이 요청의 dynamodb span 으로 잡힘 (request_trace)
+# ---------------------------------------------------------
+DEFAULT_REGION = os.getenv("DYNAMODB_REGION", "us-east-2")   # 오하이오
+DB_WORKERS = int(os.getenv("DB_WORKERS", "16"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "64"))          # 스레드풀 + 스캔/배치 워커 여유분
+DB_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT") or None          # 로컬 테스트용 (예: http://localhost:8000)
+
+_config = Config(
+    max_pool_connections=DB_POOL_SIZE,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+)
+
+WRITE_SECONDS = metrics.histogram("dynamodb_write_seconds", "DynamoDB write call latency", ("table", "op"))
+WRITE_RETRIES = metrics.counter(
+    "dynamodb_write_retries_total", "DynamoDB writes retried by us (unprocessed batch items)", ("table", "op"),
+)
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="dynamo")
+
+_resources = {}
+_resources_lock = threading.Lock()
+
+
+def get_table(name: str, region: str = DEFAULT_REGION):
+    with _resources_lock:
+        if region not in _resources:
+            _resources[region] = boto3.resource(
+                "dynamodb", region_name=region, config=_config, endpoint_url=DB_ENDPOINT
+            )
+        return _resources[region].Table(name)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """
+    동기 함수를 DynamoDB 전용 스레드풀에서 실행하고 결과를 await
+    """
+    loop = asyncio.get_running_loop()
+    # 요청 컨텍스트(request_trace)를 같이 넘김 → 스레드풀에서 연 span 도 같은 요청에 기록
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, functools.partial(context.run, fn, *args, **kwargs))
+
+
+# -----------------------------
+# 단건 조회 / 쓰기
+# -----------------------------
+def get_item(table, key: dict):
+    with span("dynamodb"):
+        return table.get_item(Key=key).get("Item")
+
+
+def put_item(table, item: dict, **kwargs):
+    with span("dynamodb"), WRITE_SECONDS.time(table=table.name, op="put_item"):
+        return table.put_item(Item=item, **kwargs)
+
+
+async def aget_item(table, key: dict):
+    return await run_blocking(get_item, table, key)
+
+
+async def aput_item(table, item: dict, **kwargs):
+    return await run_blocking(put_item, table, item, **kwargs)
+
+
+# ---------------------------------------------------------
+# 🔥 전체 스캔 (LastEvaluatedKey 끝까지 따라감)
+#  - table.scan() 한 번은 최대 1MB 까지만 읽음
+# ---------------------------------------------------------
+def scan_pages(table, **kwargs):
+    """
+    스캔 결과를 페이지(1MB) 단위로 yield
+    kwargs 는 table.scan() 에 그대로 전달 (Segment, ProjectionExpression 등)
+    """
+    while True:
+        with span("dynamodb"):
+            res = table.scan(**kwargs)
+        yield res.get("Items", [])
+
+        last_key = res.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def scan_all(table, segments: int = 1, **kwargs) -> list:
+    """
+    테이블 전체 item 을 반환.
+    segments > 1 이면 Segment/TotalSegments 로 나눠서 병렬 스캔
+    """
+    if segments <= 1:
+        items = []
+        for page in scan_pages(table, **kwargs):
+            items.extend(page)
+        return items
+
+    def scan_segment(segment):
+        items = []
+        for page in scan_pages(table, Segment=segment, TotalSegments=segments, **kwargs):
+            items.extend(page)
+        return items
+
+    # 세그먼트마다 요청 컨텍스트를 복사해서 넘김 (span 은 겹치므로 병렬 스캔 전체가 하나로 잡힘)
+    with span("dynamodb"), ThreadPoolExecutor(max_workers=segments) as ex:
+        futures = [ex.submit(contextvars.copy_context().run, scan_segment, s) for s in range(segments)]
+        results = [f.result() for f in futures]
+
+    return [item for part in results for item in part]
+
+
+async def ascan_all(table, segments: int = 1, **kwargs) -> list:
+    return await run_blocking(scan_all, table, segments, **kwargs)
+
+
+# ---------------------------------------------------------
+# 🔥 Query (GSI 파티션 하나만 읽음, 조건식은 gsi_query.py)
+# ---------------------------------------------------------
+def query_pages(table, **kwargs):
+    """
+    Query 결과를 페이지 단위로 yield (LastEvaluatedKey 끝까지)
+    """
+    while True:
+        with span("dynamodb"):
+            res = table.query(**kwargs)
+        yield res.get("Items", [])
+
+        last_key = res.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def query_all(table, **kwargs) -> list:
+    items = []
+    for page in query_pages(table, **kwargs):
+        items.extend(page)
+    return items
+
+
+async def aquery_all(table, **kwargs) -> list:
+    return await run_blocking(query_all, table, **kwargs)
+
+
+def projection(fields) -> dict:
+    """
+    필드 목록 → scan() 에 넘길 ProjectionExpression 인자
+    (type, url 같은 예약어 때문에 항상 #이름 으로 치환)
+    """
+    if not fields:
+        return {}
+    names = {f"#p{i}": f for i, f in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+# ---------------------------------------------------------
+# 🔥 커서 (클라이언트에는 불투명한 문자열로 전달)
+# ---------------------------------------------------------
+def json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"not serializable: {type(value)}")
+
+
+def encode_cursor(key: dict) -> str:
+    raw = json.dumps(key, default=json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    잘못된 커서면 ValueError
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+    if not isinstance(key, dict):
+        raise ValueError("invalid cursor")
+    return key
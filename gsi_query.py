@@ -0,0 +1,295 @@
+# gsi_query.py
+import time
+
+import canonical
+
+
+# ---------------------------------------------------------
+# 🔥 GSI 조회 계층 (분류 / 전공 + 마감일)
+#  - type + deadline, major_key + deadline 두 개의 GSI
+#    → 분류로 거른 요청은 해당 파티션만 Query (전체 Scan X)
+#  - major_key 는 대표 전공 하나뿐 (GSI 는 item 하나에 키 하나) → 복수 전공 item 이 빠지므로
+#    API 의 전공 필터는 스냅샷의 전공 역색인(match_index.by_major)을 씀
+#  - deadline 은 end_at 을 'YYYY-MM-DD HH:MM:SS' 로 맞춘 값 (정렬 = 시간 순)
+#    마감이 없는 공지는 NO_DEADLINE → 인덱스에서 빠지지 않음
+#  - open_only: 지금 접수 중 (start_at ≤ 지금 ≤ deadline)
+#  - GSI 키 속성은 null / 빈 문자열이면 쓰기가 거절됨 → 쓰기 직전에만 뺌 (storable)
+#    읽을 때 빠진 type 은 null 로 되돌림 (restore) → API 응답 모양은 그대로
+#  - DYNAMODB_ENDPOINT 로 로컬 DynamoDB(DynamoDB Local / moto)에서 테스트
+#    create_table() 로 같은 스키마(GSI 포함) 테이블을 만들 수 있음
+# ---------------------------------------------------------
+TYPE_INDEX = "type-deadline-index"
+MAJOR_INDEX = "major_key-deadline-index"
+NO_DEADLINE = "9999-12-31 23:59:59"
+
+INDEXES = {
+    TYPE_INDEX: "type",
+    MAJOR_INDEX: "major_key",
+}
+KEY_ATTRIBUTES = ("deadline", *INDEXES.values())
+NULLABLE_FIELDS = ("type",)      # 원래 item 필드인 GSI 키 (null 이면 저장할 때 빠짐)
+
+
+def deadline_of(end_at) -> str:
+    """
+    end_at → 정렬 가능한 마감 시각 ('2025-11-20' → '2025-11-20 23:59:59')
+    """
+    if not isinstance(end_at, str) or not end_at.strip():
+        return NO_DEADLINE
+    end_at = end_at.strip()
+    if len(end_at) == 10:
+        return end_at + " 23:59:59"
+    return end_at
+
+
+def add_index_fields(item: dict) -> dict:
+    """
+    저장할 item 에 GSI 키를 붙임 (deadline 은 항상, major_key 는 대표 전공 키 — 전공 필터용 아님)
+    """
+    item["deadline"] = deadline_of(item.get("end_at"))
+
+    major_key = canonical.canonical_major(item.get("major"))
+    if major_key:
+        item["major_key"] = major_key
+    return item
+
+
+def _valid_key(value) -> bool:
+    return isinstance(value, str) and value != ""
+
+
+def storable(item: dict) -> dict:
+    """
+    테이블에 보낼 사본 — null / 빈 문자열인 GSI 키 속성만 뺌 (item 자체는 그대로)
+    """
+    if all(_valid_key(item[a]) for a in KEY_ATTRIBUTES if a in item):
+        return item
+    return {k: v for k, v in item.items() if k not in KEY_ATTRIBUTES or _valid_key(v)}
+
+
+def restore(item: dict, names=None) -> dict:
+    """
+    테이블에서 읽은 item — storable 이 뺀 null 필드를 되돌림 (names: 요청한 필드만)
+    """
+    for field in NULLABLE_FIELDS:
+        if names is None or field in names:
+            item.setdefault(field, None)
+    return item
+
+
+def now_str() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def deadline_bounds(open_only: bool = False, deadline_from: str = None, deadline_to: str = None, now: str = None):
+    """
+    → (하한, 상한) — 둘 다 None 이면 마감일 조건 없음
+    deadline_from / deadline_to 는 'YYYY-MM-DD' (또는 시각까지)
+    """
+    low = deadline_from.strip() if deadline_from else None
+    high = deadline_of(deadline_to) if deadline_to else None
+
+    if open_only:
+        now = now or now_str()
+        low = max(low, now) if low else now
+    return low, high
+
+
+# -----------------------------
+# DynamoDB 조건식
+# -----------------------------
+def _deadline_condition(low, high, values: dict) -> str:
+    if low and high:
+        values[":lo"], values[":hi"] = low, high
+        return "#dl BETWEEN :lo AND :hi"
+    if low:
+        values[":lo"] = low
+        return "#dl >= :lo"
+    if high:
+        values[":hi"] = high
+        return "#dl <= :hi"
+    return ""
+
+
+def _started_filter(now: str, values: dict) -> str:
+    # 시작일이 없거나(null 포함) 이미 지난 것
+    values[":now"], values[":null"] = now, "NULL"
+    return "(attribute_not_exists(#st) OR attribute_type(#st, :null) OR #st <= :now)"
+
+
+def query_kwargs(index: str, value, open_only=False, deadline_from=None, deadline_to=None, now=None,
+                 equals: dict = None) -> dict:
+    """
+    GSI 하나를 Query 하는 인자 (projection 등은 호출한 쪽에서 합침)
+    equals: 파티션 안에서 추가로 거를 {속성: 값} (예: 전공 인덱스 + type)
+    """
+    now = now or now_str()
+    low, high = deadline_bounds(open_only, deadline_from, deadline_to, now)
+
+    names = {"#pk": INDEXES[index]}
+    values = {":pk": value}
+    condition = "#pk = :pk"
+
+    deadline = _deadline_condition(low, high, values)
+    if deadline:
+        names["#dl"] = "deadline"
+        condition += " AND " + deadline
+
+    kwargs = {
+        "IndexName": index,
+        "KeyConditionExpression": condition,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+    filters = []
+    if open_only:
+        names["#st"] = "start_at"
+        filters.append(_started_filter(now, values))
+    for i, (attr, expected) in enumerate((equals or {}).items()):
+        names[f"#eq{i}"], values[f":eq{i}"] = attr, expected
+        filters.append(f"#eq{i} = :eq{i}")
+    if filters:
+        kwargs["FilterExpression"] = " AND ".join(filters)
+    return kwargs
+
+
+def scan_filter_kwargs(open_only=False, deadline_from=None, deadline_to=None, now=None) -> dict:
+    """
+    파티션 키가 없는 요청(분류·전공 없음)은 Scan + FilterExpression 으로
+    """
+    now = now or now_str()
+    low, high = deadline_bounds(open_only, deadline_from, deadline_to, now)
+
+    names, values = {}, {}
+    parts = []
+
+    deadline = _deadline_condition(low, high, values)
+    if deadline:
+        names["#dl"] = "deadline"
+        parts.append(deadline)
+    if open_only:
+        names["#st"] = "start_at"
+        parts.append(_started_filter(now, values))
+
+    if not parts:
+        return {}
+    return {
+        "FilterExpression": " AND ".join(parts),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }
+
+
+# -----------------------------
+# 스냅샷(메모리)에서 같은 조건
+# -----------------------------
+def in_deadline_range(item: dict, open_only=False, deadline_from=None, deadline_to=None, now=None) -> bool:
+    now = now or now_str()
+    low, high = deadline_bounds(open_only, deadline_from, deadline_to, now)
+    deadline = item.get("deadline") or deadline_of(item.get("end_at"))
+
+    if low and deadline < low:
+        return False
+    if high and deadline > high:
+        return False
+    if open_only:
+        start = item.get("start_at")
+        if isinstance(start, str) and start and start > now:
+            return False
+    return True
+
+
+# -----------------------------
+# 테이블 스키마 (로컬 테스트 / 인덱스 추가용)
+# -----------------------------
+def _gsi(index: str) -> dict:
+    return {
+        "IndexName": index,
+        "KeySchema": [
+            {"AttributeName": INDEXES[index], "KeyType": "HASH"},
+            {"AttributeName": "deadline", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+
+def _attribute_definitions(indexes) -> list:
+    names = ["deadline"] + [INDEXES[i] for i in indexes]
+    return [{"AttributeName": n, "AttributeType": "S"} for n in names]
+
+
+def create_table(dynamodb, name: str):
+    """
+    id(N) 기본 키 + GSI 두 개 (온디맨드) — DynamoDB Local 용
+    """
+    table = dynamodb.create_table(
+        TableName=name,
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "N"}] + _attribute_definitions(INDEXES),
+        GlobalSecondaryIndexes=[_gsi(i) for i in INDEXES],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    return table
+
+
+def ensure_indexes(table):
+    """
+    기존 테이블에 없는 GSI 를 추가
+    UpdateTable 은 한 번에 GSI 하나, 만드는 중이면 다음 것 불가 → 부를 때마다 하나씩
+    → 이번에 추가를 요청한 인덱스 이름 (없으면 None)
+    """
+    table.reload()
+    indexes = table.global_secondary_indexes or []
+    if any(g.get("IndexStatus") != "ACTIVE" for g in indexes):
+        return None
+
+    existing = {g["IndexName"] for g in indexes}
+    for index in INDEXES:
+        if index not in existing:
+            table.meta.client.update_table(
+                TableName=table.name,
+                AttributeDefinitions=_attribute_definitions([index]),
+                GlobalSecondaryIndexUpdates=[{"Create": _gsi(index)}],
+            )
+            return index
+    return None
+
+
+def backfill(table, items) -> int:
+    """
+    deadline 이 없는 예전 item 에 GSI 키를 채움 (없으면 인덱스에 안 나타남)
+    → 갱신한 item 수
+    """
+    updated = 0
+    for item in items:
+        if item.get("deadline"):
+            continue
+        fields = add_index_fields({k: item.get(k) for k in ("end_at", "major")})
+        fields = {k: fields[k] for k in ("deadline", "major_key") if k in fields}
+        names = {f"#f{i}": k for i, k in enumerate(fields)}
+        values = {f":v{i}": v for i, v in enumerate(fields.values())}
+        expression = "SET " + ", ".join(f"#f{i} = :v{i}" for i in range(len(fields)))
+
+        if "type" in item and not _valid_key(item["type"]):
+            # null type 은 GSI 키 위반 → 속성을 지움
+            names["#t"] = "type"
+            expression += " REMOVE #t"
+
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression=expression,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+        updated += 1
+    return updated
+
+
+if __name__ == "__main__":
+    # python gsi_query.py  → 인덱스 추가 요청 + 예전 item 채우기
+    from dynamo import get_table, scan_all
+
+    table = get_table("gwnu-ht-05-scholarship")
+    print("index requested:", ensure_indexes(table))
+    print("backfilled:", backfill(table, scan_all(table)))
@@ -0,0 +1,123 @@
+# html_parse.py
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml   # requirements.txt 에 고정 (설치 안 된 환경에서는 html.parser)
+except ImportError:
+    lxml = None
+
+try:
+    from bs4.filter import ElementFilter   # bs4 4.13+
+except ImportError:
+    ElementFilter = None
+
+
+# ---------------------------------------------------------
+# 🔥 크롤러 HTML 파싱 계층
+#  - 백엔드 선택: HTML_PARSER=auto(lxml 있으면 lxml) / lxml / html.parser
+#  - 필요한 부분만 트리로 만듦: 파서가 읽는 선택자들의 첫 요소(.class / #id / 태그)만 남기고
+#    머리말·메뉴·꼬리말 등은 노드를 아예 만들지 않음 (HTML_STRAIN=0 이면 전체 파싱)
+#  - 선택자 결과는 전체 파싱과 같음 (남긴 요소 안쪽은 그대로 만들어지므로)
+#    첫 요소에 :가상클래스 / 형제 결합자(+ ~)가 있으면 전체 파싱으로
+# ---------------------------------------------------------
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+HTML_STRAIN = os.getenv("HTML_STRAIN", "1") == "1"
+
+BACKENDS = ("lxml", "html.parser")
+
+_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$")
+_ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+_PART = re.compile(r"([.#])([\w-]+)")
+
+
+def backend(name: str = None) -> str:
+    name = name or HTML_PARSER
+    if name == "auto":
+        return "lxml" if lxml is not None else "html.parser"
+    if name == "lxml" and lxml is None:
+        raise RuntimeError("HTML_PARSER=lxml but lxml is not installed")
+    return name
+
+
+class _Rule:
+    def __init__(self, tag, classes, element_id):
+        self.tag = tag
+        self.classes = classes
+        self.id = element_id
+
+    def matches(self, name, attrs) -> bool:
+        if self.tag and name != self.tag:
+            return False
+        if self.id and attrs.get("id") != self.id:
+            return False
+        if self.classes:
+            have = attrs.get("class") or ""
+            have = set(have.split() if isinstance(have, str) else have)
+            if not self.classes <= have:
+                return False
+        return True
+
+
+def _rule(selector: str):
+    """
+    선택자의 첫 요소 → _Rule (못 바꾸면 None)
+    [속성] 조건은 빼고 태그 / 클래스 / id 로만 거름 (더 넓게 남기므로 결과는 같음)
+    """
+    selector = _ATTRIBUTE.sub("", selector).strip()
+    if not selector or "+" in selector or "~" in selector or "," in selector:
+        return None
+    first = selector.split(None, 1)[0]
+    first = first.split(">", 1)[0]
+    m = _COMPOUND.match(first)
+    if not first or not m or not (m.group(1) or m.group(2)):
+        return None
+
+    classes, element_id = set(), None
+    for kind, value in _PART.findall(m.group(2)):
+        if kind == ".":
+            classes.add(value)
+        else:
+            element_id = value
+    return _Rule(m.group(1), classes, element_id)
+
+
+if ElementFilter is not None:
+    class _Subtrees(ElementFilter):
+        def __init__(self, rules):
+            super().__init__()
+            self.rules = rules
+
+        @property
+        def includes_everything(self) -> bool:
+            return False
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            # 최상위에서만 불림 — 남긴 요소 안쪽은 전부 만들어짐
+            attrs = attrs or {}
+            return any(rule.matches(name, attrs) for rule in self.rules)
+
+        def allow_string_creation(self, string) -> bool:
+            return False
+
+
+def subtrees(*selectors):
+    """
+    선택자들이 읽는 부분만 남기는 필터 (만들 수 없으면 None → 전체 파싱)
+    """
+    if ElementFilter is None:
+        return None
+    rules = [_rule(s) for s in selectors if s]
+    if not rules or any(r is None for r in rules):
+        return None
+    return _Subtrees(rules)
+
+
+def parse(text: str, only=None, parser: str = None, strain: bool = None) -> BeautifulSoup:
+    """
+    text → BeautifulSoup (only: subtrees() 결과)
+    """
+    strain = HTML_STRAIN if strain is None else strain
+    return BeautifulSoup(text, backend(parser), parse_only=only if strain else None)
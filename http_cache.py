@@ -0,0 +1,172 @@
+# http_cache.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+from dynamo import json_default
+from request_trace import span
+
+try:
+    import brotli   # requirements.txt 에 고정 (설치 안 된 환경에서는 gzip 만 사용)
+except ImportError:
+    brotli = None
+
+
+# ---------------------------------------------------------
+# 🔥 응답 캐시 + ETag + 압축
+#  - (경로, 쿼리, 스냅샷 버전) 별로 JSON 인코딩 결과를 캐시
+#  - ETag 는 본문 해시 + 인코딩 ("<해시>" / "<해시>-gzip" / "<해시>-br")
+#    → 강한 ETag 는 표현(content-coding)마다 달라야 함 (RFC 9110)
+#    If-None-Match 는 같은 본문이면 어느 인코딩의 ETag 든 304 (본문 없음)
+#  - gzip / br 압축본도 처음 요청될 때 한 번만 만들어 둠
+#  - 항목 수 + 전체 바이트(원본 + 압축본)로 제한, 오래 안 쓴 것부터 버림
+# ---------------------------------------------------------
+MAX_ENTRIES = 256
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+MIN_COMPRESS_BYTES = 1024
+
+
+class _Entry:
+    def __init__(self, body: bytes, headers: dict):
+        self.body = body
+        self.headers = headers
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.size = len(body)
+        self._encoded = {"identity": body}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+    def encoded(self, encoding: str):
+        """
+        → (인코딩된 본문, 이번에 새로 늘어난 바이트 수)
+        """
+        with self._lock:
+            if encoding in self._encoded:
+                return self._encoded[encoding], 0
+            if encoding == "br":
+                body = brotli.compress(self.body, quality=5)
+            else:
+                body = gzip.compress(self.body, compresslevel=6)
+            self._encoded[encoding] = body
+            self.size += len(body)
+            return body, len(body)
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "bytes": 0}
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            return entry
+
+    def _put(self, key, entry):
+        if entry.size > self.max_bytes:
+            return      # 혼자서 한도를 넘는 응답은 캐시하지 않음
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.stats["bytes"] -= old.size
+            self._entries[key] = entry
+            self.stats["bytes"] += entry.size
+            self._evict()
+
+    def _grow(self, key, entry, added: int):
+        # 캐시에 있는 항목에 압축본이 새로 붙음
+        with self._lock:
+            if self._entries.get(key) is entry:
+                self.stats["bytes"] += added
+                self._evict()
+
+    def _evict(self):
+        # self._lock 안에서만 호출
+        while self._entries and (len(self._entries) > self.max_entries or self.stats["bytes"] > self.max_bytes):
+            _, old = self._entries.popitem(last=False)
+            self.stats["bytes"] -= old.size
+
+    def respond(self, request: Request, version, build) -> Response:
+        """
+        build() → (payload, 추가 헤더 dict). 캐시에 없을 때만 호출됨
+        version 이 None 이면 캐시하지 않음 (ETag/압축만 적용)
+        """
+        key = None
+        entry = None
+        if version is not None:
+            key = (request.url.path, tuple(sorted(request.query_params.multi_items())), version)
+            entry = self._get(key)
+
+        if entry is None:
+            payload, headers = build()
+            with span("serialization"):
+                body = json.dumps(payload, ensure_ascii=False, default=json_default, separators=(",", ":")).encode("utf-8")
+            entry = _Entry(body, headers or {})
+            if key is not None:
+                self._put(key, entry)
+
+        encoding = _choose_encoding(request.headers.get("accept-encoding", ""), len(entry.body))
+        headers = {"ETag": entry.etag(encoding), "Vary": "Accept-Encoding", **entry.headers}
+
+        if _etag_matches(request.headers.get("if-none-match"), entry.digest):
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        with span("serialization"):
+            body, added = entry.encoded(encoding)
+        if added and key is not None:
+            self._grow(key, entry, added)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match, digest: str) -> bool:
+    """
+    If-None-Match 에 이 본문의 ETag 가 있는지 (인코딩 접미사 / W/ 는 무시 — 약한 비교)
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+def _choose_encoding(accept_encoding: str, size: int) -> str:
+    if size < MIN_COMPRESS_BYTES:
+        return "identity"
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
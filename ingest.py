@@ -0,0 +1,287 @@
+# ingest.py
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from urllib.parse import urlparse, parse_qs
+
+from botocore.exceptions import ClientError
+
+from dynamo import scan_all, WRITE_SECONDS, WRITE_RETRIES
+from request_trace import span
+
+
+# ---------------------------------------------------------
+# 🔥 ID 범위 예약
+#  - 같은 테이블의 예약 item (id=0) 에 next_id 카운터를 둠
+#  - ADD 는 원자적이라 여러 요청/프로세스가 동시에 예약해도 겹치지 않음
+#  - N 개 저장 = 카운터 update 한 번 (전체 스캔 없음)
+# ---------------------------------------------------------
+COUNTER_ID = 0
+
+
+class IdAllocator:
+    def __init__(self, table):
+        self.table = table
+        self._lock = threading.Lock()
+        self._seeded = False
+
+    def reserve(self, n: int) -> range:
+        """
+        연속된 id n 개를 예약해서 range 로 반환
+        """
+        if n <= 0:
+            return range(0)
+
+        for _ in range(2):
+            try:
+                with span("dynamodb"):
+                    res = self.table.update_item(
+                        Key={"id": COUNTER_ID},
+                        UpdateExpression="ADD next_id :n",
+                        ConditionExpression="attribute_exists(id)",
+                        ExpressionAttributeValues={":n": n},
+                        ReturnValues="UPDATED_NEW",
+                    )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                self._seed()
+                continue
+
+            last = int(res["Attributes"]["next_id"])
+            return range(last - n + 1, last + 1)
+
+        raise RuntimeError("id counter could not be initialized")
+
+    def _seed(self):
+        # 카운터가 없을 때 딱 한 번: 기존 최대 id 에서 시작
+        with self._lock:
+            if self._seeded:
+                return
+
+            items = scan_all(self.table, ProjectionExpression="id")
+            max_id = max((int(i["id"]) for i in items), default=0)
+
+            try:
+                self.table.put_item(
+                    Item={"id": COUNTER_ID, "next_id": max_id},
+                    ConditionExpression="attribute_not_exists(id)",
+                )
+            except ClientError as e:
+                # 다른 프로세스가 먼저 만든 경우
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+            self._seeded = True
+
+
+# ---------------------------------------------------------
+# 🔥 배치 쓰기 (25개씩 batch_write_item + UnprocessedItems 재시도)
+# ---------------------------------------------------------
+BATCH_SIZE = 25
+MAX_RETRIES = 8
+
+
+def _write_chunk(table, chunk, stats, stats_lock, prepare):
+    client = table.meta.client
+    request = {table.name: [{"PutRequest": {"Item": prepare(item)}} for item in chunk]}
+
+    for attempt in range(MAX_RETRIES + 1):
+        with WRITE_SECONDS.time(table=table.name, op="batch_write_item"):
+            res = client.batch_write_item(RequestItems=request)
+        request = res.get("UnprocessedItems") or {}
+        if not request:
+            return
+
+        with stats_lock:
+            stats["retries"] += 1
+        WRITE_RETRIES.inc(table=table.name, op="batch_write_item")
+        # 지수 백오프 + 지터 (스로틀링 대응)
+        time.sleep(min(2.0, 0.05 * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+    left = sum(len(v) for v in request.values())
+    raise RuntimeError(f"{left} items still unprocessed after {MAX_RETRIES} retries")
+
+
+def _as_is(item):
+    return item
+
+
+def batch_write(table, items: list, workers: int = 4, prepare=_as_is) -> dict:
+    """
+    items 를 병렬 batch_write_item 으로 저장하고 처리량 통계를 반환
+    prepare(item) → 실제로 보낼 item (예: gsi_query.storable — items 자체는 바꾸지 않음)
+    """
+    started = time.perf_counter()
+    stats = {"written": 0, "batches": 0, "retries": 0}
+    stats_lock = threading.Lock()
+
+    chunks = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+
+    if chunks:
+        with span("dynamodb"), ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as ex:
+            # list() 로 소비해야 예외가 호출자에게 전달됨
+            list(ex.map(lambda c: _write_chunk(table, c, stats, stats_lock, prepare), chunks))
+
+    elapsed = time.perf_counter() - started
+    stats["written"] = len(items)
+    stats["batches"] = len(chunks)
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["items_per_s"] = round(len(items) / elapsed, 1) if elapsed > 0 else None
+    return stats
+
+
+def ingest(table, allocator: IdAllocator, items: list, workers: int = 4, prepare=_as_is) -> dict:
+    """
+    items 에 새 id 를 한 번에 예약해서 붙이고 배치로 저장
+    """
+    for new_id, item in zip(allocator.reserve(len(items)), items):
+        item["id"] = new_id
+
+    return batch_write(table, items, workers=workers, prepare=prepare)
+
+
+# ---------------------------------------------------------
+# 🔥 증분 upsert (내용 해시 비교)
+#  - 공지마다 고정 식별자(source_key)와 내용 해시(content_hash)를 저장
+#  - 다시 크롤링해도 해시가 같으면 쓰지 않고,
+#    바뀐 것만 조건부 update (그 사이 다른 쪽이 바꿨으면 건너뜀)
+# ---------------------------------------------------------
+META_FIELDS = {"id", "created_at", "updated_at", "content_hash", "source_key"}
+
+
+def source_key(item: dict):
+    """
+    공지의 고정 식별자
+    - wwwk 게시판: nttNo / 관광학과: articleNo / 그 외 url
+    - url 이 없는 job 공지: 제목 + 등록일
+    """
+    url = item.get("url")
+    if url:
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        for param in ("nttNo", "articleNo"):
+            if query.get(param):
+                return f"{parsed.netloc}:{param}:{query[param][0]}"
+        return f"url:{url}"
+
+    if item.get("title"):
+        return f"job:{item.get('date') or ''}:{item['title']}"
+
+    return None
+
+
+def _hash_default(value):
+    # DynamoDB 에서 읽은 숫자(Decimal)와 새로 만든 int 가 같은 해시가 되도록
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+
+def content_hash(item: dict) -> str:
+    body = {k: v for k, v in item.items() if k not in META_FIELDS}
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False, default=_hash_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def item_key(item: dict) -> str:
+    """
+    upsert 가 공지를 구분하는 키 (source_key 가 없으면 내용 해시)
+    """
+    return item.get("source_key") or source_key(item) or f"hash:{content_hash(item)}"
+
+
+def existing_by_key(items) -> dict:
+    """
+    저장된 item 들 → {source_key: item} (같은 키가 여럿이면 id 가 작은 것)
+    """
+    out = {}
+    for item in items:
+        key = item.get("source_key") or source_key(item)
+        if key and key not in out:
+            out[key] = item
+    return out
+
+
+def _update_changed(table, old: dict, new: dict, key: str, digest: str, now: str, prepare=_as_is) -> bool:
+    names, values, sets, removes = {}, {":k": key, ":h": digest, ":now": now}, [], []
+    stored = prepare(new)
+    for i, (field, value) in enumerate(new.items()):
+        names[f"#f{i}"] = field
+        if field not in stored:
+            removes.append(f"#f{i}")      # prepare 가 뺀 속성 (null GSI 키 등)
+            continue
+        values[f":v{i}"] = value
+        sets.append(f"#f{i} = :v{i}")
+    expression = "SET " + ", ".join(sets) + ", source_key = :k, content_hash = :h, updated_at = :now"
+    if removes:
+        expression += " REMOVE " + ", ".join(removes)
+
+    if old.get("content_hash"):
+        condition = "content_hash = :old"
+        values[":old"] = old["content_hash"]
+    else:
+        condition = "attribute_not_exists(content_hash)"
+
+    try:
+        with span("dynamodb"), WRITE_SECONDS.time(table=table.name, op="update_item"):
+            table.update_item(
+                Key={"id": old["id"]},
+                UpdateExpression=expression,
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        return False
+    return True
+
+
+def upsert(table, allocator: IdAllocator, items: list, existing: dict, workers: int = 4, prepare=_as_is):
+    """
+    items: 새로 크롤링한 item 들 (id 없음, source_key 는 미리 붙여도 됨)
+    existing: existing_by_key() 결과
+    prepare: batch_write 와 같음
+    → (통계, 실제로 쓴 item 들, 조건부 쓰기가 거절된 키들)
+    """
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "conflicts": 0}
+
+    # 같은 공지가 여러 페이지에 걸쳐 나오는 경우(상단 고정 등) 하나로
+    incoming = {}
+    for item in items:
+        incoming[item_key(item)] = {k: v for k, v in item.items() if k != "source_key"}
+
+    new_items, written, rejected = [], [], []
+
+    for key, item in incoming.items():
+        digest = content_hash(item)
+        old = existing.get(key)
+
+        if old is None:
+            new_items.append({**item, "source_key": key, "content_hash": digest, "created_at": now})
+            continue
+
+        if (old.get("content_hash") or content_hash(old)) == digest:
+            stats["unchanged"] += 1
+            continue
+
+        if _update_changed(table, old, item, key, digest, now, prepare):
+            stats["updated"] += 1
+            written.append({**old, **item, "source_key": key, "content_hash": digest, "updated_at": now})
+        else:
+            stats["conflicts"] += 1
+            rejected.append(key)
+
+    if new_items:
+        stats.update(ingest(table, allocator, new_items, workers=workers, prepare=prepare))
+        written.extend(new_items)
+    stats["inserted"] = len(new_items)
+
+    return stats, written, rejected
@@ -0,0 +1,152 @@
+# llm_cache.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+# ---------------------------------------------------------
+# 🔥 LLM 결과 캐시 (내용 주소 기반)
+#  - 키 = sha256(프롬프트 버전 + 정규화된 텍스트)
+#    → 같은 이력서를 다시 올리면 LLM 호출 없이 바로 결과
+#  - 1차: 메모리 LRU / 2차: 디스크(sqlite) — 재시작해도 유지
+#  - TTL 지나면 무시, 디스크는 전체 크기 한도를 넘으면 오래 안 쓴 것부터 삭제
+# ---------------------------------------------------------
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "1024"))
+LLM_CACHE_DISK_BYTES = int(os.getenv("LLM_CACHE_DISK_BYTES", str(64 * 1024 * 1024)))
+
+_WS = re.compile(r"\s+")
+
+
+def make_key(text: str, prompt_version: str) -> str:
+    normalized = _WS.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+    return hashlib.sha256(f"{prompt_version}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        memory_items: int = LLM_CACHE_MEMORY_ITEMS,
+        disk_bytes: int = LLM_CACHE_DISK_BYTES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()          # key → (value, created_at, latency_ms)
+        self._db = None
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "saved_ms": 0.0,
+            "evictions": 0,
+        }
+
+    # -----------------------------
+    # 디스크 (sqlite)
+    # -----------------------------
+    def _conn(self):
+        # self._lock 안에서만 호출
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL, latency_ms REAL NOT NULL)"
+            )
+        return self._db
+
+    def _evict_disk(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+
+        rows = db.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.disk_bytes:
+                break
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            self._stats["evictions"] += 1
+
+    # -----------------------------
+    # 조회 / 저장
+    # -----------------------------
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None and now - hit[1] <= self.ttl:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                self._stats["saved_ms"] += hit[2]
+                return dict(hit[0])
+
+            db = self._conn()
+            row = db.execute(
+                "SELECT value, created_at, latency_ms FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+                self._memory.pop(key, None)
+                self._stats["misses"] += 1
+                return None
+
+            db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+
+            value = json.loads(row[0])
+            self._remember(key, value, row[1], row[2])
+            self._stats["disk_hits"] += 1
+            self._stats["saved_ms"] += row[2]
+            return dict(value)
+
+    def put(self, key: str, value: dict, latency_ms: float = 0.0):
+        now = time.time()
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, value, now, latency_ms)
+
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, raw, len(raw.encode("utf-8")), now, now, latency_ms),
+            )
+            self._evict_disk(db)
+            db.commit()
+
+    def _remember(self, key, value, created_at, latency_ms):
+        self._memory[key] = (dict(value), created_at, latency_ms)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            hits = s["memory_hits"] + s["disk_hits"]
+            lookups = hits + s["misses"]
+            s["hit_ratio"] = round(hits / lookups, 4) if lookups else None
+            s["saved_ms"] = round(s["saved_ms"], 1)
+            s["memory_items"] = len(self._memory)
+            return s
@@ -0,0 +1,143 @@
+# llm_client.py
+import asyncio
+import os
+import random
+import threading
+import weakref
+
+import openai
+from openai import AsyncOpenAI
+
+from request_trace import traced
+
+
+# ---------------------------------------------------------
+# 🔥 비동기 LLM 클라이언트 (Upstage / OpenAI 호환)
+#  - 동시에 나가는 호출 수 제한 (이벤트 루프마다 세마포어 — 처음 쓸 때 그 루프에서 만듦)
+#  - 호출마다 제한 시간 + 일시적 오류는 지터 섞인 백오프로 재시도
+#  - 같은 키의 요청이 동시에 오면 한 번만 호출하고 결과 공유 (single-flight)
+#  - 끝내 실패하면 LLMUnavailable → 호출한 쪽에서 기본값으로 대체
+#  - LLM_BASE_URL 로 로컬 스텁 서버(llm_stub.py)를 가리킬 수 있음
+# ---------------------------------------------------------
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.upstage.ai/v1")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+LLM_BACKOFF = float(os.getenv("LLM_BACKOFF", "0.5"))
+
+RETRYABLE = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+class AsyncLLMClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = LLM_BASE_URL,
+        concurrency: int = LLM_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT,
+        retries: int = LLM_RETRIES,
+        backoff: float = LLM_BACKOFF,
+    ):
+        # 재시도/제한 시간은 여기서 직접 관리 → SDK 자체 재시도는 끔
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        # 세마포어 / Future 는 만든 루프에 묶임 → 루프별로 따로 (import 시점엔 루프가 없을 수도)
+        self._per_loop = weakref.WeakKeyDictionary()    # loop → (세마포어, {key → Future})
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "coalesced": 0,
+            "in_flight": 0,
+        }
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._per_loop.get(loop)
+            if state is None:
+                state = self._per_loop[loop] = (asyncio.Semaphore(self.concurrency), {})
+            return state
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    @traced("llm")
+    async def chat(self, prompt: str, model: str, max_tokens: int = 512) -> str:
+        """
+        프롬프트 1개 → 응답 텍스트. 재시도까지 실패하면 LLMUnavailable
+        """
+        last_error = None
+        semaphore, _ = self._loop_state()
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._bump("retries")
+                # 지수 백오프 + full jitter (동시에 재시도가 몰리지 않게)
+                await asyncio.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+            async with semaphore:
+                self._bump("calls")
+                self._bump("in_flight")
+                try:
+                    resp = await asyncio.wait_for(
+                        self._client.chat.completions.create(
+                            model=model,
+                            messages=[{"role": "user", "content": prompt}],
+                            temperature=0.0,
+                            max_tokens=max_tokens,
+                        ),
+                        timeout=self.timeout,
+                    )
+                    return resp.choices[0].message.content or ""
+                except RETRYABLE as e:
+                    if isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+                        self._bump("timeouts")
+                    last_error = e
+                except openai.APIError as e:
+                    # 400/401 같은 오류는 다시 해도 같음
+                    last_error = e
+                    break
+                finally:
+                    self._bump("in_flight", -1)
+
+        self._bump("failures")
+        raise LLMUnavailable(f"{type(last_error).__name__}: {last_error}") from last_error
+
+    async def single_flight(self, key: str, make_call):
+        """
+        같은 key 로 진행 중인 호출이 있으면 그 결과를 같이 기다림
+        make_call: 인자 없는 코루틴 함수
+        """
+        _, inflight = self._loop_state()
+        fut = inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(make_call())
+            inflight[key] = fut
+            fut.add_done_callback(lambda _: inflight.pop(key, None))
+        else:
+            self._bump("coalesced")
+
+        # 기다리던 요청 하나가 취소돼도 공유 중인 호출은 계속 진행
+        return await asyncio.shield(fut)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
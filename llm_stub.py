@@ -0,0 +1,73 @@
+# llm_stub.py
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+# ---------------------------------------------------------
+# 🔥 로컬 LLM 스텁 서버 (OpenAI chat.completions 호환)
+#  - 실제 Upstage 대신 테스트/벤치마크에서 사용
+#    uvicorn llm_stub:app --port 8001
+#    LLM_BASE_URL=http://127.0.0.1:8001/v1 uvicorn main:app
+#  - STUB_DELAY: 응답 지연(초), STUB_FAIL_RATE: 503 을 돌려줄 확률
+# ---------------------------------------------------------
+STUB_DELAY = float(os.getenv("STUB_DELAY", "0.2"))
+STUB_FAIL_RATE = float(os.getenv("STUB_FAIL_RATE", "0"))
+
+app = FastAPI()
+calls = {"count": 0}
+
+
+def fake_fields(prompt: str) -> dict:
+    # 프롬프트의 '텍스트:' ~ '추출할 정보:' 사이가 이력서 본문
+    body = prompt.split("텍스트:", 1)[-1].split("추출할 정보:", 1)[0]
+
+    major = re.search(r"[가-힣A-Za-z]+(?:학과|학부|전공)", body)
+    grade = re.search(r"[1-4]\s*학년", body)
+    year = re.search(r"(20\d\d)\s*(?:년)?\s*(?:\d+\s*월\s*)?졸업", body)
+
+    return {
+        "name": "",
+        "major": major.group(0) if major else "",
+        "grade": grade.group(0).replace(" ", "") if grade else "",
+        "graduation_year": year.group(1) if year else "",
+        "certificates": "",
+        "field": "",
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    calls["count"] += 1
+
+    await asyncio.sleep(STUB_DELAY)
+    if random.random() < STUB_FAIL_RATE:
+        return JSONResponse({"error": {"message": "stub failure"}}, status_code=503)
+
+    prompt = payload["messages"][-1]["content"]
+    content = json.dumps(fake_fields(prompt), ensure_ascii=False)
+
+    return {
+        "id": f"stub-{calls['count']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.get("/stats")
+def stats():
+    return calls
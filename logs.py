@@ -0,0 +1,88 @@
+# logs.py
+import json
+import logging
+import os
+import sys
+
+
+# ---------------------------------------------------------
+# 🔥 구조화 로그 (print 대신)
+#  - log.info("목록 요청", source=..., url=...) → 메시지 + key=value 필드
+#  - LOG_LEVEL=DEBUG / INFO / WARNING / ERROR / OFF (모듈별로 덮어쓰기: get_logger(level=...))
+#  - LOG_FORMAT=text (사람이 읽기) / json (한 줄 JSON, 수집기용)
+#  - 꺼진 레벨은 필드를 만들지도 않음 → 운영에서 OFF 면 비용 거의 0
+# ---------------------------------------------------------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+OFF = logging.CRITICAL + 10
+_RESERVED = ("exc_info", "stack_info", "stacklevel", "extra")
+
+
+def _level(name: str) -> int:
+    name = (name or LOG_LEVEL).upper()
+    if name == "OFF":
+        return OFF
+    level = logging.getLevelName(name)
+    if not isinstance(level, int):
+        raise ValueError(f"unknown log level: {name}")
+    return level
+
+
+def _value(value) -> str:
+    text = str(value)
+    return json.dumps(text, ensure_ascii=False) if not text or any(c in text for c in ' ="') else text
+
+
+class _Formatter(logging.Formatter):
+    def __init__(self, style: str = LOG_FORMAT):
+        super().__init__()
+        self._json = style == "json"
+
+    def format(self, record) -> str:
+        fields = getattr(record, "fields", None) or {}
+        if self._json:
+            entry = {
+                "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+                "level": record.levelname.lower(),
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        text = f"{self.formatTime(record, '%Y-%m-%d %H:%M:%S')} {record.levelname:<7s} {record.name} {record.getMessage()}"
+        if fields:
+            text += " " + " ".join(f"{k}={_value(v)}" for k, v in fields.items())
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    키워드 인자를 필드로 붙이는 logger (bind() 로 고정 필드 추가)
+    """
+
+    def process(self, msg, kwargs):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in _RESERVED}
+        extra = dict(kwargs.get("extra") or {})
+        extra["fields"] = {**self.extra, **fields}
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+    def bind(self, **fields) -> "StructuredLogger":
+        return StructuredLogger(self.logger, {**self.extra, **fields})
+
+
+def get_logger(name: str, level: str = None) -> StructuredLogger:
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_Formatter())
+        logger.addHandler(handler)
+        logger.propagate = False      # uvicorn 등이 root 에 붙인 핸들러로 두 번 찍히지 않게
+    logger.setLevel(_level(level))
+    return StructuredLogger(logger, {})
@@ -1,20 +1,85 @@
 # main.py
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from typing import List, Dict
-import boto3
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Request, Header
+from fastapi.responses import StreamingResponse, Response
+from typing import List, Dict, Optional
 from datetime import datetime
 import time
-from crawler import run_all_crawlers
+from crawler_logic import crawl_sources, fetch_report
+from crawl_pipeline import CrawlPipeline
+from crawl_scheduler import CrawlScheduler, CRAWL_SCHEDULER
+import crawl_fetch
+import crawl_registry
+import logs
+import metrics
+import request_trace
+from request_trace import RequestTraceMiddleware, TracedJSONResponse
 from pydantic import BaseModel
 from pdfcrawl import *
-import io
+from snapshot import TableSnapshot
+from crawl_jobs import CrawlJobManager
+import crawl_state
+from http_cache import ResponseCache
+import pdf_engine
+from match_index import MatchIndex
+import canonical
+import gsi_query
+from gsi_query import TYPE_INDEX
+from search_index import SearchIndex
+from dynamo import (
+    get_table, get_item, scan_all, scan_pages, query_pages, projection, json_default,
+    encode_cursor, decode_cursor,
+)
+from ingest import IdAllocator, COUNTER_ID, ingest, upsert, existing_by_key, item_key, source_key
+from bisect import bisect_right
+import asyncio
+import contextlib
+import json
+import re
+import os
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # 주기 크롤링은 CRAWL_SCHEDULER=1 인 프로세스에서만 (crawl_scheduler 는 아래에서 생성)
+    if CRAWL_SCHEDULER:
+        crawl_scheduler.start()
+    yield
+    crawl_scheduler.stop()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=TracedJSONResponse)
+
+log = logs.get_logger("api")
+
+# route 별 지연 시간 + span(dynamodb / pdf / llm / matching / serialization ...) + 느린 요청 프로파일
+app.add_middleware(RequestTraceMiddleware)
+
+# DynamoDB 연결 (접근은 dynamo.py 를 통해서)
+table = get_table("gwnu-ht-05-scholarship")
 
 
-app = FastAPI()
+# ---------------------------------------------------------
+# 🔥 장학금 테이블 스냅샷 (읽기 API 공용)
+# ---------------------------------------------------------
+SNAPSHOT_TTL = float(os.getenv("SNAPSHOT_TTL", "60"))
+SCAN_SEGMENTS = int(os.getenv("SCAN_SEGMENTS", "4"))
+WRITE_WORKERS = int(os.getenv("WRITE_WORKERS", "4"))
+
+
+def load_all_items():
+    # 스냅샷이 id 순으로 정렬해서 보관 (커서 페이지네이션 기준)
+    items = scan_all(table, segments=SCAN_SEGMENTS)
+    return [gsi_query.restore(i) for i in items if i["id"] != COUNTER_ID]   # id 카운터 item 제외
+
 
-# DynamoDB 연결
-dynamodb = boto3.resource("dynamodb", region_name="us-east-2")  # 오하이오
-table = dynamodb.Table("gwnu-ht-05-scholarship")
+snapshot = TableSnapshot(load_all_items, ttl=SNAPSHOT_TTL)
+
+# 제목/본문 검색 인덱스 (스냅샷과 함께 갱신)
+search_index = SearchIndex()
+snapshot.attach(search_index)
+
+# 목록/상세 응답 캐시 (ETag + gzip/br, 스냅샷 버전별)
+response_cache = ResponseCache()
 
 
 @app.get("/")
@@ -23,47 +88,117 @@ def root():
 
 
 # ---------------------------------------------------------
-# 🔥 고정 — ID 자동 생성 (충돌 없음, 초고속)
+# 🔥 ID 자동 생성 — 카운터 item 에서 범위 단위로 예약 (충돌 없음)
 # ---------------------------------------------------------
-def generate_id():
-    return int(time.time() * 1000)   # 밀리초 기반 PK
+id_allocator = IdAllocator(table)
 
 
 # ---------------------------------------------------------
-# 🔥 /crawl → 크롤링 + DynamoDB 저장
+# 🔥 /crawl → 크롤링 + DynamoDB 저장 (백그라운드 작업)
 # ---------------------------------------------------------
-@app.get("/crawl")
-def crawl_and_save():
-    data = run_all_crawlers()
-    inserted = 0
-
-    for _, items in data.items():
-        for item in items:
-
-            new_id = generate_id()  # PK 생성
-
-            table.put_item(
-                Item={
-                    "id": new_id,
-                    "board": item.get("board"),
-                    "url": item.get("url"),
-                    "title": item.get("title"),
-                    "type": item.get("type"),
-                    "major": item.get("major"),
-                    "grade": item.get("grade"),
-                    "price": item.get("price"),
-                    "start_at": item.get("start_at"),
-                    "end_at": item.get("end_at"),
-                    "content": item.get("content"),
-                    "etc": item.get("etc"),
-                    "images": item.get("images", []),
-                    "summary": item.get("summary"),
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                }
-            )
-            inserted += 1
-
-    return {"status": "ok", "inserted": inserted}
+def crawled_item(board, item):
+    new_item = {
+        "source_key": source_key(item),   # nttNo / articleNo / url 등 고정 식별자
+        "board": item.get("board"),
+        "url": item.get("url"),
+        "title": item.get("title"),
+        "type": item.get("type"),
+        "major": item.get("major"),
+        "grade": item.get("grade"),
+        "price": item.get("price"),
+        "start_at": item.get("start_at"),
+        "end_at": item.get("end_at"),
+        "content": item.get("content"),
+        "etc": item.get("etc"),
+        "images": item.get("images", []),
+        "summary": item.get("summary"),
+    }
+    new_item.update(canonical.canonical_fields(new_item))   # 매칭용 표준 키
+    gsi_query.add_index_fields(new_item)                    # GSI 키 (deadline 등)
+    return new_item
+
+
+def save_sources(sources=None, progress=lambda key, n=1: None, on_error=None):
+    """
+    크롤링하면서 배치 단위로 바로 저장 (crawl_pipeline)
+    내용 해시가 바뀐 것만 쓰기 (새 공지는 id 예약 + 배치 저장)
+    sources: crawl_registry 소스 목록 (None 이면 활성 소스 전부)
+    """
+    existing = existing_by_key(snapshot.get())
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "conflicts": 0}
+    changed = {}    # 이번 크롤링에서 쓴 item (끝날 때 스냅샷에 한 번에 반영)
+    state = crawl_state.for_table(table.name)     # 장학금 테이블 기준으로 본 공지 (crawler.py 와 따로)
+
+    def write(rows):
+        stats, written, rejected = upsert(
+            table, id_allocator, rows, existing, workers=WRITE_WORKERS, prepare=gsi_query.storable,
+        )
+        for key in totals:
+            totals[key] += stats.get(key, 0)
+        for item in written:
+            existing[item["source_key"]] = item   # 다음 배치에서 같은 공지가 새로 잡히지 않게
+            changed[item["id"]] = item
+        rejected = set(rejected)
+        return stats["inserted"] + stats["updated"], [r for r in rows if item_key(r) in rejected]
+
+    pipeline = CrawlPipeline(
+        normalize=crawled_item,
+        write=write,
+        state=state,
+        progress=progress,
+        on_error=on_error,
+    )
+    before = crawl_fetch.stats.snapshot()
+    try:
+        result = pipeline.run(crawl_sources(progress=progress, state=state, sources=sources))
+    finally:
+        # 배치마다 스냅샷 전체를 복사하지 않고 크롤링 한 번에 한 번만
+        snapshot.apply(list(changed.values()))
+    fetch_report(before, progress)
+
+    return {
+        "status": "ok",
+        "inserted": totals["inserted"],
+        "updated": totals["updated"],
+        "unchanged": totals["unchanged"],
+        "stats": {**totals, "pipeline": result},
+    }
+
+
+def crawl_and_save(job):
+    return save_sources(
+        progress=job.bump,
+        on_error=lambda source, e: job.fail(f"{source}: {type(e).__name__}: {e}"),
+    )
+
+
+crawl_jobs = CrawlJobManager(crawl_and_save)
+
+
+# ---------------------------------------------------------
+# 🔥 소스별 주기 크롤링 (CRAWL_SCHEDULER=1 일 때만)
+# ---------------------------------------------------------
+crawl_scheduler = CrawlScheduler(lambda source: save_sources([source]), crawl_registry.sources())
+
+
+@app.get("/crawl/schedule")
+def crawl_schedule():
+    return crawl_scheduler.status()
+
+
+@app.get("/crawl", status_code=202)
+def start_crawl():
+    # 이미 실행 중이면 같은 작업을 돌려줌 (중복 요청 합치기)
+    job, started = crawl_jobs.submit()
+    return {"job_id": job.id, "status": job.status, "coalesced": not started}
+
+
+@app.get("/crawl/{job_id}")
+def crawl_status(job_id: str):
+    job = crawl_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Not found")
+    return job.to_dict()
 
 
 
@@ -75,14 +210,164 @@ def health():
     return {"status": "ok"}
 
 
+# 크롤링 / DynamoDB 쓰기 지표 (Prometheus text, 이 프로세스 값)
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# 느린 요청 프로파일 (최근 것부터) — DEBUG_TOKEN 이 없으면 꺼짐
+@app.get("/debug/slow-requests")
+def slow_requests(limit: Optional[int] = Query(None, ge=1), x_debug_token: Optional[str] = Header(None)):
+    if not request_trace.check_token(x_debug_token):
+        raise HTTPException(404, "Not found")
+    return {
+        "threshold_ms": request_trace.SLOW_REQUEST_MS,
+        "requests": request_trace.profiler.recent(limit),
+    }
+
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    return {
+        **snapshot.stats(),
+        "responses": dict(response_cache.stats),
+        "llm": {**resume_cache.stats(), "client": async_client.stats()},
+    }
+
+
+
+# ---------------------------------------------------------
+# 커서 페이지네이션 (id 순 정렬된 목록 기준)
+# ---------------------------------------------------------
+MAX_PAGE_LIMIT = 1000
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+
+def paginate(items, limit, cursor, ranked=False):
+    """
+    cursor 다음부터 limit 개를 잘라서 (page, next_cursor) 반환
+    limit 이 없으면 나머지 전부
+    - ranked=False: id 순 목록 → cursor 는 마지막 id
+    - ranked=True : 검색 점수 순 목록 → cursor 는 offset
+    """
+    start = 0
+    if cursor:
+        try:
+            key = decode_cursor(cursor)
+            if ranked:
+                start = int(key["offset"])
+                if start < 0:
+                    raise ValueError("negative offset")
+            else:
+                start = bisect_right(items, key["after"], key=lambda i: i["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(400, "Invalid cursor")
+
+    if limit is None:
+        return items[start:], None
+
+    page = items[start:start + limit]
+    next_cursor = None
+    if page and start + limit < len(items):
+        if ranked:
+            next_cursor = encode_cursor({"offset": start + limit})
+        else:
+            next_cursor = encode_cursor({"after": page[-1]["id"]})
+
+    return page, next_cursor
+
+
+
+# ---------------------------------------------------------
+# 필드 선택 (fields=) + NDJSON 스트리밍 (format=ndjson)
+#  - 목록 화면은 content 없이 title/type/end_at 등만 받을 수 있음
+#  - ndjson 은 스캔 페이지(1MB)가 도착하는 대로 한 줄씩 흘려보냄
+#    → 테이블이 커져도 메모리/첫 바이트 시간이 일정
+# ---------------------------------------------------------
+FIELD_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def parse_fields(fields: Optional[str]):
+    if not fields:
+        return None
+
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    for name in names:
+        if not FIELD_NAME.fullmatch(name):
+            raise HTTPException(400, f"Invalid field: {name}")
+
+    if "id" not in names:
+        names.insert(0, "id")   # 커서/상세 조회에 필요
+    return names
+
+
+def project(items, names):
+    if not names:
+        return items
+    return [{k: item[k] for k in names if k in item} for item in items]
+
+
+def stream_scan(names=None, limit=None, query=False, **scan_kwargs):
+    """
+    DynamoDB 스캔 페이지를 받는 대로 item 을 하나씩 yield
+    query=True 면 Scan 대신 Query (GSI 파티션 하나만 읽음)
+    """
+    kwargs = projection(names)
+    for key in ("ExpressionAttributeNames", "ExpressionAttributeValues"):
+        if key in scan_kwargs:
+            kwargs[key] = {**kwargs.get(key, {}), **scan_kwargs.pop(key)}
+    kwargs.update(scan_kwargs)
+
+    sent = 0
+    pages = query_pages if query else scan_pages
+    for page in pages(table, **kwargs):
+        for item in page:
+            if item["id"] == COUNTER_ID:
+                continue
+            yield gsi_query.restore(item, names)
+            sent += 1
+            if limit is not None and sent >= limit:
+                return
+
+
+def ndjson_response(items):
+    lines = (json.dumps(item, ensure_ascii=False, default=json_default) + "\n" for item in items)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+def check_ndjson_args(cursor):
+    if cursor:
+        raise HTTPException(400, "cursor is not supported with format=ndjson")
+
+
 
 # ---------------------------------------------------------
 # 전체 목록 조회
 # ---------------------------------------------------------
 @app.get("/api/list")
-def get_all():
-    res = table.scan()
-    return res.get("Items", [])
+def get_all(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    fmt: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+):
+    names = parse_fields(fields)
+
+    if fmt == "ndjson":
+        # 스냅샷을 거치지 않고 스캔 결과를 그대로 흘려보냄 (순서는 스캔 순)
+        check_ndjson_args(cursor)
+        return ndjson_response(stream_scan(names, limit=limit))
+
+    items, version = snapshot.get_with_version()
+
+    def build():
+        page, next_cursor = paginate(items, limit, cursor)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return project(page, names), headers
+
+    return response_cache.respond(request, version, build)
 
 
 
@@ -94,33 +379,20 @@ class ResumeRequest(BaseModel):
     grade: str
     certificates: List[str] = []
 
+    def match_keys(self):
+        """
+        전공 / 자격증 → 표준 키 (canonical.py) → (전공 키들, 자격증 키들)
+        """
+        return canonical.major_keys(self.major), canonical.certificate_keys(self.certificates)
+
 
 @app.post("/api/resumes")
 async def submit_resume(req: ResumeRequest):
 
-    response = table.scan()
-    items = response.get("Items", [])
-
-    recommended = []
-
-    for item in items:
-        match = False
-
-        # 전공
-        if item.get("major") and item["major"] == req.major:
-            match = True
+    await snapshot.aget()  # 스냅샷(+인덱스) 최신화 — 이벤트 루프는 막지 않음
 
-        # 학년
-        if item.get("grade") and item["grade"] == req.grade:
-            match = True
-
-        # 자격증
-        item_certs = item.get("certificates", [])
-        if item_certs and any(c in req.certificates for c in item_certs):
-            match = True
-
-        if match:
-            recommended.append(item)
+    # 전공 / 학년 / 자격증 중 하나라도 일치
+    recommended = match_index.match_exact(req.major, req.grade, req.certificates)
 
     return {"count": len(recommended), "results": recommended}
 
@@ -130,18 +402,75 @@ async def submit_resume(req: ResumeRequest):
 # 장학금 전체 목록
 # ---------------------------------------------------------
 @app.get("/api/scholarships")
-def get_scholarship_list(category: str = "all", search: str = ""):
-
-    response = table.scan()
-    items = response.get("Items", [])
-
-    if search:
-        items = [i for i in items if search.lower() in (i.get("title") or "").lower()]
-
-    if category != "all":
-        items = [i for i in items if i.get("type") == category]
-
-    return {"count": len(items), "items": items}
+def get_scholarship_list(
+    request: Request,
+    category: str = "all",
+    search: str = "",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    fmt: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    major: Optional[str] = None,
+    open_only: bool = False,
+    deadline_from: Optional[str] = Query(None, pattern=DATE_PATTERN),
+    deadline_to: Optional[str] = Query(None, pattern=DATE_PATTERN),
+):
+    names = parse_fields(fields)
+    type_filter = None if category == "all" else category
+    major_key = canonical.canonical_major(major) if major else None
+    deadline = {"open_only": open_only, "deadline_from": deadline_from, "deadline_to": deadline_to,
+                "now": gsi_query.now_str()}
+    by_deadline = open_only or deadline_from or deadline_to
+
+    if fmt == "ndjson" and not search and not major_key:
+        # 검색 / 전공이 없으면 DynamoDB 결과를 그대로 흘려보냄
+        # 분류가 있으면 해당 GSI 파티션만 Query, 없으면 Scan (+마감일 FilterExpression)
+        # 전공은 GSI 에 대표 전공 하나만 있음 → 복수 전공 item 이 빠지므로 JSON 과 같이 스냅샷에서
+        check_ndjson_args(cursor)
+        if type_filter is not None:
+            kwargs = gsi_query.query_kwargs(TYPE_INDEX, type_filter, **deadline)
+            return ndjson_response(stream_scan(names, limit=limit, query=True, **kwargs))
+        kwargs = gsi_query.scan_filter_kwargs(**deadline)
+        return ndjson_response(stream_scan(names, limit=limit, **kwargs))
+
+    items, version = snapshot.get_with_version()
+    if open_only:
+        # '지금 접수 중' 은 시간이 지나면 바뀜 → 캐시는 분 단위로
+        version = (version, deadline["now"][:16])
+
+    def select():
+        if search:
+            # 제목/본문 n-gram 검색 (점수 순)
+            selected = search_index.search(search, category=type_filter)
+        elif type_filter is not None:
+            selected = search_index.by_type(type_filter)
+        elif major_key:
+            # 전공 역색인 (복수 전공 item 도 각 전공으로 찾음)
+            return in_deadline(match_index.by_major(major_key))
+        else:
+            selected = items
+
+        if major_key:
+            selected = [i for i in selected
+                        if major_key in (i.get("major_keys") or canonical.major_keys(i.get("major")))]
+        return in_deadline(selected)
+
+    def in_deadline(selected):
+        # 스냅샷(메모리)에서도 GSI 와 같은 마감일 조건
+        if by_deadline:
+            selected = [i for i in selected if gsi_query.in_deadline_range(i, **deadline)]
+        return selected
+
+    if fmt == "ndjson":
+        # 검색 / 전공은 스냅샷 인덱스 결과(검색은 점수 순, 전공은 id 순)를 한 줄씩
+        check_ndjson_args(cursor)
+        return ndjson_response(project(select()[:limit], names))
+
+    def build():
+        page, next_cursor = paginate(select(), limit, cursor, ranked=bool(search))
+        return {"count": len(page), "items": project(page, names), "next_cursor": next_cursor}, {}
+
+    return response_cache.respond(request, version, build)
 
 
 
@@ -149,14 +478,22 @@ def get_scholarship_list(category: str = "all", search: str = ""):
 # 상세 정보
 # ---------------------------------------------------------
 @app.get("/api/scholarships/{id}")
-def get_detail(id: int):
-    res = table.get_item(Key={"id": id})
-    item = res.get("Item")
+def get_detail(id: int, request: Request):
+    if id == COUNTER_ID:
+        raise HTTPException(404, "Not found")
+
+    _, version = snapshot.get_with_version()
+    item = snapshot.find(id)
+
+    if item is None:
+        # 스냅샷 이후 다른 곳에서 쓴 item 일 수 있음 → 직접 조회 (캐시는 안 함)
+        item = get_item(table, {"id": id})
+        version = None
 
     if not item:
         raise HTTPException(404, "Not found")
 
-    return item
+    return response_cache.respond(request, version, lambda: (item, {}))
 
 
 
@@ -165,72 +502,69 @@ def get_detail(id: int):
 # 🔥 ID 자동 증가 함수
 # -----------------------------
 def get_next_id():
-    # DynamoDB 전체 스캔해서 최대 id 찾기
-    response = table.scan(ProjectionExpression="id")
-    items = response.get("Items", [])
-
-    if not items:
-        return 1  # 첫 ID
-
-    max_id = max(int(item["id"]) for item in items)
-    return max_id + 1
+    # 카운터에서 하나 예약 (전체 스캔 없음)
+    return id_allocator.reserve(1).start
 
 
 @app.post("/upload-json")
 def upload_json(data: List[Dict]):
-    inserted = 0
-
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     for item in data:
-        # 새 ID 생성 (max+1)
-        new_id = get_next_id()
+        item["updated_at"] = now
+        item.update(canonical.canonical_fields(item))   # 매칭용 표준 키
+        gsi_query.add_index_fields(item)                # GSI 키 (deadline 등)
 
-        item["id"] = new_id
-        item["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # 새 ID 를 한 번에 예약 + 배치 저장
+    stats = ingest(table, id_allocator, data, workers=WRITE_WORKERS, prepare=gsi_query.storable)
 
-        table.put_item(Item=item)
-        inserted += 1
+    snapshot.apply(data)
 
-    return {"status": "ok", "inserted": inserted}
+    return {"status": "ok", "inserted": stats["written"], "stats": stats}
 
 def extract_text_from_pdf_bytes(file_bytes: bytes) -> str:
-    from PyPDF2 import PdfReader
-    import io
-    
-    reader = PdfReader(io.BytesIO(file_bytes))
-    texts = []
-
-    for page in reader.pages:
-        try:
-            t = page.extract_text() or ""
-        except Exception:
-            t = ""
-        texts.append(t)
-
-    return "\n\n".join(texts).strip()
+    # 공용 추출 엔진 (별도 프로세스, 페이지 수/시간/크기 제한)
+    return pdf_engine.extract_text(file_bytes)
 
 
 # -------------------------------
 # PDF 파일 업로드 처리
 # -------------------------------
+def resume_request(resume_data: dict) -> ResumeRequest:
+    return ResumeRequest(
+        major = resume_data.get("major", ""),
+        grade = resume_data.get("grade", ""),
+        certificates = [c.strip() for c in resume_data.get("certificates", "").split(",")]
+    )
+
+
 @app.post("/upload-pdf")
 async def upload_pdf(file: UploadFile = File(...)):
     
-    # 1. PDF를 메모리에서 바로 읽기
-    pdf_bytes = await file.read()
-
-    # 2. 텍스트 추출
-    extracted_text = extract_text_from_pdf_bytes(pdf_bytes)
-
-    resume_data = parse_resume_text(extracted_text)
-
-    print("📌 추출된 이력서 데이터:", resume_data)
+    # 1. 업로드를 청크 단위로 임시 파일에 저장 (크기 제한)
+    # 2. 텍스트 추출 — 별도 프로세스에서, 앞쪽 페이지만, 제한 시간 내
+    try:
+        pdf_path = await pdf_engine.spool_upload(file)
+        try:
+            extracted_text = await pdf_engine.aextract_text(pdf_path)
+        finally:
+            os.remove(pdf_path)
+    except pdf_engine.PdfTooLarge as e:
+        raise HTTPException(413, str(e))
+    except pdf_engine.PdfTimeout as e:
+        raise HTTPException(504, str(e))
+    except pdf_engine.PdfWorkerCrashed as e:
+        raise HTTPException(503, str(e))
+    except pdf_engine.PdfExtractionError as e:
+        raise HTTPException(422, str(e))
+
+    # 3. LLM 파싱 — async (동시 호출 제한 / 제한 시간 / 실패 시 기본값)
+    resume_data = await aparse_resume_text(extracted_text)
+
+    log.debug("이력서 추출 결과", major=resume_data.get("major"), grade=resume_data.get("grade"),
+              certificates=resume_data.get("certificates"))
 
     # 🎯 dict → ResumeRequest 로 변환
-    req = ResumeRequest(
-        major = resume_data.get("major", ""),
-        grade = resume_data.get("grade", ""),
-        certificates = [c.strip() for c in resume_data.get("certificates", "").split(",")]
-    )
+    req = resume_request(resume_data)
 
     # 🎯 필터 실행
     filtered_scholarships = await filter_scholarships(req)
@@ -243,90 +577,163 @@ async def upload_pdf(file: UploadFile = File(...)):
 
 def extract_text_from_pdf_memory(file_content: bytes) -> str:
     """
-    메모리에서 PDF 파일을 읽고 텍스트 추출
+    메모리에서 PDF 파일을 읽고 텍스트 추출 (공용 엔진 사용)
     """
-    from PyPDF2 import PdfReader
+    return pdf_engine.extract_text(file_content)
 
-    # 메모리에서 PDF 파일 읽기
-    reader = PdfReader(io.BytesIO(file_content))
-    texts = []
-
-    for page in reader.pages:
-        try:
-            t = page.extract_text() or ""
-        except Exception:
-            t = ""
-        texts.append(t)
-
-    return "\n\n".join(texts).strip()
 
 
 
-
-def normalize_major(major: str) -> str:
-    """
-    전공명에서 공백, 대소문자 차이 등을 표준화하여 반환
-    예: '컴퓨터 공학', '컴퓨터과학' → '컴퓨터공학'
-    """
-    if not major:
-        return ""
-    
-    major = major.lower().strip()  # 소문자화하고 앞뒤 공백 제거
-
-    # 전공 표준화 (예시)
-    major_map = {
-        "컴퓨터공학": ["컴퓨터공학과", "컴퓨터과학", "소프트웨어공학"],
-        "정보기술": ["정보기술학", "IT", "정보통신기술"],
-        # 여기에 다른 전공도 추가할 수 있음
-    }
-
-    for standard, variants in major_map.items():
-        if major in [v.lower() for v in variants]:
-            return standard
-
-    return major  # 찾을 수 없으면 그대로 반환
+# 스냅샷과 함께 갱신되는 매칭 인덱스
+match_index = MatchIndex()
+snapshot.attach(match_index)
 
 
 @app.post("/api/filter-scholarships")
-async def filter_scholarships(req: ResumeRequest):
-    response = table.scan()  # DynamoDB에서 장학금 목록을 가져옵니다.
-    items = response.get("Items", [])
-    
-    recommended = []  # 추천된 장학금 목록을 저장할 리스트
+async def filter_scholarships(req: ResumeRequest, open_only: bool = False):
+    await snapshot.aget()  # 스냅샷(+인덱스) 최신화 — 이벤트 루프는 막지 않음
 
-    req_major = normalize_major(req.major)  # 전공을 표준화 (예: 공백 제거, 대소문자 통일 등)
+    # 전공("any"/표준 키) · 학년 · 자격증(표준 키) 조건을 인덱스에서 합집합으로 계산
+    major_keys, certificate_keys = req.match_keys()
+    recommended = match_index.match(major_keys, req.grade, certificate_keys)
 
-    for item in items:
-        match = False  # 해당 장학금이 추천될지 여부
+    if open_only:
+        # 지금 접수 중인 것만 (start_at ≤ 지금 ≤ 마감)
+        now = gsi_query.now_str()
+        recommended = [i for i in recommended if gsi_query.in_deadline_range(i, open_only=True, now=now)]
 
-        item_major = normalize_major(item.get("major", ""))  # DynamoDB에서 가져온 전공도 표준화
+    return {
+        "count": len(recommended),
+        "results": recommended
+    }
 
-        # major가 "any"일 경우, 전공 필터링을 건너뛰고 매칭
-        if req_major == "any" or item_major == "any":
-            match = True  # "any" 전공이 일치하는 경우 무조건 추천
 
-        elif req_major and item_major:  # 전공이 명시되어 있을 경우
-            # 전공이 일치하는 경우 추천
-            if req_major in item_major or item_major in req_major:
-                match = True
-        elif req_major == item_major:  # 전공이 정확히 일치하는 경우
-            match = True
+# ---------------------------------------------------------
+# 🔥 이력서 일괄 업로드 (PDF 여러 개 또는 zip)
+#  - 추출(프로세스 풀) → LLM 파싱 → 매칭을 이력서마다 파이프라인으로
+#    동시에 BATCH_WORKERS 개까지 진행
+#  - 파일 하나가 시간 초과 / 워커를 죽여도 그 파일만 실패 (워커가 죽은 건 503 + retryable)
+#  - 매칭은 요청 시점의 스냅샷 하나로 (도중에 크롤링 결과가 반영돼도 섞이지 않음)
+#  - 끝나는 순서대로 NDJSON 한 줄씩, 마지막 줄은 요약
+# ---------------------------------------------------------
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(pdf_engine.PDF_WORKERS)))   # 추출 워커 수보다 많이 넣으면 줄만 섬
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "200"))
+BATCH_MAX_ZIP_BYTES = int(os.getenv("BATCH_MAX_ZIP_BYTES", str(200 * 1024 * 1024)))
 
-        # 학년 필터링
-        if req.grade and item.get("grade") == req.grade:
-            match = True
 
-        # 자격증 필터링
-        item_certs = item.get("certificates", [])
-        if req.certificates and item_certs:
-            if any(c in item_certs for c in req.certificates):
-                match = True
+def _remove_quietly(path: str):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
 
-        # 필터링된 항목 추가
-        if match:
-            recommended.append(item)
 
-    return {
-        "count": len(recommended),
-        "results": recommended
-    }
+async def _spool_batch(files):
+    """
+    업로드들 → ([(파일명, 임시 경로)], [(파일명, 거절 사유)])
+    """
+    sources, rejected = [], []
+    try:
+        for upload in files:
+            name = upload.filename or "upload.pdf"
+
+            if name.lower().endswith(".zip"):
+                path = await pdf_engine.spool_upload(upload, max_bytes=BATCH_MAX_ZIP_BYTES, suffix=".zip")
+                try:
+                    pdfs, skipped = await asyncio.to_thread(
+                        pdf_engine.unpack_zip, path, BATCH_MAX_FILES - len(sources) - len(rejected)
+                    )
+                finally:
+                    os.remove(path)
+                sources += pdfs
+                rejected += skipped
+            else:
+                try:
+                    sources.append((name, await pdf_engine.spool_upload(upload)))
+                except pdf_engine.PdfTooLarge as e:
+                    rejected.append((name, str(e)))
+
+            if len(sources) + len(rejected) > BATCH_MAX_FILES:
+                raise pdf_engine.PdfTooLarge(f"more than {BATCH_MAX_FILES} resumes in one batch")
+    except BaseException:
+        for _, path in sources:
+            _remove_quietly(path)
+        raise
+
+    return sources, rejected
+
+
+@app.post("/upload-pdfs")
+async def upload_pdfs(files: List[UploadFile] = File(...)):
+    try:
+        sources, rejected = await _spool_batch(files)
+    except pdf_engine.PdfTooLarge as e:
+        raise HTTPException(413, str(e))
+    except pdf_engine.PdfExtractionError as e:
+        raise HTTPException(422, str(e))
+
+    # 배치 전용 인덱스 — 이 요청의 모든 이력서가 같은 스냅샷으로 매칭됨
+    await snapshot.aget()
+    items, version = snapshot.get_with_version()
+    index = MatchIndex()
+    await asyncio.to_thread(index.rebuild, items)
+
+    workers = asyncio.Semaphore(BATCH_WORKERS)
+
+    async def process(name: str, path: str) -> dict:
+        async with workers:
+            try:
+                text = await pdf_engine.aextract_text(path)     # 워커가 죽으면 엔진이 한 번 더 시도
+            except pdf_engine.PdfTimeout as e:
+                return {"file": name, "status": 504, "error": str(e)}
+            except pdf_engine.PdfWorkerCrashed as e:
+                return {"file": name, "status": 503, "error": str(e), "retryable": True}
+            except pdf_engine.PdfExtractionError as e:
+                return {"file": name, "status": 422, "error": str(e)}
+            finally:
+                _remove_quietly(path)
+
+            resume_data = await aparse_resume_text(text)
+
+        req = resume_request(resume_data)
+        major_keys, certificate_keys = req.match_keys()
+        recommended = index.match(major_keys, req.grade, certificate_keys)
+        return {
+            "file": name,
+            "status": 200,
+            "resume_data": resume_data,
+            "count": len(recommended),
+            "recommended": recommended,
+        }
+
+    async def results():
+        started = time.perf_counter()
+        failed = 0
+        tasks = [asyncio.create_task(process(name, path)) for name, path in sources]
+
+        try:
+            for name, reason in rejected:
+                failed += 1
+                yield json.dumps({"file": name, "status": 413, "error": reason}, ensure_ascii=False) + "\n"
+
+            for next_done in asyncio.as_completed(tasks):
+                row = await next_done
+                failed += row["status"] != 200
+                yield json.dumps(row, ensure_ascii=False, default=json_default) + "\n"
+        finally:
+            # 클라이언트가 끊으면 남은 작업 취소 + 임시 파일 정리
+            for task in tasks:
+                task.cancel()
+            for _, path in sources:
+                _remove_quietly(path)
+
+        elapsed = time.perf_counter() - started
+        total = len(sources) + len(rejected)
+        yield json.dumps({
+            "done": True,
+            "total": total,
+            "failed": failed,
+            "snapshot_version": version,
+            "elapsed_s": round(elapsed, 2),
+            "resumes_per_min": round(total / elapsed * 60, 1) if elapsed else None,
+        }) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
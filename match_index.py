@@ -0,0 +1,141 @@
+# match_index.py
+import threading
+from collections import defaultdict
+
+import canonical
+from request_trace import traced
+
+
+# ---------------------------------------------------------
+# 🔥 이력서 매칭용 역색인
+#  - 표준 전공 키 / 학년 / 표준 자격증 키 → item id 집합
+#  - 요청마다 전체 item 을 도는 대신 집합 합집합 몇 번으로 매칭
+#  - 키는 canonical.py 로 만든 값 (item 에 저장된 major_keys / certificate_keys,
+#    없으면 색인할 때 계산) → 매칭은 키가 같은지만 봄
+#  - 스냅샷 재로딩 때 rebuild(), 쓰기 때 add() 로 증분 갱신
+# ---------------------------------------------------------
+class MatchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._items = {}                      # id → item
+        self._keys = {}                       # id → (전공 키들, 원본전공, 학년, 자격증 키들, 원본 자격증들)
+        self._by_major = defaultdict(set)     # 표준 전공 키 → ids ("" / "any" 포함)
+        self._by_raw_major = defaultdict(set) # 원본 전공 → ids
+        self._by_grade = defaultdict(set)
+        self._by_cert = defaultdict(set)      # 표준 자격증 키 → ids
+        self._by_raw_cert = defaultdict(set)  # 원본 자격증 → ids
+
+    # -----------------------------
+    # 색인 구성
+    # -----------------------------
+    def rebuild(self, items):
+        with self._lock:
+            self._reset()
+            for item in items:
+                self._add(item)
+
+    def add(self, item):
+        with self._lock:
+            self._add(item)
+
+    def _add(self, item):
+        item_id = item["id"]
+        if item_id in self._keys:
+            self._remove(item_id)
+
+        raw_major = item.get("major")
+        if not isinstance(raw_major, str):
+            raw_major = None
+        majors = tuple(item.get("major_keys") or canonical.major_keys(raw_major))
+        grade = item.get("grade")
+        raw_certs = tuple(item.get("certificates") or [])
+        certs = tuple(item.get("certificate_keys") or canonical.certificate_keys(item.get("certificates")))
+
+        self._items[item_id] = item
+        self._keys[item_id] = (majors, raw_major, grade, certs, raw_certs)
+
+        for m in majors:
+            self._by_major[m].add(item_id)
+        if raw_major:
+            self._by_raw_major[raw_major].add(item_id)
+        if grade:
+            self._by_grade[grade].add(item_id)
+        for c in certs:
+            self._by_cert[c].add(item_id)
+        for c in raw_certs:
+            self._by_raw_cert[c].add(item_id)
+
+    def _remove(self, item_id):
+        majors, raw_major, grade, certs, raw_certs = self._keys.pop(item_id)
+        del self._items[item_id]
+
+        for m in majors:
+            self._discard(self._by_major, m, item_id)
+        if raw_major:
+            self._discard(self._by_raw_major, raw_major, item_id)
+        if grade:
+            self._discard(self._by_grade, grade, item_id)
+        for c in certs:
+            self._discard(self._by_cert, c, item_id)
+        for c in raw_certs:
+            self._discard(self._by_raw_cert, c, item_id)
+
+    def _discard(self, postings, key, item_id):
+        ids = postings.get(key)
+        if ids is None:
+            return
+        ids.discard(item_id)
+        if not ids:
+            del postings[key]
+
+    # -----------------------------
+    # 매칭
+    # -----------------------------
+    def _collect(self, ids):
+        return [self._items[i] for i in sorted(ids)]
+
+    def by_major(self, major_key) -> list:
+        """
+        표준 전공 키가 major_key 인 item 들 (id 순, 대표 전공이 아닌 전공도 포함)
+        """
+        with self._lock:
+            return self._collect(self._by_major.get(major_key, ()))
+
+    @traced("matching")
+    def match(self, major_keys, grade, certificate_keys):
+        """
+        filter_scholarships 규칙 (키는 canonical.major_keys / certificate_keys 결과)
+        - 전공: 요청이나 item 이 "any" 이거나 표준 키가 하나라도 같으면 (빈 전공끼리도 일치)
+        - 학년: 같은 값
+        - 자격증: 표준 키가 하나라도 겹치면
+        """
+        with self._lock:
+            if canonical.ANY in major_keys:
+                return self._collect(self._items.keys())
+
+            ids = set(self._by_major.get(canonical.ANY, ()))
+            for k in major_keys:
+                ids |= self._by_major.get(k, set())
+
+            if grade:
+                ids |= self._by_grade.get(grade, set())
+            for c in certificate_keys:
+                ids |= self._by_cert.get(c, set())
+
+            return self._collect(ids)
+
+    @traced("matching")
+    def match_exact(self, major, grade, certificates):
+        """
+        submit_resume 규칙 (전공 / 자격증은 원본 값 그대로 비교)
+        """
+        with self._lock:
+            ids = set(self._by_raw_major.get(major, ())) if major else set()
+            if grade:
+                ids |= self._by_grade.get(grade, set())
+            for c in certificates:
+                ids |= self._by_raw_cert.get(c, set())
+            return self._collect(ids)
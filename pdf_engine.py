@@ -0,0 +1,294 @@
+# pdf_engine.py
+import asyncio
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from request_trace import traced
+
+
+# ---------------------------------------------------------
+# 🔥 PDF 텍스트 추출 엔진 (main.py / pdfcrawl.py 공용)
+#  - PyPDF2 파싱은 별도 프로세스에서 → 이벤트 루프/웹 워커를 막지 않음
+#  - 앞쪽 max_pages 페이지만 추출 (이력서는 앞 몇 장이면 충분)
+#  - 문서별 제한 시간 / 파일 크기 제한 (악성·거대 PDF 대비)
+#  - 페이지가 많으면 페이지 구간을 나눠 여러 프로세스에서 병렬 추출
+# ---------------------------------------------------------
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "5"))
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "10"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+FIRST_CHUNK_PAGES = 2     # 첫 작업에서 읽을 페이지 수 (이 안에서 끝나면 한 번에 끝)
+SPOOL_CHUNK = 1024 * 1024
+
+
+class PdfExtractionError(Exception):
+    pass
+
+
+class PdfTooLarge(PdfExtractionError):
+    pass
+
+
+class PdfTimeout(PdfExtractionError):
+    pass
+
+
+class PdfWorkerCrashed(PdfExtractionError):
+    # 워커 프로세스가 죽음 (PDF 탓이 아닐 수도 있음 → 다시 시도해 볼 만함)
+    pass
+
+
+# -----------------------------
+# 워커 프로세스에서 실행되는 부분
+# -----------------------------
+def _extract_range(source, start: int, stop: int):
+    """
+    source(경로 또는 bytes)의 [start, stop) 페이지 텍스트
+    → (전체 페이지 수, 텍스트 리스트)
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(source if isinstance(source, str) else io.BytesIO(source))
+    pages = reader.pages
+    texts = []
+
+    for i in range(start, min(stop, len(pages))):
+        try:
+            t = pages[i].extract_text() or ""
+        except Exception:
+            t = ""
+        texts.append(t)
+
+    return len(pages), texts
+
+
+# -----------------------------
+# 워커 관리
+#  - 워커 프로세스마다 단일 프로세스 풀(슬롯) 하나 → 시간 초과된 작업은 그 슬롯만 죽이고 다시 만듦
+#    (다른 요청이 쓰는 워커는 그대로 → 느린/악성 PDF 하나가 다른 추출을 실패시키지 않음)
+#  - 슬롯을 잡은 뒤부터 제한 시간을 잼 → 빈 워커를 기다린 시간은 PDF 의 시간에 들어가지 않음
+# -----------------------------
+class _WorkerCrashed(Exception):
+    pass
+
+
+class _Slot:
+    def __init__(self):
+        # 스레드가 있는 웹 서버에서 fork 는 위험 → spawn
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        # 프로세스를 미리 띄워 둠 → 기동 시간이 제한 시간에 들어가지 않게
+        self.executor.submit(os.getpid).result()
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def kill(self):
+        # 실행 중인 작업은 취소가 안 되므로 프로세스를 종료
+        for proc in list(getattr(self.executor, "_processes", {}).values()):
+            proc.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Slots:
+    def __init__(self, size: int):
+        self._free = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def acquire(self, block: bool = True):
+        """
+        빈 슬롯 하나 (없으면 block=True 일 때 기다림, False 면 None)
+        """
+        if not self._free.acquire(blocking=block):
+            return None
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return _Slot()
+        except BaseException:
+            self._free.release()
+            raise
+
+    def release(self, slot: _Slot):
+        with self._lock:
+            self._idle.append(slot)
+        self._free.release()
+
+    def discard(self, slot: _Slot):
+        slot.kill()
+        self._free.release()
+
+
+_slots = _Slots(PDF_WORKERS)
+
+
+def _healthy(future) -> bool:
+    # 끝났고 프로세스가 멀쩡한 작업만 (도는 중이거나 워커가 죽었으면 슬롯을 버림)
+    if not future.done() or future.cancelled():
+        return False
+    return not isinstance(future.exception(), BrokenProcessPool)
+
+
+# -----------------------------
+# 추출
+# -----------------------------
+def _check_size(source):
+    size = os.path.getsize(source) if isinstance(source, str) else len(source)
+    if size > PDF_MAX_BYTES:
+        raise PdfTooLarge(f"PDF is {size} bytes (limit {PDF_MAX_BYTES})")
+
+
+def _extract(source, max_pages: int, timeout: float) -> str:
+    slots = [_slots.acquire()]
+    jobs = []
+    deadline = time.monotonic() + timeout      # 워커를 잡은 뒤부터
+
+    try:
+        first = min(FIRST_CHUNK_PAGES, max_pages)
+        jobs.append((slots[0], slots[0].submit(_extract_range, source, 0, first)))
+        total, texts = jobs[0][1].result(timeout=timeout)
+
+        wanted = min(total, max_pages)
+        if wanted > first:
+            # 남은 페이지는 지금 놀고 있는 워커와 나눠서 병렬로 (다른 요청의 워커를 기다리지는 않음)
+            while len(slots) < PDF_WORKERS:
+                extra = _slots.acquire(block=False)
+                if extra is None:
+                    break
+                slots.append(extra)
+
+            per_task = max(1, -(-(wanted - first) // len(slots)))
+            chunks = [
+                (slot, slot.submit(_extract_range, source, start, min(start + per_task, wanted)))
+                for slot, start in zip(slots, range(first, wanted, per_task))
+            ]
+            jobs = chunks
+            for _, f in chunks:
+                _, part = f.result(timeout=max(0.0, deadline - time.monotonic()))
+                texts.extend(part)
+    except FutureTimeout:
+        raise PdfTimeout(f"PDF extraction exceeded {timeout}s")
+    except BrokenProcessPool as e:
+        raise _WorkerCrashed() from e
+    except Exception as e:
+        # 깨진 PDF 등 PyPDF2 예외
+        raise PdfExtractionError(f"{type(e).__name__}: {e}") from e
+    finally:
+        bad = {id(slot) for slot, f in jobs if not _healthy(f)}
+        for slot in slots:
+            if id(slot) in bad:
+                _slots.discard(slot)
+            else:
+                _slots.release(slot)
+
+    return "\n\n".join(texts).strip()
+
+
+@traced("pdf")
+def extract_text(source, max_pages: int = None, timeout: float = None) -> str:
+    """
+    PDF(경로 또는 bytes)에서 앞쪽 max_pages 페이지 텍스트를 '\\n\\n'로 이어서 반환
+    워커가 죽으면(OOM 등) 새 워커로 한 번 더 시도
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    timeout = PDF_TIMEOUT if timeout is None else timeout
+    _check_size(source)
+
+    for attempt in range(2):
+        try:
+            return _extract(source, max_pages, timeout)
+        except _WorkerCrashed as e:
+            if attempt:
+                raise PdfWorkerCrashed("PDF worker crashed") from e.__cause__
+
+
+async def aextract_text(source, max_pages: int = None, timeout: float = None) -> str:
+    """
+    async 엔드포인트용 — 결과를 기다리는 것도 이벤트 루프 밖에서
+    """
+    return await asyncio.to_thread(extract_text, source, max_pages, timeout)
+
+
+# -----------------------------
+# 업로드 파일 → 임시 파일 (한 번에 메모리로 읽지 않음)
+# -----------------------------
+async def spool_upload(upload, max_bytes: int = None, suffix: str = ".pdf") -> str:
+    """
+    UploadFile 을 청크 단위로 임시 파일에 저장하고 경로를 반환
+    (호출한 쪽에서 os.remove 할 것)
+    """
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    written = 0
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(SPOOL_CHUNK)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise PdfTooLarge(f"PDF is larger than {max_bytes} bytes")
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return path
+
+
+# -----------------------------
+# zip 업로드 → PDF 임시 파일들
+# -----------------------------
+def unpack_zip(path: str, max_files: int, max_bytes: int = None):
+    """
+    zip 안의 PDF 를 하나씩 임시 파일로 풀어서
+    → ([(이름, 경로)], [(이름, 거절 사유)])   (경로는 호출한 쪽에서 os.remove)
+    PDF 가 max_files 개를 넘으면 PdfTooLarge, zip 이 깨졌으면 PdfExtractionError
+    """
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+    pdfs, rejected = [], []
+
+    try:
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if info.is_dir() or not name.lower().endswith(".pdf") or name.startswith("__MACOSX/"):
+                    continue
+                if len(pdfs) + len(rejected) >= max_files:
+                    raise PdfTooLarge(f"zip has more than {max_files} PDFs")
+                if info.file_size > max_bytes:
+                    rejected.append((name, f"PDF is {info.file_size} bytes (limit {max_bytes})"))
+                    continue
+
+                fd, tmp = tempfile.mkstemp(suffix=".pdf")
+                pdfs.append((name, tmp))
+                written = 0
+                with os.fdopen(fd, "wb") as out, zf.open(info) as src:
+                    while True:
+                        chunk = src.read(SPOOL_CHUNK)
+                        if not chunk:
+                            break
+                        written += len(chunk)
+                        if written > max_bytes:
+                            # 헤더의 크기는 거짓일 수 있음 (zip bomb)
+                            raise PdfTooLarge(f"{name} is larger than {max_bytes} bytes")
+                        out.write(chunk)
+    except BaseException as e:
+        for _, tmp in pdfs:
+            os.remove(tmp)
+        if isinstance(e, zipfile.BadZipFile):
+            raise PdfExtractionError("invalid zip archive") from e
+        raise
+
+    return pdfs, rejected
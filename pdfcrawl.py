@@ -1,18 +1,37 @@
+import hashlib
 import json
+import os
+import time
 from datetime import datetime
-from PyPDF2 import PdfReader
 from openai import OpenAI
+import logs
+import pdf_engine
+from llm_cache import LLMCache, make_key
+from llm_client import AsyncLLMClient, LLMUnavailable, LLM_BASE_URL, LLM_RETRIES, LLM_TIMEOUT
+import resume_rules
+from request_trace import traced
 
 # ===========================
 # 1. Upstage/Solar 설정
 # ===========================
-UPSTAGE_API_KEY = "up_4SGKCusvviP1TdH8rxetRMwlMhxMp"
+UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "up_4SGKCusvviP1TdH8rxetRMwlMhxMp")
 
+# 동기 경로(CLI / 배치)도 async 쪽과 같은 제한 시간 · 재시도 횟수
 client = OpenAI(
     api_key=UPSTAGE_API_KEY,
-    base_url="https://api.upstage.ai/v1",
+    base_url=LLM_BASE_URL,
+    timeout=LLM_TIMEOUT,
+    max_retries=LLM_RETRIES,
 )
 
+# async 엔드포인트용 (동시 호출 제한 / 제한 시간 / 재시도 / single-flight)
+async_client = AsyncLLMClient(api_key=UPSTAGE_API_KEY, base_url=LLM_BASE_URL)
+
+RESUME_MODEL = "solar-pro2"
+
+log = logs.get_logger("resume.parser")
+RAW_LOG_CHARS = 500     # 파싱 실패 로그에 남길 LLM 응답 길이
+
 
 # ===========================
 # 2. PDF → 텍스트 추출
@@ -20,19 +39,10 @@ client = OpenAI(
 def extract_text_from_pdf(pdf_path: str) -> str:
     """
     단일 PDF 파일 경로를 받아서,
-    모든 페이지의 텍스트를 '\n\n'로 이어붙여 반환.
+    앞쪽 페이지(PDF_MAX_PAGES)의 텍스트를 '\n\n'로 이어붙여 반환.
+    (추출은 pdf_engine 공용 엔진 — 별도 프로세스, 시간/크기 제한)
     """
-    reader = PdfReader(pdf_path)
-    texts = []
-
-    for page in reader.pages:
-        try:
-            t = page.extract_text() or ""
-        except Exception:
-            t = ""
-        texts.append(t)
-
-    return "\n\n".join(texts).strip()
+    return pdf_engine.extract_text(pdf_path)
 
 
 # ===========================
@@ -69,6 +79,47 @@ JSON 형식 예시:
     return prompt
 
 
+FIELD_DESCRIPTIONS = {
+    "name": "이름",
+    "major": "학과 (전공)",
+    "grade": '학년 (예: "3학년"). 텍스트에 명시된 경우만, 없으면 ""',
+    "graduation_year": '졸업년도 (예정 포함, "YYYY" 형태, 없으면 "")',
+    "certificates": "자격증 (여러 개면 쉼표로 구분, 없으면 빈 문자열)",
+    "field": '주요 분야 (프로젝트/경험을 보고 짧게 요약. 예: "백엔드 개발", "데이터 분석", 모르면 "")',
+}
+
+
+def build_partial_prompt(text: str, fields) -> str:
+    """
+    규칙 추출기가 채우지 못한 필드만 묻는 짧은 프롬프트
+    (text 는 resume_rules.relevant_windows 로 고른 줄만)
+    """
+    items = "\n".join(f"- {f}: {FIELD_DESCRIPTIONS[f]}" for f in fields)
+    example = json.dumps({f: "" for f in fields}, ensure_ascii=False)
+    return f"""다음 이력서 일부에서 아래 항목만 추출하여 JSON 형식으로만 답변해주세요.
+다른 설명 없이 JSON만 출력하세요. 정보가 없거나 애매하면 ""로 두세요.
+
+텍스트:
+{text}
+
+추출할 정보:
+{items}
+
+JSON 형식:
+{example}"""
+
+
+# 프롬프트 문구 / 모델 / 규칙이 바뀌면 캐시 키도 바뀜 (예전 결과 재사용 X)
+PROMPT_VERSION = hashlib.sha256(
+    "\x00".join([
+        RESUME_MODEL,
+        build_resume_prompt(""),
+        build_partial_prompt("", resume_rules.FIELDS),
+        resume_rules.RULES_VERSION,
+    ]).encode("utf-8")
+).hexdigest()[:12]
+
+
 # ===========================
 # 4. JSON 클리너
 # ===========================
@@ -128,16 +179,40 @@ def infer_grade_from_graduation_year(graduation_year_str: str) -> str:
 # ===========================
 # 6. 텍스트 이력서 파싱 + 학년 추정 + 분야
 # ===========================
-def parse_resume_text(text: str) -> dict:
+def default_resume_result() -> dict:
+    # 기본 스키마
+    return {
+        "name": "",
+        "major": "",
+        "grade": "",
+        "graduation_year": "",
+        "certificates": "",
+        "field": ""
+    }
+
+
+# 같은 이력서 텍스트 → LLM 다시 안 부름 (메모리 LRU + 디스크)
+resume_cache = LLMCache()
+
+
+def resume_prompt(text: str, fields=None) -> str:
     """
-    이력서 텍스트에서:
-    name, major, grade, graduation_year, certificates, field 를 추출.
-    grade는 graduation_year로 한 번 더 보정.
+    fields 가 없으면 전체 프롬프트, 있으면 그 필드 관련 줄만 담은 짧은 프롬프트
     """
-    prompt = build_resume_prompt(text)
+    if not fields:
+        return build_resume_prompt(text)
+    return build_partial_prompt(resume_rules.relevant_windows(text, fields), fields)
+
+
+@traced("llm")
+def request_resume_fields(text: str, fields=None):
+    """
+    LLM 호출 → 스키마 dict. JSON 파싱 실패면 None (캐시하지 않음)
+    """
+    prompt = resume_prompt(text, fields)
 
     resp = client.chat.completions.create(
-        model="solar-pro2",
+        model=RESUME_MODEL,
         messages=[
             {"role": "user", "content": prompt}
         ],
@@ -146,28 +221,22 @@ def parse_resume_text(text: str) -> dict:
     )
 
     raw = resp.choices[0].message.content or ""
-    cleaned = clean_json_text(raw)
+    return resume_fields_from_response(raw)
 
-    # 기본 스키마
-    default_result = {
-        "name": "",
-        "major": "",
-        "grade": "",
-        "graduation_year": "",
-        "certificates": "",
-        "field": ""
-    }
+
+def resume_fields_from_response(raw: str):
+    """
+    LLM 응답 텍스트 → 스키마 dict. JSON 파싱 실패면 None
+    """
+    cleaned = clean_json_text(raw)
 
     try:
         data = json.loads(cleaned)
     except Exception as e:
-        print("⚠️ 이력서 JSON 파싱 실패:", e)
-        print("----- 원문 응답 -----")
-        print(raw)
-        print("--------------------")
-        return default_result
+        log.warning("이력서 JSON 파싱 실패", error=str(e), raw=raw[:RAW_LOG_CHARS])
+        return None
 
-    result = {
+    return {
         "name": data.get("name", ""),
         "major": data.get("major", ""),
         "grade": data.get("grade", ""),
@@ -176,7 +245,80 @@ def parse_resume_text(text: str) -> dict:
         "field": data.get("field", ""),
     }
 
+
+def merge_fields(result: dict, llm_result, missing) -> dict:
+    """
+    규칙 결과에 LLM 이 채운 필드만 덮어씀 (LLM 실패면 규칙 결과 그대로)
+    """
+    if llm_result:
+        for f in missing:
+            if llm_result.get(f):
+                result[f] = llm_result[f]
+    return result
+
+
+def parse_resume_text(text: str) -> dict:
+    """
+    이력서 텍스트에서:
+    name, major, grade, graduation_year, certificates, field 를 추출.
+    grade는 graduation_year로 한 번 더 보정.
+    - 규칙 추출기(resume_rules)로 먼저 채우고, 못 채운 필드만 LLM 에 물어봄
+    """
+    result, missing = resume_rules.extract(text)
+    if not missing:
+        return apply_grade_inference(result)
+
+    key = make_key(text, PROMPT_VERSION)
+    cached = resume_cache.get(key)
+    if cached is not None:
+        return apply_grade_inference(cached)
+
+    started = time.perf_counter()
+    llm_result = request_resume_fields(text, missing)
+    result = merge_fields(result, llm_result, missing)
+    if llm_result is not None:
+        resume_cache.put(key, result, latency_ms=(time.perf_counter() - started) * 1000)
+
+    return apply_grade_inference(result)
+
+
+async def aparse_resume_text(text: str) -> dict:
+    """
+    parse_resume_text 의 async 버전 (upload-pdf 용)
+    - 같은 텍스트가 동시에 들어오면 LLM 호출은 1번
+    - LLM 이 끝내 응답하지 않으면 기다리지 않고 규칙으로 찾은 값만 반환
+    """
+    result, missing = resume_rules.extract(text)
+    if not missing:
+        return apply_grade_inference(result)
+
+    key = make_key(text, PROMPT_VERSION)
+    cached = resume_cache.get(key)
+    if cached is not None:
+        return apply_grade_inference(cached)
+
+    merged = await async_client.single_flight(key, lambda: _aparse_uncached(text, key, result, missing))
+    return apply_grade_inference(dict(merged))
+
+
+async def _aparse_uncached(text: str, key: str, result: dict, missing):
+    started = time.perf_counter()
+    try:
+        raw = await async_client.chat(resume_prompt(text, missing), model=RESUME_MODEL, max_tokens=512)
+    except LLMUnavailable as e:
+        log.warning("LLM 호출 실패 → 규칙 추출 결과만 사용", error=str(e))
+        return result
+
+    llm_result = resume_fields_from_response(raw)
+    merged = merge_fields(dict(result), llm_result, missing)
+    if llm_result is not None:
+        resume_cache.put(key, merged, latency_ms=(time.perf_counter() - started) * 1000)
+    return merged
+
+
+def apply_grade_inference(result: dict) -> dict:
     # 🔥 졸업년도 기반으로 grade 보정
+    # (현재 연도에 따라 달라지므로 캐시에는 LLM 원본을 두고 매번 계산)
     inferred_grade = infer_grade_from_graduation_year(result["graduation_year"])
     if inferred_grade:
         # 졸업년도로 계산된 학년이 있으면 이 값으로 덮어쓰기
@@ -195,15 +337,8 @@ def parse_resume_pdf(pdf_path: str) -> dict:
     """
     text = extract_text_from_pdf(pdf_path)
     if not text.strip():
-        print("⚠️ PDF에서 텍스트를 추출하지 못했습니다.")
-        return {
-            "name": "",
-            "major": "",
-            "grade": "",
-            "graduation_year": "",
-            "certificates": "",
-            "field": ""
-        }
+        log.warning("PDF 에서 텍스트를 추출하지 못함", path=pdf_path)
+        return default_resume_result()
 
     return parse_resume_text(text)
 
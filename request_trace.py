@@ -0,0 +1,307 @@
+# request_trace.py
+import contextvars
+import functools
+import hmac
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from starlette.responses import JSONResponse
+
+import logs
+import metrics
+
+
+# ---------------------------------------------------------
+# 🔥 API 요청 지연 시간 계측 + 느린 요청 프로파일링
+#  - 미들웨어가 요청마다 Trace 를 만들고 route 별 지연 시간을 기록 (/metrics)
+#  - 요청 안에서 span("dynamodb") 처럼 이름 붙인 구간 → 요청별 합계를 route × span 으로 기록
+#    (요청 밖에서 불리면 아무것도 안 함 — 크롤러 / 스케줄러 경로는 비용 0)
+#  - 같은 이름 span 이 겹치면(병렬 스캔 등) 바깥 것만 셈 → 요청 시간 안에서의 비중
+#  - SLOW_REQUEST_MS 를 넘긴 요청만 샘플링 프로파일러가 스택을 모음 (그 전에는 샘플러가 잠들어 있음)
+#    → 최근 SLOW_REQUEST_KEEP 개를 보관, /debug/slow-requests (DEBUG_TOKEN 필요) 로 조회
+#  - 샘플은 요청이 거쳐 간 스레드(이벤트 루프 + span 을 연 스레드)만 — 이벤트 루프는 요청끼리 같이 쓰므로
+#    async 요청의 샘플에는 그 사이 돌던 다른 요청의 스택이 섞일 수 있음
+# ---------------------------------------------------------
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))        # 0 이면 프로파일링 끔
+SLOW_REQUEST_KEEP = int(os.getenv("SLOW_REQUEST_KEEP", "50"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_DEPTH = 40
+PROFILE_TOP_STACKS = 20
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN") or None                        # 없으면 디버그 엔드포인트 꺼짐
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "API request latency by route", ("method", "route", "status"),
+)
+SPAN_SECONDS = metrics.histogram(
+    "http_span_seconds", "Time spent in a named span per request", ("route", "span"),
+)
+SLOW_REQUESTS = metrics.counter("http_slow_requests_total", "Requests over SLOW_REQUEST_MS", ("route",))
+
+log = logs.get_logger("api.trace")
+
+_current = contextvars.ContextVar("request_trace", default=None)
+
+# 기다리기만 하는 스레드의 스택 (샘플에서 뺌)
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+
+class Trace:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = None
+        self.status = None
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans = {}                 # 이름 → [합계 초, 횟수]
+        self.threads = {threading.get_ident()}
+        self.samples = Counter()        # 접은 스택 → 샘플 수
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def _enter(self, name: str) -> bool:
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            if name in self._open:
+                return False
+            self._open.add(name)
+            return True
+
+    def _exit(self, name: str, seconds: float):
+        with self._lock:
+            self._open.discard(name)
+            entry = self.spans.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if self.trace._enter(self.name):
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.started is not None:
+            self.trace._exit(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """
+    with span("dynamodb"): ... — 지금 요청의 Trace 에 구간 시간을 더함 (요청 밖이면 아무것도 안 함)
+    """
+    trace = _current.get()
+    return _NO_SPAN if trace is None else _Span(trace, name)
+
+
+def traced(name: str):
+    """
+    함수 전체를 span 으로 감싸는 데코레이터 (async 함수도 됨)
+    """
+    def wrap(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def run_async(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return run_async
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return run
+    return wrap
+
+
+def current():
+    return _current.get()
+
+
+class TracedJSONResponse(JSONResponse):
+    """
+    기본 응답 클래스 — JSON 직렬화 시간을 serialization span 으로
+    """
+
+    def render(self, content) -> bytes:
+        with span("serialization"):
+            return super().render(content)
+
+
+def _idle(frame) -> bool:
+    return frame.f_code.co_filename.endswith(_IDLE_FILES)
+
+
+def _fold(frame) -> str:
+    # 바깥 → 안쪽 순서, "파일:함수:줄" 을 ; 로 이음 (flamegraph collapsed 형식)
+    parts = []
+    while frame is not None and len(parts) < PROFILE_MAX_DEPTH:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SlowRequestProfiler:
+    def __init__(self, threshold_ms: float = SLOW_REQUEST_MS, interval_ms: float = PROFILE_INTERVAL_MS,
+                 keep: int = SLOW_REQUEST_KEEP):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.records = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._active = {}
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def begin(self, trace: Trace):
+        with self._lock:
+            self._active[id(trace)] = trace
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True, name="slow-request-profiler")
+                self._thread.start()
+            first = len(self._active) == 1
+        if first:
+            self._wake.set()      # 샘플러가 요청이 없어서 잠든 상태 → 깨움 (그 외에는 깨울 필요 없음)
+
+    def end(self, trace: Trace, seconds: float):
+        with self._lock:
+            self._active.pop(id(trace), None)
+        if seconds < self.threshold:
+            return
+
+        SLOW_REQUESTS.inc(route=trace.route)
+        with trace._lock:
+            samples = sum(trace.samples.values())
+            stacks = trace.samples.most_common(PROFILE_TOP_STACKS)
+            spans = {name: {"ms": round(total * 1000, 1), "count": n} for name, (total, n) in trace.spans.items()}
+        record = {
+            "at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trace.started_at)),
+            "method": trace.method,
+            "path": trace.path,
+            "route": trace.route,
+            "status": trace.status,
+            "duration_ms": round(seconds * 1000, 1),
+            "spans": spans,
+            "samples": samples,
+            "sample_interval_ms": self.interval * 1000,
+            "stacks": [{"stack": stack, "samples": n} for stack, n in stacks],
+        }
+        with self._lock:
+            self.records.append(record)
+        log.warning("느린 요청", method=trace.method, route=trace.route, ms=record["duration_ms"], samples=samples)
+
+    def recent(self, limit: int = None) -> list:
+        with self._lock:
+            records = list(self.records)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+            if not active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            now = time.perf_counter()
+            slow = [t for t in active if now - t.started >= self.threshold]
+            if not slow:
+                # 가장 먼저 기준을 넘길 요청까지 잠듦 (새 요청이 오면 깨서 다시 계산)
+                self._wake.wait(max(self.interval, min(t.started for t in active) + self.threshold - now))
+                self._wake.clear()
+                continue
+
+            frames = sys._current_frames()
+            for trace in slow:
+                with trace._lock:
+                    for ident in trace.threads:
+                        frame = frames.get(ident)
+                        if frame is not None and not _idle(frame):
+                            trace.samples[_fold(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+profiler = SlowRequestProfiler()
+
+
+def _route(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"      # 원래 경로는 라벨 수가 끝없이 늘어남
+
+
+class RequestTraceMiddleware:
+    """
+    ASGI 미들웨어 — 요청 시간 / span / 느린 요청 프로파일
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        trace = Trace(scope["method"], scope["path"])
+        token = _current.set(trace)
+        if profiler.enabled:
+            profiler.begin(trace)
+
+        async def traced_send(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, traced_send)
+        finally:
+            _current.reset(token)
+            seconds = trace.elapsed()
+            trace.route = _route(scope)
+            status = str(trace.status or 500)
+            REQUEST_SECONDS.observe(seconds, method=trace.method, route=trace.route, status=status)
+            for name, (total, _) in list(trace.spans.items()):
+                SPAN_SECONDS.observe(total, route=trace.route, span=name)
+            if profiler.enabled:
+                profiler.end(trace, seconds)
+
+
+def check_token(token) -> bool:
+    """
+    디버그 엔드포인트 토큰 확인 (DEBUG_TOKEN 이 없으면 항상 거절)
+    """
+    if DEBUG_TOKEN is None or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), DEBUG_TOKEN.encode("utf-8"))
@@ -0,0 +1,208 @@
+# resume_rules.py
+import re
+import unicodedata
+
+import canonical
+
+
+# ---------------------------------------------------------
+# 🔥 규칙 기반 이력서 추출기 (LLM 앞단 fast-path)
+#  - 정규식 + 전공/자격증 사전으로 parse_resume_text 스키마를 먼저 채움
+#  - 채우지 못한 필드만 LLM 에 물어봄 (그 필드와 관련된 줄만 보냄)
+#  - 매칭에 쓰는 필드(major / grade / certificates)가 모두 채워지면 LLM 호출 없음
+#    name / field 는 보조 정보 → 찾으면 채우고, LLM 을 부를 때만 같이 물어봄
+# ---------------------------------------------------------
+RULES_VERSION = "3"
+
+FIELDS = ("name", "major", "grade", "graduation_year", "certificates", "field")
+REQUIRED = ("major", "grade", "certificates")
+
+# 전공 사전 (접미사 없이 적힌 전공명 찾기용) — canonical.MAJOR_ALIASES 에서 만듦
+#  - 표준 이름 + '…학' 으로 끝나거나 다섯 글자 이상인 한글 별칭
+#    ('전기', '법', 'IT' 같은 짧은 별칭은 문장 속 오탐이 많음 → 정확 비교는 canonical 이 함)
+MAJORS = list(canonical.MAJOR_ALIASES) + [
+    alias
+    for aliases in canonical.MAJOR_ALIASES.values()
+    for alias in aliases
+    if not alias.isascii() and (alias.endswith("학") or len(alias) >= 5)
+]
+
+# 자격증 사전 — canonical.CERTIFICATE_ALIASES 의 표준 이름 + 별칭 (긴 이름 먼저 매칭되도록 정렬해서 컴파일)
+#  - 찾은 별칭('컴활 1급')은 canonical.certificate_keys 가 표준 키로 바꿈
+#  - 다른 낱말 안에 흔히 들어가거나 기술 스택으로도 쓰이는 이름은 뺌
+#    ('키워드' 의 '워드', '토스트' 의 '토스', 'AWS EC2 배포' 의 'AWS')
+_CERT_AMBIGUOUS = {"워드", "토스", "AWS"}
+CERTIFICATES = [
+    name
+    for canonical_name, aliases in canonical.CERTIFICATE_ALIASES.items()
+    for name in (canonical_name, *aliases)
+    if name not in _CERT_AMBIGUOUS
+]
+
+# 기술 키워드 → 분야 (field 추정용)
+FIELD_KEYWORDS = {
+    "백엔드 개발": ["spring", "django", "fastapi", "flask", "node.js", "express", "mysql", "백엔드"],
+    "프론트엔드": ["react", "vue", "javascript", "typescript", "html", "css", "프론트엔드"],
+    "데이터 분석": ["pandas", "sql", "tableau", "데이터 분석", "통계"],
+    "AI/컴퓨터 비전": ["pytorch", "tensorflow", "opencv", "yolo", "딥러닝", "머신러닝", "컴퓨터 비전"],
+    "모바일 앱": ["android", "kotlin", "swift", "flutter", "react native", "모바일"],
+    "임베디드": ["arduino", "라즈베리파이", "raspberry", "stm32", "임베디드", "펌웨어"],
+}
+
+_MAJOR_LABELED = re.compile(r"(?:전공|학과)\s*[:：|]\s*([가-힣A-Za-z]+(?:\s[가-힣]*(?:공학|과학|학과|학부|학))?)")
+_MAJOR_SUFFIX = re.compile(r"([가-힣A-Za-z]{2,20}(?:학과|학부))(?![가-힣])")
+_MAJOR_DICT = re.compile("|".join(sorted(map(re.escape, MAJORS), key=len, reverse=True)))
+_SCHOOL = re.compile(r"^.*?(?:대학교|대학)")
+
+_GRADE = re.compile(r"(?<!\d)([1-4])\s*학년(?!도)")   # "2024학년도" 는 학년이 아님
+_GRAD_YEAR = [
+    re.compile(r"(20\d\d)\s*(?:년|\.|/|-)?\s*(?:\d{1,2}\s*(?:월)?\s*)?\(?\s*졸업"),
+    re.compile(r"졸업\s*(?:예정)?\s*(?:년도|연도|일)?\s*[:：]?\s*(20\d\d)"),
+]
+_NAME = re.compile(r"(?:이름|성명)\s*[:：|]?\s*([가-힣]{2,4})(?![가-힣])")
+
+_CERT = re.compile("|".join(sorted(map(re.escape, CERTIFICATES), key=len, reverse=True)), re.IGNORECASE)
+_CERT_SECTION = re.compile(r"자격증|자격\s*사항|보유\s*자격|면허|certificat", re.IGNORECASE)
+_CERT_LIKE = re.compile(r"기사|기능사|전문가|자격|면허|관리사|마스터|[0-9]\s*급|certified", re.IGNORECASE)
+CERT_SECTION_LINES = 10     # 자격증 제목 아래 몇 줄까지 사전에 없는 자격증을 찾을지
+
+# 필드별로 LLM 에 보낼 줄을 고르는 키워드
+_WINDOW_KEYWORDS = {
+    "name": re.compile(r"이름|성명|name", re.IGNORECASE),
+    "major": re.compile(r"전공|학과|학부|대학|major", re.IGNORECASE),
+    "grade": re.compile(r"학년|재학|휴학|졸업|입학"),
+    "graduation_year": re.compile(r"졸업|입학|재학"),
+    "certificates": _CERT_SECTION,
+    "field": re.compile(r"프로젝트|경험|경력|기술|스택|활동|project|skill", re.IGNORECASE),
+}
+WINDOW_CONTEXT = 2          # 키워드 줄 앞뒤로 몇 줄까지 보낼지
+WINDOW_MAX_CHARS = 1500     # 필드 하나당 최대 글자 수
+FALLBACK_CHARS = 2000       # 키워드를 못 찾으면 앞에서부터 이만큼
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "")
+
+
+def _find_major(text: str) -> str:
+    m = _MAJOR_LABELED.search(text)
+    if m:
+        return m.group(1).strip()
+
+    m = _MAJOR_SUFFIX.search(text)
+    if m:
+        # '강릉원주대학교컴퓨터공학과' 처럼 학교명이 붙어 있으면 떼어냄
+        return _SCHOOL.sub("", m.group(1)) or m.group(1)
+
+    m = _MAJOR_DICT.search(text)
+    return m.group(0) if m else ""
+
+
+def _find_graduation_year(text: str) -> str:
+    for pattern in _GRAD_YEAR:
+        m = pattern.search(text)
+        if m:
+            return m.group(1)
+    return ""
+
+
+def _find_certificates(text: str) -> list:
+    found = []
+    seen = set()
+    for m in _CERT.finditer(text):
+        name = m.group(0)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            found.append(name)
+    return found
+
+
+def _has_unknown_certificate(text: str) -> bool:
+    """
+    자격증 항목 아래에 사전에 없는 자격증처럼 보이는 줄이 있으면 True
+    (그 경우 규칙 결과는 불완전 → LLM 에 물어봄)
+    """
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if not _CERT_SECTION.search(line):
+            continue
+        for below in lines[i + 1:i + 1 + CERT_SECTION_LINES]:
+            if _CERT_LIKE.search(_CERT.sub("", below)):
+                return True
+    return False
+
+
+def _find_field(text: str) -> str:
+    lowered = text.lower()
+    scores = {
+        field: sum(lowered.count(k) for k in keywords)
+        for field, keywords in FIELD_KEYWORDS.items()
+    }
+    best = max(scores, key=scores.get)
+    return best if scores[best] else ""
+
+
+def extract(text: str):
+    """
+    이력서 텍스트 → (스키마 dict, 채우지 못한 필드 목록)
+    """
+    text = _normalize(text)
+
+    name = _NAME.search(text)
+    grade = _GRADE.search(text)
+    certificates = _find_certificates(text)
+
+    result = {
+        "name": name.group(1) if name else "",
+        "major": _find_major(text),
+        "grade": f"{grade.group(1)}학년" if grade else "",
+        "graduation_year": _find_graduation_year(text),
+        "certificates": ", ".join(certificates),
+        "field": _find_field(text),
+    }
+
+    resolved = {f for f in FIELDS if result[f]}
+    if result["graduation_year"]:
+        resolved.add("grade")               # 졸업년도로 학년을 계산할 수 있음
+    if not certificates and not _CERT_SECTION.search(text):
+        resolved.add("certificates")        # 자격증 항목 자체가 없음 → 빈 값이 정답
+    elif certificates and _has_unknown_certificate(text):
+        resolved.discard("certificates")
+
+    if all(f in resolved for f in REQUIRED):
+        return result, []
+
+    return result, [f for f in FIELDS if f not in resolved]
+
+
+def relevant_windows(text: str, fields) -> str:
+    """
+    fields 와 관련된 줄(앞뒤 WINDOW_CONTEXT 줄 포함)만 모아서 반환
+    """
+    lines = _normalize(text).splitlines()
+    keep = set()
+
+    for field in fields:
+        pattern = _WINDOW_KEYWORDS.get(field)
+        budget = WINDOW_MAX_CHARS
+        for i, line in enumerate(lines):
+            if budget <= 0:
+                break
+            if pattern is not None and pattern.search(line):
+                for j in range(max(0, i - WINDOW_CONTEXT), min(len(lines), i + WINDOW_CONTEXT + 1)):
+                    if j not in keep:
+                        keep.add(j)
+                        budget -= len(lines[j]) + 1
+
+    if not keep:
+        return _normalize(text)[:FALLBACK_CHARS]
+
+    out = []
+    prev = None
+    for i in sorted(keep):
+        if prev is not None and i != prev + 1:
+            out.append("...")
+        if lines[i].strip():
+            out.append(lines[i])
+        prev = i
+    return "\n".join(out)
@@ -0,0 +1,218 @@
+# search_index.py
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+from request_trace import traced
+
+
+# ---------------------------------------------------------
+# 🔥 제목/본문 n-gram 검색 인덱스
+#  - 한글은 띄어쓰기가 불규칙해서 단어 대신 글자 2-gram + 3-gram 으로 색인
+#    (2글자 검색어는 2-gram, 3글자 이상은 더 희귀한 3-gram 으로 후보를 좁힘)
+#  - 검색어의 n-gram 중 희귀한 것부터 교집합 → 후보만 실제 문자열로 확인
+#  - type(카테고리)은 후보를 줄이는 사전 필터로 사용
+#  - 스냅샷 재로딩 때 rebuild(), 쓰기 때 add() 로 증분 갱신
+#    (갱신된 문서의 예전 번호는 postings 에서도 빼서 후보에 남지 않게)
+#  - 지운 자리(None)가 COMPACT_RATIO 를 넘으면 번호를 당겨서 다시 채움
+# ---------------------------------------------------------
+_WS = re.compile(r"\s+")
+
+GRAMS = (2, 3)
+VERIFY_THRESHOLD = 256   # 후보가 이 정도로 줄면 교집합을 멈추고 바로 확인
+COMPACT_RATIO = 0.25     # 전체 번호 중 지운 자리가 이 비율을 넘으면 압축
+COMPACT_MIN = 64         # 지운 자리가 이보다 적으면 압축하지 않음 (작은 색인에서 매번 압축 방지)
+
+
+def normalize_text(text) -> str:
+    """
+    전각/반각 통일(NFKC) + 소문자 + 공백 정리
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return _WS.sub(" ", text).strip()
+
+
+def ngrams(text: str, n: int = 2) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def index_grams(text: str) -> set:
+    grams = set()
+    for n in GRAMS:
+        grams |= ngrams(text, n)
+    return grams
+
+
+def query_grams(text: str) -> set:
+    # 검색어 길이에 맞는 가장 긴 n (1글자면 빈 집합)
+    usable = [n for n in GRAMS if n <= len(text)]
+    return ngrams(text, usable[-1]) if usable else set()
+
+
+class SearchIndex:
+    def __init__(self, fields=("title", "content")):
+        self.fields = fields
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._docs = []                           # 문서번호 → item (삭제되면 None)
+        self._texts = []                          # 문서번호 → (정규화 제목, 정규화 본문)
+        self._docno = {}                          # item id → 문서번호
+        self._postings = defaultdict(lambda: array("I"))  # n-gram → 문서번호들
+        self._by_type = defaultdict(set)          # type → 문서번호들
+        self._dead = 0                            # 지운 자리(None) 수
+        self._compactions = 0
+
+    # -----------------------------
+    # 색인 구성
+    # -----------------------------
+    def rebuild(self, items):
+        with self._lock:
+            self._reset()
+            for item in items:
+                self._add(item)
+
+    def add(self, item):
+        with self._lock:
+            self._add(item)
+
+    def _add(self, item):
+        old = self._docno.get(item["id"])
+        if old is not None:
+            # 기존 문서는 지우고(None) 새 번호로 다시 색인
+            self._remove(old)
+            if self._dead >= COMPACT_MIN and self._dead > len(self._docs) * COMPACT_RATIO:
+                self._compact()
+
+        title = normalize_text(item.get("title"))
+        body = " ".join(normalize_text(item.get(f)) for f in self.fields if f != "title")
+
+        docno = len(self._docs)
+        self._docs.append(item)
+        self._texts.append((title, body))
+        self._docno[item["id"]] = docno
+        self._by_type[item.get("type")].add(docno)
+
+        for g in index_grams(title) | index_grams(body):
+            self._postings[g].append(docno)
+
+    def _remove(self, docno):
+        # 색인할 때와 같은 텍스트로 n-gram 을 다시 구해서 그 postings 에서만 뺌
+        # (postings 는 문서번호 오름차순 → 이진 탐색)
+        title, body = self._texts[docno]
+        for g in index_grams(title) | index_grams(body):
+            p = self._postings[g]
+            del p[bisect_left(p, docno)]
+            if not p:
+                del self._postings[g]
+
+        self._by_type[self._docs[docno].get("type")].discard(docno)
+        self._docs[docno] = None
+        self._texts[docno] = None
+        self._dead += 1
+
+    def _compact(self):
+        # 살아 있는 문서만 앞으로 당김 — 번호 순서는 그대로라 postings 도 오름차순 유지
+        renumber = array("I", bytes(4 * len(self._docs)))
+        docs, texts = [], []
+        for docno, item in enumerate(self._docs):
+            if item is not None:
+                renumber[docno] = len(docs)
+                docs.append(item)
+                texts.append(self._texts[docno])
+
+        self._docs, self._texts = docs, texts
+        self._docno = {item["id"]: docno for docno, item in enumerate(docs)}
+        for g, p in self._postings.items():
+            self._postings[g] = array("I", (renumber[d] for d in p))
+        for category, docnos in self._by_type.items():
+            self._by_type[category] = {renumber[d] for d in docnos}
+        self._dead = 0
+        self._compactions += 1
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def by_type(self, category) -> list:
+        """
+        category 에 해당하는 item 들 (id 순)
+        """
+        with self._lock:
+            docs = [self._docs[d] for d in self._by_type.get(category, ())]
+        return sorted(docs, key=lambda i: i["id"])
+
+    @traced("search")
+    def search(self, query: str, category=None) -> list:
+        """
+        제목/본문에 query 가 들어있는 item 을 점수 순으로 반환
+        - 제목에 있으면 본문보다 높게
+        - 같은 점수면 최신(id 큰) 글 먼저
+        """
+        q = normalize_text(query)
+        if not q:
+            return []
+
+        with self._lock:
+            allowed = None
+            if category is not None:
+                allowed = self._by_type.get(category)
+                if not allowed:
+                    return []
+
+            grams = query_grams(q)
+            if grams:
+                postings = []
+                for g in grams:
+                    p = self._postings.get(g)
+                    if not p:
+                        return []
+                    postings.append(p)
+                postings.sort(key=len)
+
+                candidates = set(postings[0])
+                for p in postings[1:]:
+                    if len(candidates) <= VERIFY_THRESHOLD:
+                        break
+                    candidates.intersection_update(p)
+
+                if allowed is not None:
+                    candidates &= allowed
+            else:
+                # 한 글자 검색 → n-gram 으로 못 찾으므로 전체(또는 카테고리) 확인
+                candidates = set(allowed) if allowed is not None else set(self._docno.values())
+
+            docs = [(self._docs[d], self._texts[d]) for d in candidates]
+
+        scored = []
+        for item, texts in docs:
+            if item is None:
+                continue
+
+            title, body = texts
+            hits_title = title.count(q)
+            hits_body = body.count(q)
+            if not hits_title and not hits_body:
+                continue
+
+            score = (100 if hits_title else 0) + hits_title * 10 + hits_body
+            scored.append((score, item["id"], item))
+
+        scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+        return [item for _, _, item in scored]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "docs": len(self._docno),
+                "grams": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+                "slots": len(self._docs),
+                "tombstones": self._dead,
+                "compactions": self._compactions,
+            }
@@ -0,0 +1,248 @@
+# snapshot.py
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from operator import itemgetter
+
+import logs
+from dynamo import run_blocking
+from request_trace import span
+
+
+# ---------------------------------------------------------
+# 🔥 테이블 스냅샷 캐시
+#  - 요청마다 table.scan() 하지 않고 메모리 스냅샷을 공유
+#  - TTL 만료 → 기존 스냅샷을 돌려주면서 백그라운드 재로딩
+#  - invalidate() → 다음 요청은 새 데이터를 기다림
+#  - 재로딩은 항상 한 번에 하나만 (single-flight)
+#  - attach() 한 인덱스는 재로딩 때 다시 빌드,
+#    apply() 로 쓰기 결과를 반영할 때는 증분 갱신
+# ---------------------------------------------------------
+log = logs.get_logger("api.snapshot")
+
+class TableSnapshot:
+    def __init__(self, loader, ttl: float = 60.0, key: str = "id"):
+        """
+        loader: 인자 없이 호출하면 전체 item 리스트를 돌려주는 함수
+        ttl: 스냅샷 유효 시간(초)
+        key: 정렬/갱신 기준이 되는 PK 필드
+        """
+        self._loader = loader
+        self.ttl = ttl
+        self.key = key
+        self._key_of = itemgetter(key)
+        self._indexes = []
+
+        self._lock = threading.Lock()
+        self._items = None
+        self._loaded_at = 0.0
+        self._loaded_generation = -1
+        self._generation = 0          # invalidate() 마다 증가
+        self._inflight = None         # 진행 중인 재로딩의 Event
+        self._error = None
+
+        self.version = 0              # 스냅샷이 바뀔 때마다 증가
+
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "reload_errors": 0,
+            "last_reload_ms": None,
+            "total_reload_ms": 0.0,
+        }
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get(self) -> list:
+        """
+        현재 스냅샷의 item 리스트를 반환 (읽기 전용으로 취급할 것)
+        """
+        counted = False
+
+        while True:
+            with self._lock:
+                if self._items is not None:
+                    invalidated = self._loaded_generation != self._generation
+                    expired = time.monotonic() - self._loaded_at > self.ttl
+
+                    if not invalidated:
+                        if not counted:
+                            self._stats["hits"] += 1
+                        if expired:
+                            # 오래된 스냅샷은 그대로 주고 뒤에서 새로 읽음
+                            if not counted:
+                                self._stats["stale_hits"] += 1
+                            self._start_reload()
+                        return self._items
+
+                    if counted and self._error is not None:
+                        # 재로딩 실패 → 이전 데이터라도 반환
+                        return self._items
+
+                elif counted and self._error is not None:
+                    raise self._error
+
+                if not counted:
+                    self._stats["misses"] += 1
+                    counted = True
+
+                event = self._start_reload()
+
+            with span("snapshot_wait"):     # 재로딩(스캔 + 인덱스 재구성)을 기다린 시간
+                event.wait()
+
+    def get_with_version(self):
+        """
+        (items, version) — 두 값이 같은 시점의 것임을 보장
+        """
+        while True:
+            items = self.get()
+            with self._lock:
+                if self._items is items:
+                    return items, self.version
+
+    def find(self, key):
+        """
+        현재 스냅샷에서 PK 로 item 하나 찾기 (이진 탐색, 없으면 None)
+        """
+        items = self.get()
+        pos = bisect_left(items, key, key=self._key_of)
+        if pos < len(items) and self._key_of(items[pos]) == key:
+            return items[pos]
+        return None
+
+    async def aget(self) -> list:
+        """
+        async 엔드포인트용 get()
+        재로딩을 기다려야 하면 이벤트 루프 대신 스레드풀에서 기다림
+        """
+        with self._lock:
+            ready = self._items is not None and self._loaded_generation == self._generation
+
+        if ready:
+            return self.get()
+        return await run_blocking(self.get)
+
+    def invalidate(self):
+        """
+        쓰기 이후 호출 → 다음 조회는 새로 읽은 데이터를 사용
+        """
+        with self._lock:
+            self._generation += 1
+
+    # -----------------------------
+    # 인덱스 / 증분 갱신
+    # -----------------------------
+    def attach(self, index):
+        """
+        index 는 rebuild(items), add(item) 메서드를 가져야 함
+        """
+        with self._lock:
+            self._indexes.append(index)
+            if self._items is not None:
+                index.rebuild(self._items)
+
+    def apply(self, items: list):
+        """
+        방금 테이블에 쓴 item 들을 현재 스냅샷에 반영 (전체 재로딩 없이)
+        배치 전체를 한 번에 병합 → 새 리스트는 호출마다 한 번만 만듦 (읽는 쪽이 가진 리스트는 그대로)
+        """
+        if not items:
+            return
+        # 키 순으로 정렬 (같은 키가 여러 번이면 마지막 것)
+        batch = sorted({self._key_of(i): i for i in items}.items(), key=itemgetter(0))
+
+        with self._lock:
+            if self._items is None:
+                return
+
+            if self._inflight is not None:
+                # 진행 중인 스캔이 이 쓰기를 못 봤을 수 있음 → 한 번 더 읽게 함
+                self._generation += 1
+                return
+
+            old = self._items
+            merged = []
+            pos = 0
+            for k, item in batch:
+                end = bisect_left(old, k, lo=pos, key=self._key_of)
+                merged.extend(old[pos:end])
+                merged.append(item)
+                # 같은 키가 있으면 교체, 없으면 삽입
+                pos = end + 1 if end < len(old) and self._key_of(old[end]) == k else end
+            merged.extend(old[pos:])
+
+            for _, item in batch:
+                for index in self._indexes:
+                    index.add(item)
+
+            self._items = merged
+            self.version += 1
+
+    # -----------------------------
+    # 재로딩 (single-flight)
+    # -----------------------------
+    def _start_reload(self) -> threading.Event:
+        # 반드시 self._lock 을 잡은 상태에서 호출
+        if self._inflight is None:
+            self._inflight = threading.Event()
+            self._error = None
+            # 재로딩을 일으킨 요청의 컨텍스트로 실행 → 스캔 시간 / 스택이 그 요청의 trace 에 잡힘
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._reload, self._inflight, self._generation),
+                daemon=True,
+            ).start()
+        return self._inflight
+
+    def _reload(self, event: threading.Event, generation: int):
+        started = time.perf_counter()
+        try:
+            items = sorted(self._loader(), key=self._key_of)
+            for index in list(self._indexes):
+                index.rebuild(items)
+        except Exception as e:
+            log.exception("스냅샷 재로딩 실패", error=f"{type(e).__name__}: {e}")
+            with self._lock:
+                self._stats["reload_errors"] += 1
+                self._error = e
+                self._inflight = None
+            event.set()
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._items = items
+            self._loaded_at = time.monotonic()
+            self._loaded_generation = generation
+            self.version += 1
+
+            self._stats["reloads"] += 1
+            self._stats["last_reload_ms"] = round(elapsed_ms, 2)
+            self._stats["total_reload_ms"] += elapsed_ms
+
+            self._inflight = None
+
+        event.set()
+
+    # -----------------------------
+    # 통계
+    # -----------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            reloads = s["reloads"]
+            lookups = s["hits"] + s["misses"]
+
+            s["avg_reload_ms"] = round(s.pop("total_reload_ms") / reloads, 2) if reloads else None
+            s["hit_ratio"] = round(s["hits"] / lookups, 4) if lookups else None
+            s["version"] = self.version
+            s["item_count"] = len(self._items) if self._items is not None else 0
+            s["age_s"] = round(time.monotonic() - self._loaded_at, 2) if self._items is not None else None
+            s["reloading"] = self._inflight is not None
+            return s
@@ -0,0 +1,50 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# 저장소 루트의 모듈(main, pdf_engine ...)을 import 할 수 있게
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def table_items(monkeypatch):
+    """
+    DynamoDB 스캔 대신 이 리스트를 돌려줌 (테스트에서 채운 뒤 요청)
+    """
+    import main
+
+    items = []
+    monkeypatch.setattr(main, "scan_all", lambda table, **kwargs: list(items))
+    main.snapshot.invalidate()
+    return items
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """
+    moto 로 띄운 로컬 DynamoDB (boto3 resource)
+    """
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    for name, value in (("AWS_ACCESS_KEY_ID", "testing"), ("AWS_SECRET_ACCESS_KEY", "testing"),
+                        ("AWS_SESSION_TOKEN", "testing"), ("AWS_DEFAULT_REGION", "ap-northeast-2")):
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("DYNAMODB_ENDPOINT", raising=False)
+
+    with moto.mock_aws():
+        yield boto3.resource("dynamodb", region_name="ap-northeast-2")
+
+
+@pytest.fixture
+def crawl_states(monkeypatch, tmp_path):
+    """
+    크롤링 상태 파일을 임시 디렉터리에 (테스트끼리 섞이지 않게)
+    """
+    import crawl_state
+
+    monkeypatch.setattr(crawl_state, "CRAWL_STATE_DIR", str(tmp_path / "crawl_state"))
+    monkeypatch.setattr(crawl_state, "_by_table", {})
+    return crawl_state
@@ -0,0 +1,27 @@
+# pdf_fakes.py
+import os
+import tempfile
+import time
+
+
+# ---------------------------------------------------------
+# 🔥 테스트용 추출 함수 (pdf_engine._extract_range 대신)
+#  - spawn 된 워커가 import 할 수 있게 conftest 가 아닌 모듈에 둠
+#  - 파일 내용이 HANG 이면 멈추고, CRASH 면 워커 프로세스를 죽임
+#    (죽기 전에 crash_log(테스트 프로세스 pid) 에 한 줄 남김 → 몇 번 시도했는지 셀 수 있음)
+# ---------------------------------------------------------
+def crash_log(pid: int) -> str:
+    return os.path.join(tempfile.gettempdir(), f"pdf_fakes_crashes_{pid}")
+
+
+def extract_range(source, start: int, stop: int):
+    with open(source, "rb") as f:
+        data = f.read()
+
+    if data.startswith(b"HANG"):
+        time.sleep(60)
+    if data.startswith(b"CRASH"):
+        with open(crash_log(os.getppid()), "a") as log:
+            log.write("crash\n")
+        os._exit(1)
+    return 1, [data.decode("utf-8")][start:stop]
@@ -0,0 +1,66 @@
+# test_async_endpoints.py
+import asyncio
+import time
+
+import httpx
+
+import main
+
+
+# ---------------------------------------------------------
+# 🔥 /api/resumes 가 느린 스캔을 기다리는 동안에도 이벤트 루프는 막히지 않아야 함
+#  - 스냅샷을 비운 뒤 /api/resumes 를 동시에 여러 개 보내고
+#    그 사이 /api/health 를 여러 번 찔러서 가장 느린 응답이 HEALTH_BOUND 안인지 확인
+#  (benchmarks/bench_async_endpoints.py 와 같은 구성)
+# ---------------------------------------------------------
+SCAN_LATENCY = 1.0
+CONCURRENCY = 20
+HEALTH_PROBES = 5
+HEALTH_BOUND = 0.25
+
+
+scans = []
+
+
+def slow_loader():
+    scans.append(time.perf_counter())
+    time.sleep(SCAN_LATENCY)
+    return [{"id": i, "major": "any", "grade": "3학년", "title": f"공지 {i}"} for i in range(1, 1001)]
+
+
+async def _timed(client, method, url, **kwargs):
+    started = time.perf_counter()
+    res = await client.request(method, url, **kwargs)
+    res.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _run():
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        body = {"major": "컴퓨터공학과", "grade": "3학년", "certificates": []}
+        resumes = [
+            asyncio.create_task(_timed(client, "POST", "/api/resumes", json=body))
+            for _ in range(CONCURRENCY)
+        ]
+
+        health = []
+        for _ in range(HEALTH_PROBES):
+            await asyncio.sleep(SCAN_LATENCY / (HEALTH_PROBES * 2))
+            health.append(await _timed(client, "GET", "/api/health"))
+        in_flight = sum(not t.done() for t in resumes)
+
+        await asyncio.gather(*resumes)
+    return health, in_flight
+
+
+def test_health_stays_fast_while_resumes_wait_for_scan(monkeypatch):
+    monkeypatch.setattr(main.snapshot, "_loader", slow_loader)
+    main.snapshot.invalidate()
+    scans.clear()
+
+    health, in_flight = asyncio.run(_run())
+
+    assert in_flight == CONCURRENCY, "health 를 재는 동안 /api/resumes 가 모두 대기 중이어야 함"
+    assert max(health) < HEALTH_BOUND
+    assert len(scans) == 1      # 동시에 온 요청들은 스캔 하나를 같이 기다림 (single-flight)
@@ -0,0 +1,130 @@
+# test_crawl_jobs.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import crawl_jobs
+import main
+from crawl_jobs import CrawlJobManager
+
+
+# ---------------------------------------------------------
+# 🔥 /crawl 작업 — 동시에 들어온 요청은 한 작업으로, 실패 상태 기록
+# ---------------------------------------------------------
+class _Run:
+    """
+    release() 할 때까지 끝나지 않는 크롤링 (fail=True 면 예외)
+    """
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.started = threading.Event()
+        self._release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, job):
+        self.calls += 1
+        job.bump("pages_fetched", 3)
+        job.fail("wwwk-37: ConnectionError: timed out")
+        self.started.set()
+        assert self._release.wait(5)
+        if self.fail:
+            raise RuntimeError("table unavailable")
+        return {"status": "ok", "inserted": 2}
+
+    def release(self):
+        self._release.set()
+
+
+def _wait(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.status in ("queued", "running"):
+        assert time.monotonic() < deadline, "작업이 끝나지 않음"
+        time.sleep(0.005)
+
+
+def test_concurrent_submits_share_one_job():
+    run = _Run()
+    manager = CrawlJobManager(run)
+    barrier = threading.Barrier(8)
+
+    def submit():
+        barrier.wait()
+        return manager.submit()
+
+    with ThreadPoolExecutor(8) as ex:
+        results = list(ex.map(lambda _: submit(), range(8)))
+
+    jobs = {job.id for job, _ in results}
+    assert len(jobs) == 1
+    assert sum(started for _, started in results) == 1
+    job = results[0][0]
+    assert job.coalesced == 7
+
+    assert run.started.wait(5)
+    run.release()
+    _wait(job)
+    assert (run.calls, job.status, job.result) == (1, "done", {"status": "ok", "inserted": 2})
+
+    # 끝난 뒤의 요청은 새 작업
+    second, started = manager.submit()
+    assert started and second.id != job.id
+    _wait(second)
+
+
+def test_failed_job_records_error_and_frees_slot():
+    run = _Run(fail=True)
+    manager = CrawlJobManager(run)
+    job, _ = manager.submit()
+    assert run.started.wait(5)
+    assert manager.get(job.id).to_dict()["status"] == "running"
+
+    run.release()
+    _wait(job)
+    status = manager.get(job.id).to_dict()
+    assert status["status"] == "failed"
+    assert status["error"] == "RuntimeError: table unavailable"
+    assert status["result"] is None
+    assert status["progress"]["pages_fetched"] == 3
+    assert (status["progress"]["errors"], status["errors"]) == (1, ["wwwk-37: ConnectionError: timed out"])
+    assert status["elapsed_s"] is not None
+
+    retry, started = manager.submit()
+    assert started and retry.id != job.id
+    _wait(retry)
+
+
+def test_keeps_only_recent_jobs(monkeypatch):
+    monkeypatch.setattr(crawl_jobs, "MAX_JOBS_KEPT", 3)
+    manager = CrawlJobManager(lambda job: {})
+    ids = []
+    for _ in range(5):
+        job, _ = manager.submit()
+        _wait(job)
+        ids.append(job.id)
+
+    assert [manager.get(i) is not None for i in ids] == [False, False, True, True, True]
+
+
+@pytest.fixture
+def run(monkeypatch):
+    run = _Run()
+    monkeypatch.setattr(main, "crawl_jobs", CrawlJobManager(run))
+    yield run
+    run.release()
+
+
+def test_crawl_endpoints(run):
+    client = TestClient(main.app)
+
+    first = client.get("/crawl")
+    assert first.status_code == 202 and first.json()["coalesced"] is False
+    assert run.started.wait(5)
+    second = client.get("/crawl").json()
+    assert (second["job_id"], second["coalesced"]) == (first.json()["job_id"], True)
+
+    status = client.get(f"/crawl/{second['job_id']}").json()
+    assert (status["status"], status["coalesced"]) == ("running", 1)
+    assert client.get("/crawl/unknown").status_code == 404
@@ -0,0 +1,73 @@
+# test_crawl_paths.py
+import pytest
+
+import crawler
+import gsi_query
+import main
+from dynamo import scan_all
+from ingest import COUNTER_ID, IdAllocator, source_key
+
+
+# ---------------------------------------------------------
+# 🔥 crawler.py(Notices) 와 /crawl(장학금 테이블) 은 '이미 본 공지' 를 따로 기억해야 함
+#  - 한 쪽이 먼저 돌아도 다른 쪽 테이블에는 모든 공지가 들어가야 함
+# ---------------------------------------------------------
+NOTICES = [
+    {"url": f"https://example.ac.kr/board?nttNo={n}", "title": f"장학 공지 {n}",
+     "date": "2025-03-0{0}".format(n), "content": f"본문 {n}"}
+    for n in range(1, 4)
+]
+
+
+def fake_crawl_sources(max_pages=None, progress=None, state=None, sources=None):
+    # crawler_logic.iter_board 처럼 state 가 아는 공지는 건너뜀
+    def rows():
+        for item in NOTICES:
+            item_id = source_key(item)
+            if state is not None and state.known("example", item_id):
+                continue
+            yield "테스트 게시판", dict(item), item_id
+    return [("example", rows)]
+
+
+@pytest.fixture
+def tables(dynamodb, crawl_states, table_items, monkeypatch):
+    notices = dynamodb.create_table(
+        TableName="Notices",
+        KeySchema=[{"AttributeName": "url", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "url", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    scholarships = gsi_query.create_table(dynamodb, "scholarship")
+
+    monkeypatch.setattr(crawler, "table", notices)
+    monkeypatch.setattr(crawler, "crawl_sources", fake_crawl_sources)
+    monkeypatch.setattr(main, "table", scholarships)
+    monkeypatch.setattr(main, "id_allocator", IdAllocator(scholarships))
+    monkeypatch.setattr(main, "crawl_sources", fake_crawl_sources)
+    return notices, scholarships
+
+
+def _saved(table, key):
+    return sorted(i[key] for i in scan_all(table) if i.get("id") != COUNTER_ID)
+
+
+@pytest.mark.parametrize("first", ["crawler", "api"])
+def test_both_crawl_paths_save_every_notice(tables, first):
+    notices, scholarships = tables
+    runs = {"crawler": crawler.crawl_to_dynamodb, "api": main.save_sources}
+    second = "api" if first == "crawler" else "crawler"
+
+    runs[first]()
+    runs[second]()
+
+    assert _saved(notices, "url") == sorted(n["url"] for n in NOTICES)
+    assert _saved(scholarships, "title") == sorted(n["title"] for n in NOTICES)
+
+
+def test_each_path_skips_what_it_already_saved(tables):
+    assert crawler.crawl_to_dynamodb()["inserted"] == 3
+    assert main.save_sources()["inserted"] == 3
+
+    assert crawler.crawl_to_dynamodb()["inserted"] == 0
+    assert main.save_sources()["stats"]["pipeline"]["sources"]["example"]["items"] == 0
@@ -0,0 +1,101 @@
+# test_gsi_query.py
+import pytest
+
+import gsi_query
+from dynamo import query_all, scan_all
+from ingest import IdAllocator, ingest, upsert
+from gsi_query import MAJOR_INDEX, TYPE_INDEX
+
+
+# ---------------------------------------------------------
+# 🔥 GSI 계층 (moto) — 테이블 생성 / 인덱스 추가 / 예전 item 채우기 / Query
+# ---------------------------------------------------------
+NOW = "2025-06-01 00:00:00"
+
+
+def scholarship(n, type_, end_at, major="컴퓨터공학과"):
+    return {"title": f"장학 {n}", "type": type_, "end_at": end_at, "major": major, "start_at": None}
+
+
+def _query(table, index, value, **kwargs):
+    items = query_all(table, **gsi_query.query_kwargs(index, value, now=NOW, **kwargs))
+    return sorted(i["title"] for i in items)
+
+
+@pytest.fixture
+def table(dynamodb):
+    return gsi_query.create_table(dynamodb, "scholarship")
+
+
+def test_create_table_has_both_indexes(table):
+    table.reload()
+    assert {g["IndexName"] for g in table.global_secondary_indexes} == {TYPE_INDEX, MAJOR_INDEX}
+    assert gsi_query.ensure_indexes(table) is None
+
+
+def test_query_by_type_and_deadline(table):
+    items = [gsi_query.add_index_fields(i) for i in (
+        scholarship(1, "교내", "2025-07-01"),
+        scholarship(2, "교내", "2025-05-01"),       # 이미 마감
+        scholarship(3, "교외", "2025-07-01"),
+        scholarship(4, "교내", None),                # 마감일 없음
+    )]
+    ingest(table, IdAllocator(table), items, prepare=gsi_query.storable)
+
+    assert _query(table, TYPE_INDEX, "교내") == ["장학 1", "장학 2", "장학 4"]
+    assert _query(table, TYPE_INDEX, "교내", open_only=True) == ["장학 1", "장학 4"]
+    assert _query(table, TYPE_INDEX, "교내", deadline_to="2025-06-30") == ["장학 2"]
+    assert _query(table, MAJOR_INDEX, "컴퓨터공학", equals={"type": "교외"}) == ["장학 3"]
+
+
+def test_null_type_is_kept_in_item_but_not_stored(table):
+    item = gsi_query.add_index_fields(scholarship(1, None, "2025-07-01"))
+    ingest(table, IdAllocator(table), [item], prepare=gsi_query.storable)
+
+    assert item["type"] is None                       # 응답에 쓰는 item 모양은 그대로
+    stored = [i for i in scan_all(table) if i.get("title") == "장학 1"]
+    assert "type" not in stored[0]
+    assert gsi_query.restore(stored[0])["type"] is None
+    assert _query(table, MAJOR_INDEX, "컴퓨터공학") == ["장학 1"]
+
+
+def test_upsert_removes_type_that_became_null(table):
+    allocator = IdAllocator(table)
+    row = {"url": "https://example.ac.kr/1", **scholarship(1, "교내", "2025-07-01")}
+    upsert(table, allocator, [gsi_query.add_index_fields(dict(row))], {}, prepare=gsi_query.storable)
+    existing = {i["source_key"]: i for i in scan_all(table) if "source_key" in i}
+
+    changed = gsi_query.add_index_fields({**row, "type": None})
+    stats, written, rejected = upsert(table, allocator, [changed], existing, prepare=gsi_query.storable)
+
+    assert (stats["updated"], rejected) == (1, [])
+    assert _query(table, TYPE_INDEX, "교내") == []
+    assert _query(table, MAJOR_INDEX, "컴퓨터공학") == ["장학 1"]
+
+
+def test_ensure_indexes_and_backfill_on_legacy_table(dynamodb):
+    table = dynamodb.create_table(
+        TableName="legacy",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "N"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    # 인덱스가 생기기 전에 저장된 item — deadline 없음, null type 도 그대로
+    for n, item in enumerate((
+        scholarship(1, "교내", "2025-07-01"),
+        scholarship(2, None, "2025-07-01", major="전자공학"),
+    ), start=1):
+        table.put_item(Item={"id": n, **item})
+
+    requested = []
+    while (index := gsi_query.ensure_indexes(table)) is not None:
+        requested.append(index)
+    assert requested == [TYPE_INDEX, MAJOR_INDEX]
+
+    assert _query(table, TYPE_INDEX, "교내") == []    # 채우기 전에는 인덱스에 없음
+    assert gsi_query.backfill(table, scan_all(table)) == 2
+    assert gsi_query.backfill(table, scan_all(table)) == 0
+
+    assert _query(table, TYPE_INDEX, "교내") == ["장학 1"]
+    assert _query(table, MAJOR_INDEX, "전자공학") == ["장학 2"]
+    assert "type" not in [i for i in scan_all(table) if i["id"] == 2][0]
@@ -0,0 +1,96 @@
+# test_html_parse.py
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import crawl_registry
+import crawler_logic
+import html_parse
+from crawler_logic import _detail_url, parse_detail_html, parse_tourism_detail_html
+
+
+# ---------------------------------------------------------
+# 🔥 저장해 둔 소스별 페이지로 부분 파싱(ElementFilter) == 전체 파싱 확인
+#   tests/fixtures/html/ — list_<소스 이름>.html (목록) / <파서>_*.html (상세) / job_list.json
+#   benchmarks/bench_html_parse.py tests/fixtures/html/ 로 속도도 같은 페이지로 측정
+# ---------------------------------------------------------
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+DETAILS = {
+    "wwwk-37": "wwwk_37.html",
+    "wwwk-81": "wwwk_81.html",
+    "wwwk-34": "wwwk_34.html",
+    "wwwk-117": "wwwk_117.html",
+    "tourism": "tourism_notice.html",
+}
+PARSERS = {"wwwk": parse_detail_html, "tourism": parse_tourism_detail_html}
+BACKENDS = [b for b in html_parse.BACKENDS if b != "lxml" or html_parse.lxml is not None]
+
+needs_filter = pytest.mark.skipif(html_parse.ElementFilter is None, reason="bs4 < 4.13 (ElementFilter 없음)")
+
+
+def read(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+BOARDS = [s for s in crawl_registry.sources() if s.kind == "board"]
+
+
+def test_every_board_source_has_fixtures():
+    assert {s.name for s in BOARDS} == set(DETAILS)
+    for source in BOARDS:
+        assert os.path.exists(os.path.join(FIXTURES, f"list_{source.name}.html"))
+
+
+def _links(source, text, parser, strain):
+    soup = html_parse.parse(text, html_parse.subtrees(source.link_selector), parser, strain)
+    return [_detail_url(source, a.get("href")) for a in soup.select(source.link_selector)]
+
+
+@needs_filter
+@pytest.mark.parametrize("parser", BACKENDS)
+@pytest.mark.parametrize("source", BOARDS, ids=lambda s: s.name)
+def test_list_links_same_as_full_parse(source, parser):
+    text = read(f"list_{source.name}.html")
+    links = _links(source, text, parser, strain=True)
+
+    assert links == _links(source, text, parser, strain=False)
+    assert links and all(u.startswith(source.list_url.split("?")[0].rsplit("/", 1)[0]) for u in links)
+
+
+@needs_filter
+@pytest.mark.parametrize("parser", BACKENDS)
+@pytest.mark.parametrize("source", BOARDS, ids=lambda s: s.name)
+def test_detail_same_as_full_parse(source, parser):
+    parse = PARSERS[source.parser]
+    text = read(DETAILS[source.name])
+    assert parse(text, parser, strain=True) == parse(text, parser, strain=False)
+
+
+@pytest.mark.parametrize("parser", BACKENDS)
+def test_detail_fields(parser):
+    board, title, date, content = parse_detail_html(read("wwwk_34.html"), parser)
+    assert (board, title, date) == ("장학공지", "2025년 강원인재육성재단 장학생 선발 공고", datetime(2025, 11, 20, 10, 15, 3))
+    assert content.startswith("강원인재육성재단에서") and "033-250-6152" in content
+    assert "개인정보처리방침" not in content
+
+    board, title, date, content = parse_tourism_detail_html(read("tourism_notice.html"), parser)
+    assert (board, date) == ("관광학과 공지", datetime(2025, 11, 19))
+    assert title.startswith("장학 ") and "발전기금" in title
+    assert "tourism@kangwon.ac.kr" in content
+
+
+def test_job_list_fixture(monkeypatch):
+    with open(os.path.join(FIXTURES, "job_list.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    monkeypatch.setattr(crawler_logic, "fetch_json", lambda url: data)
+
+    notices, total_pages = crawler_logic.get_job_list("00", "00", 1)
+    items = [crawler_logic.convert_job_item(raw) for raw in notices]
+
+    assert total_pages == 3
+    assert [i["campus"] for i in items] == ["춘천", "삼척", "춘천"]
+    assert items[0]["title"] == "2025 하반기 강원지역 공공기관 합동 채용설명회"
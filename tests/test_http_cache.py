@@ -0,0 +1,112 @@
+# test_http_cache.py
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import http_cache
+from http_cache import ResponseCache
+
+
+# ---------------------------------------------------------
+# 🔥 응답 캐시 — 304 / Accept-Encoding / 인코딩별 ETag / 버전별 무효화 / 바이트 제한
+# ---------------------------------------------------------
+PAYLOAD = {"items": [{"id": i, "title": f"장학 공지 {i}"} for i in range(200)]}   # 압축 대상 (> 1KB)
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.state.cache = ResponseCache()
+    app.state.version = 1
+    app.state.builds = 0
+
+    @app.get("/items")
+    def items(request: Request):
+        def build():
+            app.state.builds += 1
+            return {**PAYLOAD, "version": app.state.version}, {}
+        return app.state.cache.respond(request, app.state.version, build)
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app)
+
+
+def get(client, encoding="identity", **headers):
+    # TestClient(httpx) 는 gzip 을 자동으로 풀므로 본문 대신 헤더로 확인
+    return client.get("/items", headers={"Accept-Encoding": encoding, **headers})
+
+
+def test_etag_differs_per_content_coding(client):
+    tags = {enc: get(client, enc).headers["etag"] for enc in ("identity", "gzip", "br")}
+
+    assert len(set(tags.values())) == 3
+    assert tags["gzip"].endswith('-gzip"') and tags["br"].endswith('-br"')
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_accept_encoding_negotiation(client, accept, expected):
+    res = get(client, accept)
+    assert res.headers.get("content-encoding") == expected
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert res.json()["version"] == 1
+
+
+def test_gzip_falls_back_without_brotli(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    assert get(client, "br, gzip").headers["content-encoding"] == "gzip"
+
+
+def test_small_bodies_are_not_compressed():
+    assert http_cache._choose_encoding("gzip, br", http_cache.MIN_COMPRESS_BYTES - 1) == "identity"
+
+
+def test_not_modified_for_any_encoding_of_the_same_body(client):
+    gzip_tag = get(client, "gzip").headers["etag"]
+
+    for encoding in ("identity", "gzip", "br"):
+        res = get(client, encoding, **{"If-None-Match": gzip_tag})
+        assert res.status_code == 304
+        assert res.content == b""
+    assert get(client, "gzip", **{"If-None-Match": "W/" + gzip_tag}).status_code == 304
+    assert get(client, "gzip", **{"If-None-Match": '"something-else"'}).status_code == 200
+
+
+def test_version_bump_rebuilds_and_changes_etag(app, client):
+    first = get(client)
+    get(client)
+    assert app.state.builds == 1
+
+    app.state.version = 2
+    second = get(client, **{"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.json()["version"] == 2
+    assert second.headers["etag"] != first.headers["etag"]
+    assert app.state.builds == 2
+
+
+def test_cache_is_bounded_by_bytes(app, client):
+    body_size = len(get(client).content)
+    gzip_size = len(gzip.compress(get(client).content, compresslevel=6))
+    app.state.cache = ResponseCache(max_bytes=body_size * 2 + gzip_size)
+
+    for version in range(1, 6):
+        app.state.version = version
+        get(client, "gzip")
+
+    cache = app.state.cache
+    assert cache.stats["bytes"] <= cache.max_bytes
+    assert cache.stats["bytes"] == sum(e.size for e in cache._entries.values())
+    assert len(cache._entries) == 1
@@ -0,0 +1,71 @@
+# test_ingest.py
+import pytest
+
+import gsi_query
+from crawl_pipeline import CrawlPipeline
+from crawl_state import CrawlState
+from dynamo import scan_all
+from ingest import COUNTER_ID, IdAllocator, content_hash, existing_by_key, item_key, upsert
+
+
+# ---------------------------------------------------------
+# 🔥 증분 upsert (내용 해시) + 저장된 것만 crawl_state 에 표시
+# ---------------------------------------------------------
+def notice(n, content="본문"):
+    return {"url": f"https://example.ac.kr/board?nttNo={n}", "title": f"공지 {n}", "content": content}
+
+
+@pytest.fixture
+def table(dynamodb):
+    return gsi_query.create_table(dynamodb, "scholarship")
+
+
+def _stored(table):
+    return existing_by_key(i for i in scan_all(table) if i["id"] != COUNTER_ID)
+
+
+def test_content_hash_ignores_meta_fields():
+    item = notice(1)
+    assert content_hash(item) == content_hash({**item, "id": 7, "updated_at": "2025-01-01 00:00:00"})
+    assert content_hash(item) != content_hash(notice(1, content="바뀐 본문"))
+
+
+def test_upsert_inserts_skips_unchanged_and_updates_changed(table):
+    allocator = IdAllocator(table)
+    stats, written, rejected = upsert(table, allocator, [notice(1), notice(2)], {})
+    assert (stats["inserted"], len(written), rejected) == (2, 2, [])
+
+    stats, written, rejected = upsert(table, allocator, [notice(1), notice(2, "새 본문")], _stored(table))
+    assert (stats["unchanged"], stats["updated"], rejected) == (1, 1, [])
+    assert [w["content"] for w in written] == ["새 본문"]
+
+    stored = _stored(table)
+    assert stored[item_key(notice(2))]["content"] == "새 본문"
+    assert stored[item_key(notice(2))]["content_hash"] == content_hash(notice(2, "새 본문"))
+    assert sorted(int(i["id"]) for i in stored.values()) == [1, 2]
+
+
+def test_upsert_rejects_update_when_row_changed_meanwhile(table):
+    allocator = IdAllocator(table)
+    upsert(table, allocator, [notice(1)], {})
+    stale = _stored(table)
+
+    # 다른 쪽이 먼저 바꿈 → stale 의 content_hash 로는 조건이 맞지 않음
+    upsert(table, allocator, [notice(1, "다른 쪽 본문")], _stored(table))
+    stats, written, rejected = upsert(table, allocator, [notice(1, "이쪽 본문")], stale)
+
+    assert (stats["conflicts"], written, rejected) == (1, [], [item_key(notice(1))])
+    assert _stored(table)[item_key(notice(1))]["content"] == "다른 쪽 본문"
+
+
+def test_pipeline_marks_only_rows_that_were_stored(tmp_path):
+    state = CrawlState(str(tmp_path / "state.sqlite3"))
+    items = [notice(n) for n in range(1, 4)]
+
+    def write(rows):
+        return len(rows) - 1, [r for r in rows if r["title"] == "공지 2"]
+
+    pipeline = CrawlPipeline(normalize=lambda board, item: dict(item), write=write, state=state)
+    pipeline.run([("example", lambda: (("게시판", i, item_key(i)) for i in items))])
+
+    assert [state.known("example", item_key(i)) for i in items] == [True, False, True]
@@ -0,0 +1,163 @@
+# test_llm_client.py
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from llm_cache import LLMCache, make_key
+from llm_client import AsyncLLMClient, LLMUnavailable
+
+
+# ---------------------------------------------------------
+# 🔥 LLM 결과 캐시 / single-flight / 재시도
+# ---------------------------------------------------------
+REQUEST = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def fake_client(outcomes, delay=0.0, **kwargs):
+    """
+    outcomes: 호출마다 돌려줄 값 (예외면 raise) — 다 쓰면 마지막 것을 반복
+    """
+    llm = AsyncLLMClient(api_key="test", base_url="http://llm.test/v1", backoff=0, **kwargs)
+    calls = {"count": 0, "active": 0, "peak": 0}
+
+    async def create(**_):
+        outcome = outcomes[min(calls["count"], len(outcomes) - 1)]
+        calls["count"] += 1
+        calls["active"] += 1
+        calls["peak"] = max(calls["peak"], calls["active"])
+        try:
+            await asyncio.sleep(delay)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return completion(outcome)
+        finally:
+            calls["active"] -= 1
+
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return llm, calls
+
+
+# -----------------------------
+# 캐시
+# -----------------------------
+def test_make_key_normalizes_whitespace_and_version():
+    assert make_key("홍길동  \n 컴퓨터공학과", "v1") == make_key("홍길동 컴퓨터공학과", "v1")
+    assert make_key("홍길동", "v1") != make_key("홍길동", "v2")
+
+
+def test_cache_memory_then_disk_hit(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LLMCache(path=path)
+    assert cache.get("k") is None
+    cache.put("k", {"major": "컴퓨터공학과"}, latency_ms=120)
+
+    assert cache.get("k") == {"major": "컴퓨터공학과"}
+    reopened = LLMCache(path=path)                  # 재시작 → 디스크에서
+    assert reopened.get("k") == {"major": "컴퓨터공학과"}
+    assert reopened.get("k") == {"major": "컴퓨터공학과"}
+
+    assert (cache.stats()["memory_hits"], cache.stats()["misses"]) == (1, 1)
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["saved_ms"]) == (1, 1, 240.0)
+
+
+def test_cache_returns_copies(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+    cache.put("k", {"major": "컴퓨터공학과"})
+    cache.get("k")["major"] = "바뀜"
+    assert cache.get("k") == {"major": "컴퓨터공학과"}
+
+
+def test_cache_ttl_expires(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl=-1)
+    cache.put("k", {"major": "컴퓨터공학과"})
+    assert cache.get("k") is None
+    assert LLMCache(path=str(tmp_path / "llm.sqlite3")).get("k") is None
+
+
+def test_cache_bounds_memory_and_disk(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LLMCache(path=path, memory_items=2, disk_bytes=100)
+    for n in range(5):
+        cache.put(f"k{n}", {"text": "x" * 30})
+
+    assert cache.stats()["memory_items"] == 2
+    reopened = LLMCache(path=path)
+    assert reopened.get("k0") is None                # 오래 안 쓴 것부터 디스크에서 삭제
+    assert reopened.get("k4") == {"text": "x" * 30}
+
+
+# -----------------------------
+# single-flight
+# -----------------------------
+def test_single_flight_shares_one_call():
+    llm, calls = fake_client(["응답"], delay=0.05)
+
+    async def run():
+        make_call = lambda: llm.chat("프롬프트", model="m")   # noqa: E731
+        return await asyncio.gather(*(llm.single_flight("같은 키", make_call) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["응답"] * 5
+    assert calls["count"] == 1
+    assert llm.stats()["coalesced"] == 4
+
+
+def test_single_flight_survives_cancelled_waiter():
+    llm, calls = fake_client(["응답"], delay=0.05)
+
+    async def run():
+        make_call = lambda: llm.chat("프롬프트", model="m")   # noqa: E731
+        first = asyncio.ensure_future(llm.single_flight("키", make_call))
+        second = asyncio.ensure_future(llm.single_flight("키", make_call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "응답"
+    assert calls["count"] == 1
+
+
+# -----------------------------
+# 재시도 / 동시 호출 제한
+# -----------------------------
+def test_retries_transient_errors_then_succeeds():
+    llm, calls = fake_client([openai.APIConnectionError(request=REQUEST), asyncio.TimeoutError(), "응답"])
+
+    assert asyncio.run(llm.chat("프롬프트", model="m")) == "응답"
+    stats = llm.stats()
+    assert (calls["count"], stats["retries"], stats["timeouts"], stats["failures"]) == (3, 2, 1, 0)
+
+
+def test_gives_up_after_retries():
+    llm, calls = fake_client([openai.APIConnectionError(request=REQUEST)], retries=2)
+
+    with pytest.raises(LLMUnavailable):
+        asyncio.run(llm.chat("프롬프트", model="m"))
+    assert (calls["count"], llm.stats()["failures"]) == (3, 1)
+
+
+def test_does_not_retry_client_errors():
+    llm, calls = fake_client([openai.APIError("bad request", REQUEST, body=None)])
+
+    with pytest.raises(LLMUnavailable):
+        asyncio.run(llm.chat("프롬프트", model="m"))
+    assert (calls["count"], llm.stats()["retries"]) == (1, 0)
+
+
+def test_concurrency_limit_per_event_loop():
+    # 루프가 바뀌어도 (asyncio.run 두 번) 세마포어가 새 루프에서 다시 만들어짐
+    llm, calls = fake_client(["응답"], delay=0.02, concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(llm.chat(f"프롬프트 {n}", model="m") for n in range(6)))
+
+    for _ in range(2):
+        assert asyncio.run(run()) == ["응답"] * 6
+    assert (calls["count"], calls["peak"]) == (12, 2)
@@ -0,0 +1,127 @@
+# test_metrics.py
+import io
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+import logs
+import main
+from metrics import Registry
+
+
+# ---------------------------------------------------------
+# 🔥 /metrics 렌더링 (counter / histogram / 라벨 이스케이프) + 구조화 로그 필드
+# ---------------------------------------------------------
+def test_counter_render_and_label_escaping():
+    registry = Registry()
+    fetches = registry.counter("crawl_fetch_total", "Crawler requests", ("source", "status"))
+    fetches.inc(source="wwwk-37", status="200")
+    fetches.inc(2, source="wwwk-37", status="200")
+    fetches.inc(0.5, source='a"b\\c\nd', status="304")
+
+    assert fetches.value(source="wwwk-37", status="200") == 3
+    assert registry.render().splitlines() == [
+        "# HELP crawl_fetch_total Crawler requests",
+        "# TYPE crawl_fetch_total counter",
+        'crawl_fetch_total{source="a\\"b\\\\c\\nd",status="304"} 0.5',
+        'crawl_fetch_total{source="wwwk-37",status="200"} 3',
+    ]
+
+
+def test_histogram_buckets_sum_and_count():
+    registry = Registry()
+    latency = registry.histogram("parse_seconds", "Parse time", ("page",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, page="list")
+
+    assert latency.count(page="list") == 4
+    assert registry.render().splitlines()[2:] == [
+        'parse_seconds_bucket{page="list",le="0.1"} 2',
+        'parse_seconds_bucket{page="list",le="1"} 3',
+        'parse_seconds_bucket{page="list",le="+Inf"} 4',
+        'parse_seconds_sum{page="list"} 3.65',
+        'parse_seconds_count{page="list"} 4',
+    ]
+
+
+def test_histogram_without_labels_and_timer():
+    registry = Registry()
+    sizes = registry.histogram("batch_size", "Rows per batch", (), buckets=(10,))
+    sizes.observe(25)
+    with pytest.raises(RuntimeError):
+        with sizes.time():
+            raise RuntimeError("예외가 나도 기록")
+
+    lines = registry.render().splitlines()
+    assert 'batch_size_bucket{le="10"} 1' in lines and 'batch_size_bucket{le="+Inf"} 2' in lines
+    assert "batch_size_count 2" in lines
+
+
+def test_registry_rejects_mismatched_labels():
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs", ("status",))
+    assert registry.counter("jobs_total", "Jobs", ("status",)) is counter
+    with pytest.raises(ValueError):
+        registry.counter("jobs_total", "Jobs", ("source",))
+    with pytest.raises(ValueError):
+        registry.histogram("jobs_total", "Jobs", ("status",))
+    with pytest.raises(ValueError):
+        counter.inc(source="x")
+
+
+def test_metrics_endpoint_declares_each_metric_once():
+    res = TestClient(main.app).get("/metrics")
+    assert res.status_code == 200 and res.headers["content-type"].startswith("text/plain")
+
+    types = [line.split()[2] for line in res.text.splitlines() if line.startswith("# TYPE ")]
+    assert len(types) == len(set(types))
+    assert "crawl_failures_total" in types
+
+
+# -----------------------------
+# 구조화 로그
+# -----------------------------
+@pytest.fixture
+def capture():
+    def make(style, level="INFO"):
+        stream = io.StringIO()
+        logger = logging.getLogger(f"test.logs.{style}.{level}")
+        logger.handlers = []
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logs._Formatter(style))
+        logger.addHandler(handler)
+        logger.propagate = False
+        logger.setLevel(logs._level(level))
+        return logs.StructuredLogger(logger, {}), stream
+    return make
+
+
+def test_text_log_fields(capture):
+    log, stream = capture("text")
+    log.bind(job="abc123").info("목록 요청", source="wwwk-37", url="https://x/?a=1&b=2", title="공백 있는 값", empty="")
+
+    line = stream.getvalue().strip()
+    assert " INFO    test.logs.text.INFO 목록 요청 " in line
+    assert line.endswith('job=abc123 source=wwwk-37 url="https://x/?a=1&b=2" title="공백 있는 값" empty=""')
+
+
+def test_json_log_fields(capture):
+    log, stream = capture("json")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.bind(job="abc123").exception("크롤링 작업 실패", pages=3)
+
+    entry = json.loads(stream.getvalue())
+    assert {k: entry[k] for k in ("level", "logger", "msg", "job", "pages")} == {
+        "level": "error", "logger": "test.logs.json.INFO", "msg": "크롤링 작업 실패", "job": "abc123", "pages": 3,
+    }
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_off_level_writes_nothing(capture):
+    log, stream = capture("text", "OFF")
+    log.error("안 보임", source="x")
+    assert stream.getvalue() == ""
@@ -0,0 +1,119 @@
+# test_pagination.py
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+from dynamo import decode_cursor, encode_cursor
+from main import paginate
+
+
+# ---------------------------------------------------------
+# 🔥 커서 페이지네이션 — 왕복 / 잘못된 커서 / 마지막 페이지
+# ---------------------------------------------------------
+ITEMS = [{"id": i, "title": f"장학 공지 {i}", "type": "교내"} for i in range(1, 24)]
+
+
+def _raw(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("key", [{"after": 17}, {"offset": 40}, {"after": Decimal("5")}, {"id": "한글 키"}])
+def test_cursor_round_trip(key):
+    cursor = encode_cursor(key)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor   # URL 에 그대로
+    assert decode_cursor(cursor) == {k: int(v) if isinstance(v, Decimal) else v for k, v in key.items()}
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "abc", _raw([1, 2]), _raw("after"), encode_cursor({"after": 3})[:-3]])
+def test_decode_rejects_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def _walk(items, limit, ranked=False):
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(items, limit, cursor, ranked=ranked)
+        pages.append([i["id"] for i in page])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("ranked", [False, True])
+def test_pages_cover_everything_once(ranked):
+    pages = _walk(ITEMS, 5, ranked)
+    assert [len(p) for p in pages] == [5, 5, 5, 5, 3]
+    assert sum(pages, []) == [i["id"] for i in ITEMS]
+
+
+def test_last_page_has_no_cursor():
+    page, cursor = paginate(ITEMS, 23, None)
+    assert (len(page), cursor) == (23, None)
+
+    page, cursor = paginate(ITEMS, 10, encode_cursor({"after": 20}))
+    assert ([i["id"] for i in page], cursor) == ([21, 22, 23], None)
+
+    page, cursor = paginate(ITEMS, 10, encode_cursor({"after": 23}))
+    assert (page, cursor) == ([], None)
+
+
+def test_id_cursor_survives_inserted_items():
+    page, cursor = paginate(ITEMS, 5, None)
+    grown = sorted(ITEMS + [{"id": 2.5}, {"id": 30}], key=lambda i: i["id"])
+    page, _ = paginate(grown, 5, cursor)
+    assert [i["id"] for i in page] == [6, 7, 8, 9, 10]
+
+
+@pytest.mark.parametrize("key, ranked", [
+    ({"offset": 5}, False),         # 검색 커서를 id 목록에
+    ({"after": 5}, True),           # id 커서를 검색 결과에
+    ({"offset": "y"}, True),
+    ({"offset": -5}, True),         # 음수 offset → 끝에서부터 잘리면 안 됨
+    ({"after": "x"}, False),
+])
+def test_paginate_rejects_wrong_cursor(key, ranked):
+    with pytest.raises(HTTPException) as e:
+        paginate(ITEMS, 5, _raw(key), ranked=ranked)
+    assert e.value.status_code == 400
+
+
+# -----------------------------
+# 엔드포인트
+# -----------------------------
+@pytest.fixture
+def client(table_items):
+    table_items.extend(dict(i) for i in ITEMS)
+    main.snapshot.invalidate()
+    return TestClient(main.app)
+
+
+def test_list_endpoint_walks_pages_by_header(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/api/list", params=params)
+        assert res.status_code == 200
+        seen += [i["id"] for i in res.json()]
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == [i["id"] for i in ITEMS]
+
+
+def test_scholarships_endpoint_next_cursor(client):
+    first = client.get("/api/scholarships", params={"limit": 20}).json()
+    assert (first["count"], first["next_cursor"] is not None) == (20, True)
+
+    last = client.get("/api/scholarships", params={"limit": 20, "cursor": first["next_cursor"]}).json()
+    assert ([i["id"] for i in last["items"]], last["next_cursor"]) == ([21, 22, 23], None)
+
+
+def test_endpoint_rejects_tampered_cursor(client):
+    cursor = encode_cursor({"after": 10})
+    assert client.get("/api/list", params={"limit": 5, "cursor": cursor[:-2] + "!!"}).status_code == 400
+    assert client.get("/api/scholarships", params={"limit": 5, "cursor": _raw(["after", 10])}).status_code == 400
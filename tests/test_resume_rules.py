@@ -0,0 +1,27 @@
+# test_resume_rules.py
+import pytest
+
+import canonical
+import resume_rules
+
+
+# ---------------------------------------------------------
+# 🔥 규칙 추출기 사전은 canonical 의 별칭 사전에서 나옴
+#  - 규칙이 찾은 이름은 항상 표준 키 하나로 바뀌어야 함 (두 사전이 어긋나지 않게)
+# ---------------------------------------------------------
+@pytest.mark.parametrize("name", resume_rules.CERTIFICATES)
+def test_every_rule_certificate_has_a_canonical_key(name):
+    assert canonical.certificate_keys([name])[0] in canonical.CERTIFICATE_ALIASES
+
+
+@pytest.mark.parametrize("name", resume_rules.MAJORS)
+def test_every_rule_major_has_a_canonical_key(name):
+    assert canonical.major_keys(name)[0] in canonical.MAJOR_ALIASES
+
+
+def test_aliases_are_found_in_resume_text():
+    text = "전공: 컴퓨터과학\n3학년\n자격증\n컴활 1급, 정처기\n키워드: AWS 배포"
+    result, _ = resume_rules.extract(text)
+
+    assert canonical.certificate_keys(result["certificates"]) == ["컴퓨터활용능력 1급", "정보처리기사"]
+
@@ -0,0 +1,53 @@
+# test_scholarship_formats.py
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+# ---------------------------------------------------------
+# 🔥 /api/scholarships — format=json 과 format=ndjson 은 같은 item 을 돌려줘야 함
+#  - 복수 전공 item 은 대표 전공이 아닌 전공으로도 찾아져야 함
+# ---------------------------------------------------------
+ITEMS = [
+    {"id": 1, "title": "컴공 장학", "type": "교내", "major": "컴퓨터공학과", "end_at": "2099-12-31"},
+    {"id": 2, "title": "전자·컴공 장학", "type": "교외", "major": "전자공학과, 컴퓨터공학과", "end_at": "2099-06-30"},
+    {"id": 3, "title": "전자 장학", "type": "교내", "major": "전자공학과", "end_at": "2099-12-31"},
+    {"id": 4, "title": "마감된 장학", "type": "교내", "major": "소프트웨어학과", "end_at": "2000-01-01"},
+    {"id": 5, "title": "전공 무관", "type": "교외", "major": "any", "end_at": None},
+]
+
+
+@pytest.fixture
+def client(table_items):
+    table_items.extend(dict(i) for i in ITEMS)
+    with TestClient(main.app) as c:
+        yield c
+
+
+def _json_ids(client, params):
+    body = client.get("/api/scholarships", params=params).json()
+    return [i["id"] for i in body["items"]]
+
+
+def _ndjson_ids(client, params):
+    text = client.get("/api/scholarships", params={**params, "format": "ndjson"}).text
+    return sorted(json.loads(line)["id"] for line in text.splitlines() if line)
+
+
+@pytest.mark.parametrize("params", [
+    {"major": "컴퓨터공학과"},
+    {"major": "전자공학과"},
+    {"major": "컴퓨터공학과", "category": "교외"},
+    {"major": "컴퓨터공학과", "open_only": "true"},
+    {"major": "소프트웨어학과", "deadline_to": "2099-07-01"},
+])
+def test_major_filter_matches_between_formats(client, params):
+    assert _ndjson_ids(client, params) == _json_ids(client, params)
+
+
+def test_secondary_major_is_found(client):
+    assert 2 in _ndjson_ids(client, {"major": "컴퓨터공학과"})
+    assert 2 in _ndjson_ids(client, {"major": "전자공학과"})
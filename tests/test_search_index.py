@@ -0,0 +1,95 @@
+# test_search_index.py
+import search_index
+from search_index import SearchIndex
+
+
+# ---------------------------------------------------------
+# 🔥 갱신된 문서의 예전 번호는 postings 에 남지 않아야 함
+# ---------------------------------------------------------
+DOCS = [
+    {"id": 1, "type": "교내", "title": "성적 우수 장학금", "content": "평점 4.0 이상"},
+    {"id": 2, "type": "교외", "title": "지역 인재 장학금", "content": "강원 지역 출신"},
+]
+
+
+def _index():
+    index = SearchIndex()
+    index.rebuild(DOCS)
+    return index
+
+
+def test_update_removes_old_postings():
+    index = _index()
+    before = index.stats()["postings"]
+
+    for _ in range(50):
+        index.add({"id": 1, "type": "교내", "title": "성적 우수 장학금", "content": "평점 4.0 이상"})
+
+    assert index.stats()["postings"] == before
+    assert [i["id"] for i in index.search("성적")] == [1]
+
+
+def test_update_replaces_text_and_type():
+    index = _index()
+    index.add({"id": 1, "type": "교외", "title": "근로 장학금", "content": "도서관 근로"})
+
+    assert index.search("성적") == []
+    assert [i["id"] for i in index.search("근로")] == [1]
+    assert [i["id"] for i in index.by_type("교외")] == [1, 2]
+    assert index.by_type("교내") == []
+
+
+def test_single_character_search_skips_replaced_docs():
+    index = _index()
+    index.add({"id": 2, "type": "교외", "title": "지역 인재 장학금", "content": "강릉 출신"})
+
+    assert [i["id"] for i in index.search("강")] == [2]
+
+
+# ---------------------------------------------------------
+# 🔥 3-gram postings / 지운 자리 압축
+# ---------------------------------------------------------
+def test_trigram_query_matches_substring_only():
+    index = _index()
+    index.add({"id": 3, "type": "교내", "title": "우수 성적 장학", "content": ""})
+
+    # "성적 우"는 1번 제목에만 연속으로 있음 (3번은 같은 글자가 순서만 다름)
+    assert [i["id"] for i in index.search("성적 우")] == [1]
+    assert [i["id"] for i in index.search("성적")] == [3, 1]
+    assert index.search("장학생") == []
+
+
+def test_compacts_tombstones_and_keeps_results():
+    index = _index()
+    for n in range(200):
+        index.add({"id": 1, "type": "교내", "title": f"성적 우수 장학금 {n}", "content": "평점 4.0 이상"})
+
+    stats = index.stats()
+    assert stats["compactions"] > 0
+    assert stats["tombstones"] <= max(search_index.COMPACT_MIN, stats["slots"] * search_index.COMPACT_RATIO)
+    assert stats["slots"] < 200
+
+    assert [i["id"] for i in index.search("성적 우수")] == [1]
+    assert index.search("성적 우수")[0]["title"] == "성적 우수 장학금 199"
+    assert [i["id"] for i in index.search("지역 인재", category="교외")] == [2]
+    assert [i["id"] for i in index.by_type("교내")] == [1]
+    assert [i["id"] for i in index.search("강")] == [2]
+
+
+def test_compaction_matches_fresh_rebuild():
+    index = _index()
+    docs = {}
+    for n in range(300):
+        item = {"id": n % 40 + 10, "type": "교내" if n % 3 else "교외",
+                "title": f"장학금 {n % 7} 공지", "content": f"내용 {n}"}
+        docs[item["id"]] = item
+        index.add(item)
+
+    fresh = SearchIndex()
+    fresh.rebuild(DOCS + list(docs.values()))
+
+    assert index.stats()["postings"] == fresh.stats()["postings"]
+    for query in ("장학금 3", "공지", "내용 29", "장학"):
+        assert [i["id"] for i in index.search(query)] == [i["id"] for i in fresh.search(query)]
+    for category in ("교내", "교외"):
+        assert index.by_type(category) == fresh.by_type(category)
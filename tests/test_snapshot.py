@@ -0,0 +1,46 @@
+# test_snapshot.py
+from snapshot import TableSnapshot
+
+
+# ---------------------------------------------------------
+# 🔥 apply() — 배치 한 번에 병합, 읽는 쪽이 가진 리스트는 바뀌지 않음
+# ---------------------------------------------------------
+class _Index:
+    def __init__(self):
+        self.added = []
+
+    def rebuild(self, items):
+        self.added = []
+
+    def add(self, item):
+        self.added.append(item["id"])
+
+
+def _snapshot(ids):
+    snapshot = TableSnapshot(lambda: [{"id": i, "v": 0} for i in ids])
+    index = _Index()
+    snapshot.attach(index)
+    snapshot.get()
+    return snapshot, index
+
+
+def test_apply_merges_updates_and_inserts_in_key_order():
+    snapshot, index = _snapshot([2, 4, 6])
+    before, version = snapshot.get_with_version()
+
+    snapshot.apply([{"id": 7, "v": 1}, {"id": 4, "v": 1}, {"id": 1, "v": 1}, {"id": 5, "v": 1}, {"id": 4, "v": 2}])
+    items, new_version = snapshot.get_with_version()
+
+    assert [(i["id"], i["v"]) for i in items] == [(1, 1), (2, 0), (4, 2), (5, 1), (6, 0), (7, 1)]
+    assert new_version == version + 1
+    assert [i["id"] for i in before] == [2, 4, 6] and before[1]["v"] == 0
+    assert index.added == [1, 4, 5, 7]
+    assert snapshot.find(5)["v"] == 1
+
+
+def test_apply_nothing_keeps_version():
+    snapshot, _ = _snapshot([1])
+    _, version = snapshot.get_with_version()
+
+    snapshot.apply([])
+    assert snapshot.get_with_version()[1] == version
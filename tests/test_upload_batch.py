@@ -0,0 +1,61 @@
+# test_upload_batch.py
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import pdf_engine
+import pdf_fakes
+
+
+# ---------------------------------------------------------
+# 🔥 /upload-pdfs — 파일 하나가 시간 초과 / 워커를 죽여도 나머지는 성공해야 함
+# ---------------------------------------------------------
+@pytest.fixture
+def client(monkeypatch, table_items):
+    async def parse(text):
+        return {"major": "컴퓨터공학과", "grade": "3", "certificates": ""}
+
+    monkeypatch.setattr(pdf_engine, "_extract_range", pdf_fakes.extract_range)
+    monkeypatch.setattr(pdf_engine, "PDF_TIMEOUT", 2.0)
+    monkeypatch.setattr(main, "aparse_resume_text", parse)
+    with TestClient(main.app) as c:
+        yield c
+
+
+def _rows(response):
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    return {row["file"]: row for row in lines[:-1]}, lines[-1]
+
+
+def test_one_slow_file_does_not_fail_the_batch(client):
+    files = [("files", (f"ok{i}.pdf", f"resume {i}".encode(), "application/pdf")) for i in range(6)]
+    files.append(("files", ("slow.pdf", b"HANG", "application/pdf")))
+
+    response = client.post("/upload-pdfs", files=files)
+    rows, summary = _rows(response)
+
+    assert response.status_code == 200
+    assert rows["slow.pdf"]["status"] == 504
+    assert all(rows[f"ok{i}.pdf"]["status"] == 200 for i in range(6))
+    assert summary["total"] == 7 and summary["failed"] == 1
+
+
+def test_crashed_worker_is_retryable_per_file(client):
+    log = pdf_fakes.crash_log(os.getpid())
+    if os.path.exists(log):
+        os.remove(log)
+    files = [("files", (f"ok{i}.pdf", f"resume {i}".encode(), "application/pdf")) for i in range(4)]
+    files.append(("files", ("crash.pdf", b"CRASH", "application/pdf")))
+
+    rows, summary = _rows(client.post("/upload-pdfs", files=files))
+
+    assert rows["crash.pdf"]["status"] == 503
+    assert rows["crash.pdf"]["retryable"] is True
+    with open(log) as f:
+        assert len(f.readlines()) == 2      # 처음 + 엔진의 재시도 한 번 (엔드포인트는 다시 시도하지 않음)
+    os.remove(log)
+    assert all(rows[f"ok{i}.pdf"]["status"] == 200 for i in range(4))
+    assert summary["failed"] == 1